@@ -0,0 +1,48 @@
+package com.complaintops.backend;
+
+import jakarta.persistence.*;
+import com.fasterxml.jackson.annotation.JsonIgnore;
+import lombok.Data;
+import lombok.NoArgsConstructor;
+import java.time.LocalDateTime;
+
+@Entity
+@Table(name = "analysis_jobs", indexes = {
+        @Index(name = "idx_analysis_jobs_status_created", columnList = "status, created_at")
+})
+@Data
+@NoArgsConstructor
+public class AnalysisJob {
+    @Id
+    private String id;
+
+    // Kept only until the job completes or fails for good; a completed job's Complaint holds the text
+    @JsonIgnore
+    @Column(columnDefinition = "TEXT")
+    private String rawText;
+
+    @Enumerated(EnumType.STRING)
+    private JobStatus status = JobStatus.QUEUED;
+
+    private Long complaintId;
+
+    @Column(columnDefinition = "TEXT")
+    private String error;
+
+    private int attempts;
+
+    // Instance running the job and its last sign of life; recovery only takes over RUNNING
+    // jobs whose heartbeat is older than jobs.stale-after-ms
+    private String owner;
+    private LocalDateTime heartbeatAt;
+
+    private LocalDateTime createdAt = LocalDateTime.now();
+    private LocalDateTime updatedAt = LocalDateTime.now();
+}
+
+enum JobStatus {
+    QUEUED,
+    RUNNING,
+    COMPLETED,
+    FAILED
+}
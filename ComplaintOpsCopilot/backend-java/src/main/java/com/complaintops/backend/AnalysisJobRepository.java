@@ -0,0 +1,77 @@
+package com.complaintops.backend;
+
+import org.springframework.data.domain.Pageable;
+import org.springframework.data.jpa.repository.JpaRepository;
+import org.springframework.data.jpa.repository.Modifying;
+import org.springframework.data.jpa.repository.Query;
+import org.springframework.data.repository.query.Param;
+import org.springframework.stereotype.Repository;
+import org.springframework.transaction.annotation.Transactional;
+import java.time.LocalDateTime;
+import java.util.Collection;
+import java.util.List;
+
+/**
+ * Status changes of a job go through conditional updates rather than read-then-save, so two
+ * instances (or a worker and the recovery sweep) can never both move the same row: each
+ * returns the number of rows changed, and 0 means another party got there first.
+ */
+@Repository
+public interface AnalysisJobRepository extends JpaRepository<AnalysisJob, String> {
+
+    List<AnalysisJob> findByStatusOrderByCreatedAtAsc(JobStatus status, Pageable pageable);
+
+    // Rows from before heartbeats existed have none; they count as stale
+    @Query("select j from AnalysisJob j where j.status = :running"
+            + " and (j.heartbeatAt is null or j.heartbeatAt < :cutoff)")
+    List<AnalysisJob> findStaleRunning(@Param("running") JobStatus running, @Param("cutoff") LocalDateTime cutoff);
+
+    @Modifying
+    @Transactional
+    @Query("update AnalysisJob j set j.status = :running, j.owner = :owner, j.heartbeatAt = :now,"
+            + " j.updatedAt = :now, j.attempts = j.attempts + 1"
+            + " where j.id = :id and j.status = :queued")
+    int claim(@Param("id") String id, @Param("owner") String owner, @Param("now") LocalDateTime now,
+            @Param("queued") JobStatus queued, @Param("running") JobStatus running);
+
+    @Modifying
+    @Transactional
+    @Query("update AnalysisJob j set j.heartbeatAt = :now"
+            + " where j.id in :ids and j.owner = :owner and j.status = :running")
+    int heartbeat(@Param("ids") Collection<String> ids, @Param("owner") String owner,
+            @Param("now") LocalDateTime now, @Param("running") JobStatus running);
+
+    /** Back to QUEUED for another attempt; only while the caller still owns the run. */
+    @Modifying
+    @Transactional
+    @Query("update AnalysisJob j set j.status = :queued, j.owner = null, j.error = :error, j.updatedAt = :now"
+            + " where j.id = :id and j.owner = :owner and j.status = :running")
+    int release(@Param("id") String id, @Param("owner") String owner, @Param("error") String error,
+            @Param("now") LocalDateTime now, @Param("queued") JobStatus queued, @Param("running") JobStatus running);
+
+    /** COMPLETED or FAILED for good; no attempt follows, so the raw text is dropped. */
+    @Modifying
+    @Transactional
+    @Query("update AnalysisJob j set j.status = :status, j.complaintId = :complaintId, j.error = :error,"
+            + " j.rawText = null, j.owner = null, j.updatedAt = :now"
+            + " where j.id = :id and j.owner = :owner and j.status = :running")
+    int finish(@Param("id") String id, @Param("owner") String owner, @Param("status") JobStatus status,
+            @Param("complaintId") Long complaintId, @Param("error") String error,
+            @Param("now") LocalDateTime now, @Param("running") JobStatus running);
+
+    /** Requeues a RUNNING job whose owner stopped heartbeating, if it still has not. */
+    @Modifying
+    @Transactional
+    @Query("update AnalysisJob j set j.status = :queued, j.owner = null, j.updatedAt = :now"
+            + " where j.id = :id and j.status = :running and (j.heartbeatAt is null or j.heartbeatAt < :cutoff)")
+    int releaseStale(@Param("id") String id, @Param("cutoff") LocalDateTime cutoff,
+            @Param("now") LocalDateTime now, @Param("queued") JobStatus queued, @Param("running") JobStatus running);
+
+    @Modifying
+    @Transactional
+    @Query("update AnalysisJob j set j.status = :failed, j.error = :error, j.rawText = null, j.owner = null,"
+            + " j.updatedAt = :now"
+            + " where j.id = :id and j.status = :running and (j.heartbeatAt is null or j.heartbeatAt < :cutoff)")
+    int failStale(@Param("id") String id, @Param("error") String error, @Param("cutoff") LocalDateTime cutoff,
+            @Param("now") LocalDateTime now, @Param("failed") JobStatus failed, @Param("running") JobStatus running);
+}
@@ -0,0 +1,210 @@
+package com.complaintops.backend;
+
+import org.springframework.stereotype.Service;
+import org.springframework.beans.factory.annotation.Value;
+import org.springframework.boot.context.event.ApplicationReadyEvent;
+import org.springframework.context.event.EventListener;
+import org.springframework.data.domain.PageRequest;
+import org.springframework.scheduling.annotation.Scheduled;
+import org.springframework.web.reactive.function.client.WebClient;
+import jakarta.annotation.PostConstruct;
+import jakarta.annotation.PreDestroy;
+import lombok.RequiredArgsConstructor;
+import java.time.Duration;
+import java.time.LocalDateTime;
+import java.util.Objects;
+import java.util.Set;
+import java.util.UUID;
+import java.util.concurrent.ArrayBlockingQueue;
+import java.util.concurrent.ConcurrentHashMap;
+import java.util.concurrent.RejectedExecutionException;
+import java.util.concurrent.ThreadPoolExecutor;
+import java.util.concurrent.TimeUnit;
+
+/**
+ * Runs complaint analysis as persisted background jobs.
+ * The analysis_jobs table is the source of truth: the in-memory executor is only a bounded
+ * buffer in front of it, and the poller refills it from QUEUED rows, so queued work
+ * survives restarts and overflow. Several instances may share the table: a job is claimed
+ * with a conditional update, so exactly one instance runs each attempt, and the claiming
+ * instance heartbeats the row while it runs. A job that fails, or whose RUNNING row stopped
+ * heartbeating because its instance died, is queued again until it has used
+ * jobs.max-attempts attempts, and then marked FAILED.
+ */
+@Service
+@RequiredArgsConstructor
+public class AnalysisJobService {
+
+    private final AnalysisJobRepository jobRepository;
+    private final OrchestratorService orchestratorService;
+    private final WebClient.Builder webClientBuilder;
+
+    @Value("${jobs.worker-threads:4}")
+    private int workerThreads;
+
+    @Value("${jobs.queue-capacity:100}")
+    private int queueCapacity;
+
+    @Value("${jobs.callback-url:}")
+    private String callbackUrl;
+
+    @Value("${jobs.max-attempts:3}")
+    private int maxAttempts;
+
+    @Value("${jobs.stale-after-ms:60000}")
+    private long staleAfterMs;
+
+    // Owner recorded on claimed rows; a restarted process is a new owner
+    private final String instanceId = UUID.randomUUID().toString();
+
+    private ThreadPoolExecutor executor;
+    private final Set<String> inFlight = ConcurrentHashMap.newKeySet();
+
+    @PostConstruct
+    void startExecutor() {
+        executor = new ThreadPoolExecutor(
+                workerThreads,
+                workerThreads,
+                0L,
+                TimeUnit.MILLISECONDS,
+                new ArrayBlockingQueue<>(queueCapacity));
+    }
+
+    @PreDestroy
+    void stopExecutor() {
+        executor.shutdown();
+    }
+
+    @EventListener(ApplicationReadyEvent.class)
+    public void recoverJobs() {
+        recoverStaleJobs();
+        dispatchQueuedJobs();
+    }
+
+    /**
+     * Takes over RUNNING jobs whose owner stopped heartbeating. A job that is RUNNING on a live
+     * instance is left alone, so a restart or a second instance never runs it twice.
+     */
+    @Scheduled(fixedDelayString = "${jobs.recovery-interval-ms:30000}", initialDelayString = "${jobs.recovery-interval-ms:30000}")
+    public void recoverStaleJobs() {
+        LocalDateTime cutoff = LocalDateTime.now().minus(Duration.ofMillis(staleAfterMs));
+        for (AnalysisJob job : jobRepository.findStaleRunning(JobStatus.RUNNING, cutoff)) {
+            // A job that crashes its instance on every attempt must not loop forever
+            if (job.getAttempts() >= maxAttempts) {
+                String error = "Interrupted on each of " + job.getAttempts() + " attempts";
+                if (jobRepository.failStale(job.getId(), error, cutoff, LocalDateTime.now(),
+                        JobStatus.FAILED, JobStatus.RUNNING) > 0) {
+                    jobRepository.findById(Objects.requireNonNull(job.getId())).ifPresent(this::sendCallback);
+                }
+                continue;
+            }
+            jobRepository.releaseStale(job.getId(), cutoff, LocalDateTime.now(), JobStatus.QUEUED, JobStatus.RUNNING);
+        }
+    }
+
+    @Scheduled(fixedDelayString = "${jobs.heartbeat-ms:10000}")
+    public void heartbeat() {
+        Set<String> running = Set.copyOf(inFlight);
+        if (!running.isEmpty()) {
+            jobRepository.heartbeat(running, instanceId, LocalDateTime.now(), JobStatus.RUNNING);
+        }
+    }
+
+    public AnalysisJob submit(String rawText) {
+        AnalysisJob job = new AnalysisJob();
+        job.setId(UUID.randomUUID().toString());
+        job.setRawText(rawText);
+        jobRepository.save(job);
+        dispatch(job.getId());
+        return job;
+    }
+
+    public AnalysisJob getJob(String id) {
+        return jobRepository.findById(Objects.requireNonNull(id))
+                .orElseThrow(() -> new RuntimeException("Job not found"));
+    }
+
+    @Scheduled(fixedDelayString = "${jobs.poll-interval-ms:5000}")
+    public void dispatchQueuedJobs() {
+        int freeSlots = executor.getQueue().remainingCapacity();
+        if (freeSlots <= 0) {
+            return;
+        }
+        for (AnalysisJob job : jobRepository.findByStatusOrderByCreatedAtAsc(
+                JobStatus.QUEUED, PageRequest.of(0, freeSlots))) {
+            dispatch(job.getId());
+        }
+    }
+
+    private void dispatch(String jobId) {
+        if (!inFlight.add(jobId)) {
+            return;
+        }
+        try {
+            executor.execute(() -> process(jobId));
+        } catch (RejectedExecutionException e) {
+            // Buffer full: the job stays QUEUED in the database and the poller picks it up later
+            inFlight.remove(jobId);
+        }
+    }
+
+    private void process(String jobId) {
+        try {
+            // Another instance may have claimed it since it was read as QUEUED
+            if (jobRepository.claim(jobId, instanceId, LocalDateTime.now(), JobStatus.QUEUED, JobStatus.RUNNING) == 0) {
+                return;
+            }
+            AnalysisJob job = jobRepository.findById(Objects.requireNonNull(jobId)).orElse(null);
+            if (job == null) {
+                return;
+            }
+
+            Complaint complaint;
+            try {
+                complaint = orchestratorService.analyzeComplaint(job.getRawText());
+            } catch (Exception e) {
+                System.err.println("Job " + jobId + " attempt " + job.getAttempts() + " failed: " + e.getMessage());
+                if (job.getAttempts() >= maxAttempts) {
+                    finish(jobId, JobStatus.FAILED, null, e.getMessage());
+                } else {
+                    // Back to the table; the poller retries it on a later pass
+                    release(jobId, e.getMessage());
+                }
+                return;
+            }
+            finish(jobId, JobStatus.COMPLETED, complaint.getId(), null);
+        } finally {
+            inFlight.remove(jobId);
+        }
+    }
+
+    private void release(String jobId, String error) {
+        if (jobRepository.release(jobId, instanceId, error, LocalDateTime.now(), JobStatus.QUEUED, JobStatus.RUNNING) == 0) {
+            System.err.println("Job " + jobId + " was taken over after its heartbeat lapsed; result dropped");
+        }
+    }
+
+    private void finish(String jobId, JobStatus status, Long complaintId, String error) {
+        if (jobRepository.finish(jobId, instanceId, status, complaintId, error, LocalDateTime.now(), JobStatus.RUNNING) == 0) {
+            System.err.println("Job " + jobId + " was taken over after its heartbeat lapsed; result dropped");
+            return;
+        }
+        jobRepository.findById(Objects.requireNonNull(jobId)).ifPresent(this::sendCallback);
+    }
+
+    private void sendCallback(AnalysisJob job) {
+        if (callbackUrl == null || callbackUrl.isBlank()) {
+            return;
+        }
+        webClientBuilder.build()
+                .post()
+                .uri(callbackUrl)
+                .bodyValue(job)
+                .retrieve()
+                .toBodilessEntity()
+                .timeout(Duration.ofSeconds(10))
+                .subscribe(
+                        response -> { },
+                        e -> System.err.println("Job callback failed for " + job.getId() + ": " + e.getMessage()));
+    }
+}
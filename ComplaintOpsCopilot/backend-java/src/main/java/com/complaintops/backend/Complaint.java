@@ -7,13 +7,22 @@ import lombok.AllArgsConstructor;
 import java.time.LocalDateTime;
 
 @Entity
-@Table(name = "complaints")
+@Table(name = "complaints", indexes = {
+        @Index(name = "idx_complaints_created_at", columnList = "created_at"),
+        @Index(name = "idx_complaints_status_created", columnList = "status, created_at"),
+        @Index(name = "idx_complaints_urgency_created", columnList = "urgency, created_at"),
+        @Index(name = "idx_complaints_category_created", columnList = "category, created_at")
+})
 @Data
 @NoArgsConstructor
 @AllArgsConstructor
 public class Complaint {
+    // IDENTITY makes Hibernate insert rows one statement at a time; a sequence lets saveAll use
+    // JDBC batches. complaints_id_seq is the sequence backing the existing identity column, so
+    // no migration is needed; allocationSize must stay equal to its increment (1).
     @Id
-    @GeneratedValue(strategy = GenerationType.IDENTITY)
+    @GeneratedValue(strategy = GenerationType.SEQUENCE, generator = "complaints_seq")
+    @SequenceGenerator(name = "complaints_seq", sequenceName = "complaints_id_seq", allocationSize = 1)
     private Long id;
 
     @Column(columnDefinition = "TEXT")
@@ -1,9 +1,19 @@
 package com.complaintops.backend;
 
 import org.springframework.web.bind.annotation.*;
+import org.springframework.http.HttpStatus;
+import org.springframework.data.domain.PageRequest;
+import org.springframework.data.domain.Sort;
+import org.springframework.format.annotation.DateTimeFormat;
+import org.springframework.http.HttpHeaders;
+import org.springframework.http.MediaType;
+import org.springframework.web.server.ResponseStatusException;
+import org.springframework.web.servlet.mvc.method.annotation.SseEmitter;
 import lombok.RequiredArgsConstructor;
 import lombok.Data;
-import java.util.List;
+import java.io.IOException;
+import java.io.InputStream;
+import java.time.LocalDateTime;
 
 @RestController
 @RequestMapping("/api")
@@ -12,10 +22,34 @@ import java.util.List;
 public class ComplaintController {
 
     private final OrchestratorService orchestratorService;
+    private final AnalysisJobService analysisJobService;
+    private final ComplaintEventService complaintEventService;
+    private final ComplaintImportService complaintImportService;
+
+    static final int MAX_PAGE_SIZE = 100;
 
     @GetMapping("/complaints")
-    public List<Complaint> getAllComplaints() {
-        return orchestratorService.getAllComplaints();
+    public PageResponse<ComplaintSummary> listComplaints(
+            @RequestParam(defaultValue = "0") int page,
+            @RequestParam(defaultValue = "20") int size,
+            @RequestParam(required = false) ComplaintStatus status,
+            @RequestParam(required = false) String urgency,
+            @RequestParam(required = false) String category,
+            @RequestParam(required = false) @DateTimeFormat(iso = DateTimeFormat.ISO.DATE_TIME) LocalDateTime createdFrom,
+            @RequestParam(required = false) @DateTimeFormat(iso = DateTimeFormat.ISO.DATE_TIME) LocalDateTime createdTo) {
+        PageRequest pageRequest = PageRequest.of(
+                Math.max(0, page),
+                Math.min(Math.max(1, size), MAX_PAGE_SIZE),
+                Sort.by(Sort.Order.desc("createdAt"), Sort.Order.desc("id")));
+        return orchestratorService.listComplaints(status, urgency, category, createdFrom, createdTo, pageRequest);
+    }
+
+    // Resume token: EventSource sends Last-Event-ID on reconnect; "since" serves clients that reconnect manually
+    @GetMapping(value = "/complaints/stream", produces = MediaType.TEXT_EVENT_STREAM_VALUE)
+    public SseEmitter streamComplaintEvents(
+            @RequestHeader(value = "Last-Event-ID", required = false) String lastEventId,
+            @RequestParam(required = false) String since) {
+        return complaintEventService.subscribe(lastEventId != null ? lastEventId : since);
     }
 
     @GetMapping("/complaints/{id}")
@@ -23,13 +57,79 @@ public class ComplaintController {
         return orchestratorService.getComplaint(id);
     }
 
+    @PutMapping("/complaints/{id}/status")
+    public Complaint updateStatus(@PathVariable Long id, @RequestBody StatusUpdateRequest request) {
+        return orchestratorService.updateStatus(id, request.getStatus());
+    }
+
     @PostMapping("/analyze")
     public Complaint analyzeComplaint(@RequestBody ComplaintRequest request) {
         return orchestratorService.analyzeComplaint(request.getText());
     }
 
+    @PostMapping("/jobs")
+    @ResponseStatus(HttpStatus.ACCEPTED)
+    public AnalysisJob submitJob(@RequestBody ComplaintRequest request) {
+        return analysisJobService.submit(request.getText());
+    }
+
+    @GetMapping("/jobs/{id}")
+    public AnalysisJob getJob(@PathVariable String id) {
+        return analysisJobService.getJob(id);
+    }
+
+    // The body is read as a raw stream, e.g. curl --data-binary @complaints.csv -H "Content-Type: text/csv"
+    @PostMapping("/imports")
+    @ResponseStatus(HttpStatus.ACCEPTED)
+    public ImportJob importComplaints(
+            @RequestParam(required = false) String format,
+            @RequestHeader(value = HttpHeaders.CONTENT_TYPE, required = false) String contentType,
+            InputStream body) throws IOException {
+        return complaintImportService.submit(body, resolveImportFormat(format, contentType));
+    }
+
+    @GetMapping("/imports/{id}")
+    public ImportJob getImport(@PathVariable String id) {
+        return complaintImportService.getImport(id);
+    }
+
+    @GetMapping("/imports/{id}/failures")
+    public PageResponse<ImportFailure> listImportFailures(
+            @PathVariable String id,
+            @RequestParam(defaultValue = "0") int page,
+            @RequestParam(defaultValue = "50") int size) {
+        return complaintImportService.listFailures(
+                id, PageRequest.of(Math.max(0, page), Math.min(Math.max(1, size), MAX_PAGE_SIZE)));
+    }
+
+    // ?format=csv|jsonl wins; otherwise text/csv means CSV and JSON-lines content types mean JSONL
+    private static ImportFormat resolveImportFormat(String format, String contentType) {
+        if (format != null && !format.isBlank()) {
+            try {
+                return ImportFormat.valueOf(format.trim().toUpperCase());
+            } catch (IllegalArgumentException e) {
+                throw new ResponseStatusException(HttpStatus.BAD_REQUEST, "format must be csv or jsonl");
+            }
+        }
+        String type = contentType == null ? "" : contentType.toLowerCase();
+        if (type.startsWith("text/csv")) {
+            return ImportFormat.CSV;
+        }
+        if (type.startsWith("application/x-ndjson") || type.startsWith("application/jsonl")
+                || type.startsWith("application/json-lines")) {
+            return ImportFormat.JSONL;
+        }
+        throw new ResponseStatusException(HttpStatus.BAD_REQUEST,
+                "Send Content-Type text/csv or application/x-ndjson, or pass ?format=csv|jsonl");
+    }
+
     @Data
     static class ComplaintRequest {
         private String text;
     }
+
+    @Data
+    static class StatusUpdateRequest {
+        private ComplaintStatus status;
+    }
 }
@@ -0,0 +1,235 @@
+package com.complaintops.backend;
+
+import org.springframework.stereotype.Service;
+import org.springframework.beans.factory.annotation.Value;
+import org.springframework.scheduling.annotation.Scheduled;
+import org.springframework.web.servlet.mvc.method.annotation.SseEmitter;
+import jakarta.annotation.PreDestroy;
+import lombok.AllArgsConstructor;
+import lombok.Data;
+import lombok.NoArgsConstructor;
+import java.io.IOException;
+import java.util.ArrayDeque;
+import java.util.ArrayList;
+import java.util.Deque;
+import java.util.List;
+import java.util.concurrent.CopyOnWriteArrayList;
+import java.util.concurrent.ExecutorService;
+import java.util.concurrent.Executors;
+import java.util.concurrent.RejectedExecutionException;
+
+/**
+ * Pushes complaint create/status-change events to inbox clients over SSE.
+ * Every event id is a resume token "epoch:sequence". Reconnecting clients send it back
+ * (Last-Event-ID) and receive the events they missed from a bounded in-memory buffer;
+ * when the token is from another server instance or has fallen out of the buffer they
+ * get a single "reset" event and reload the list instead.
+ * Publishing only appends to per-client queues; each client's queue is written by one
+ * sender task at a time, so a stalled connection delays that client alone. A client more
+ * than events.buffer-size events behind is disconnected and resumes on reconnect.
+ */
+@Service
+public class ComplaintEventService {
+
+    static final String EVENT_CREATED = "created";
+    static final String EVENT_STATUS = "status";
+    static final String EVENT_RESET = "reset";
+
+    @Value("${events.buffer-size:1000}")
+    private int bufferSize;
+
+    @Value("${events.emitter-timeout-ms:1800000}")
+    private long emitterTimeoutMs;
+
+    private final String epoch = Long.toString(System.currentTimeMillis());
+    private final Deque<BufferedEvent> buffer = new ArrayDeque<>();
+    private final List<Client> clients = new CopyOnWriteArrayList<>();
+    // Blocking servlet writes happen here, never on the publishing thread
+    private final ExecutorService sender = Executors.newCachedThreadPool();
+    private long sequence = 0;
+
+    @Data
+    @NoArgsConstructor
+    @AllArgsConstructor
+    public static class ComplaintEvent {
+        private String type;
+        private ComplaintSummary complaint;
+    }
+
+    private record BufferedEvent(long sequence, String id, ComplaintEvent event) {
+    }
+
+    @PreDestroy
+    void stopSender() {
+        sender.shutdownNow();
+    }
+
+    public void publish(String type, Complaint complaint) {
+        ComplaintEvent event = new ComplaintEvent(type, new ComplaintSummary(
+                complaint.getId(),
+                complaint.getCategory(),
+                complaint.getUrgency(),
+                complaint.getStatus(),
+                complaint.getCreatedAt()));
+        // Queue under the same lock as subscribe's replay: a client registered mid-publish would
+        // otherwise get this event twice, and concurrent publishes could be queued out of order
+        synchronized (this) {
+            sequence++;
+            BufferedEvent buffered = new BufferedEvent(sequence, epoch + ":" + sequence, event);
+            buffer.addLast(buffered);
+            while (buffer.size() > bufferSize) {
+                buffer.removeFirst();
+            }
+            for (Client client : clients) {
+                client.enqueue(toSse(buffered));
+            }
+        }
+    }
+
+    /** Tells every client to reload its list, for changes too large to push row by row (bulk imports). */
+    public synchronized void publishReset() {
+        for (Client client : clients) {
+            client.enqueue(resetEvent());
+        }
+    }
+
+    public SseEmitter subscribe(String lastEventId) {
+        Client client = new Client(new SseEmitter(emitterTimeoutMs));
+        client.emitter.onCompletion(() -> clients.remove(client));
+        client.emitter.onTimeout(() -> clients.remove(client));
+        client.emitter.onError(e -> clients.remove(client));
+
+        // Register and replay under the lock so no event is missed or delivered out of order
+        synchronized (this) {
+            clients.add(client);
+            if (lastEventId != null && !lastEventId.isBlank()) {
+                List<BufferedEvent> missed = eventsAfter(lastEventId);
+                if (missed == null) {
+                    client.enqueue(resetEvent());
+                } else {
+                    for (BufferedEvent event : missed) {
+                        client.enqueue(toSse(event));
+                    }
+                }
+            }
+        }
+        return client.emitter;
+    }
+
+    /** Events newer than the token, or null when the token cannot be resumed from. */
+    private List<BufferedEvent> eventsAfter(String lastEventId) {
+        String[] parts = lastEventId.split(":");
+        if (parts.length != 2 || !parts[0].equals(epoch)) {
+            return null;
+        }
+        long lastSequence;
+        try {
+            lastSequence = Long.parseLong(parts[1]);
+        } catch (NumberFormatException e) {
+            return null;
+        }
+        long oldestBuffered = buffer.isEmpty() ? sequence + 1 : buffer.peekFirst().sequence();
+        if (lastSequence + 1 < oldestBuffered) {
+            return null;
+        }
+        List<BufferedEvent> missed = new ArrayList<>();
+        for (BufferedEvent event : buffer) {
+            if (event.sequence() > lastSequence) {
+                missed.add(event);
+            }
+        }
+        return missed;
+    }
+
+    @Scheduled(fixedDelayString = "${events.heartbeat-ms:15000}")
+    public void heartbeat() {
+        // Keeps idle connections open through proxies and prunes dead clients
+        for (Client client : clients) {
+            client.enqueue(SseEmitter.event().comment("keepalive"));
+        }
+    }
+
+    // A builder is consumed by one send, so every client gets its own
+    private static SseEmitter.SseEventBuilder toSse(BufferedEvent event) {
+        return SseEmitter.event()
+                .id(event.id())
+                .name(event.event().getType())
+                .data(event.event());
+    }
+
+    // Callers hold the lock
+    private SseEmitter.SseEventBuilder resetEvent() {
+        return SseEmitter.event().id(epoch + ":" + sequence).name(EVENT_RESET).data("");
+    }
+
+    /** One subscriber and the events waiting to be written to it, in order. */
+    private final class Client {
+        private final SseEmitter emitter;
+        private final Deque<SseEmitter.SseEventBuilder> pending = new ArrayDeque<>();
+        private boolean draining;
+        private boolean closed;
+
+        Client(SseEmitter emitter) {
+            this.emitter = emitter;
+        }
+
+        void enqueue(SseEmitter.SseEventBuilder event) {
+            synchronized (this) {
+                if (closed) {
+                    return;
+                }
+                if (pending.size() >= bufferSize) {
+                    // Further behind than the replay buffer: drop it; its reconnect gets a reset
+                    close();
+                    return;
+                }
+                pending.addLast(event);
+                if (draining) {
+                    return;
+                }
+                draining = true;
+            }
+            try {
+                sender.execute(this::drain);
+            } catch (RejectedExecutionException e) {
+                close();
+            }
+        }
+
+        private void drain() {
+            while (true) {
+                SseEmitter.SseEventBuilder event;
+                synchronized (this) {
+                    event = pending.pollFirst();
+                    if (event == null || closed) {
+                        draining = false;
+                        return;
+                    }
+                }
+                try {
+                    emitter.send(event);
+                } catch (IOException | IllegalStateException e) {
+                    close();
+                    return;
+                }
+            }
+        }
+
+        private void close() {
+            synchronized (this) {
+                if (closed) {
+                    return;
+                }
+                closed = true;
+                pending.clear();
+            }
+            clients.remove(this);
+            // complete() waits for a send in progress, so it never runs on the publishing thread
+            try {
+                sender.execute(emitter::complete);
+            } catch (RejectedExecutionException e) {
+                // Shutting down; the container closes the connection
+            }
+        }
+    }
+}
@@ -0,0 +1,339 @@
+package com.complaintops.backend;
+
+import org.springframework.stereotype.Service;
+import org.springframework.beans.factory.annotation.Value;
+import org.springframework.boot.context.event.ApplicationReadyEvent;
+import org.springframework.context.event.EventListener;
+import org.springframework.data.domain.Pageable;
+import com.fasterxml.jackson.databind.ObjectMapper;
+import jakarta.annotation.PostConstruct;
+import jakarta.annotation.PreDestroy;
+import lombok.RequiredArgsConstructor;
+import java.io.IOException;
+import java.io.InputStream;
+import java.nio.file.Files;
+import java.nio.file.Path;
+import java.nio.file.StandardCopyOption;
+import java.time.LocalDateTime;
+import java.util.ArrayList;
+import java.util.List;
+import java.util.Objects;
+import java.util.UUID;
+import java.util.concurrent.ExecutorService;
+import java.util.concurrent.Executors;
+import java.util.concurrent.RejectedExecutionException;
+import java.util.concurrent.Semaphore;
+
+/**
+ * Bulk complaint import from CSV or JSONL uploads.
+ * The upload is spooled to disk as it streams in, then one import at a time is read record by
+ * record. At most imports.concurrency records are in the AI pipeline at once, and analyzed
+ * complaints are saved imports.batch-size at a time in one transaction instead of one save
+ * per complaint. Records that cannot be parsed, analyzed or saved, including ones where an AI
+ * stage fell back, are kept as ImportFailure rows. Progress is persisted by the import's own
+ * thread after batches land, with the last record number below which nothing is missing.
+ */
+@Service
+@RequiredArgsConstructor
+public class ComplaintImportService {
+
+    private final ImportJobRepository importJobRepository;
+    private final ImportFailureRepository failureRepository;
+    private final ComplaintRepository complaintRepository;
+    private final OrchestratorService orchestratorService;
+    private final ComplaintEventService eventService;
+    private final ObjectMapper objectMapper;
+
+    @Value("${imports.concurrency:8}")
+    private int concurrency;
+
+    @Value("${imports.batch-size:200}")
+    private int batchSize;
+
+    // Empty means the system temp directory
+    @Value("${imports.spool-dir:}")
+    private String spoolDir;
+
+    // One import runs at a time so the AI service only ever sees imports.concurrency requests
+    private ExecutorService runner;
+    private ExecutorService workers;
+
+    @PostConstruct
+    void startExecutors() {
+        runner = Executors.newSingleThreadExecutor();
+        workers = Executors.newFixedThreadPool(concurrency);
+    }
+
+    @PreDestroy
+    void stopExecutors() {
+        runner.shutdownNow();
+        workers.shutdownNow();
+    }
+
+    @EventListener(ApplicationReadyEvent.class)
+    public void recoverImports() {
+        // A RUNNING import already saved part of its records; running it again would duplicate them
+        for (ImportJob job : importJobRepository.findByStatusOrderByCreatedAtAsc(JobStatus.RUNNING)) {
+            long through = job.getCompletedThrough();
+            finish(job, JobStatus.FAILED, through == 0
+                    ? "Interrupted by a restart before any record was imported; re-upload the whole file"
+                    : "Interrupted by a restart; records 1-" + through
+                            + " were imported or recorded as failures, re-upload the records after record " + through);
+        }
+        for (ImportJob job : importJobRepository.findByStatusOrderByCreatedAtAsc(JobStatus.QUEUED)) {
+            if (job.getSpoolPath() != null && Files.exists(Path.of(job.getSpoolPath()))) {
+                runner.execute(() -> run(job.getId()));
+            } else {
+                finish(job, JobStatus.FAILED, "Upload was lost before the import started");
+            }
+        }
+    }
+
+    public ImportJob submit(InputStream body, ImportFormat format) throws IOException {
+        ImportJob job = new ImportJob();
+        job.setId(UUID.randomUUID().toString());
+        job.setFormat(format);
+        Path directory = spoolDir == null || spoolDir.isBlank()
+                ? Path.of(System.getProperty("java.io.tmpdir"))
+                : Files.createDirectories(Path.of(spoolDir));
+        Path spool = Files.createTempFile(directory, "import-" + job.getId() + "-", "." + format.name().toLowerCase());
+        try {
+            Files.copy(body, spool, StandardCopyOption.REPLACE_EXISTING);
+        } catch (IOException e) {
+            Files.deleteIfExists(spool);
+            throw e;
+        }
+        job.setSpoolPath(spool.toString());
+        importJobRepository.save(job);
+        runner.execute(() -> run(job.getId()));
+        return job;
+    }
+
+    public ImportJob getImport(String id) {
+        return importJobRepository.findById(Objects.requireNonNull(id))
+                .orElseThrow(() -> new RuntimeException("Import not found"));
+    }
+
+    public PageResponse<ImportFailure> listFailures(String id, Pageable pageable) {
+        return PageResponse.of(failureRepository.findByImportIdOrderByRecordNumberAsc(id, pageable));
+    }
+
+    private void run(String importId) {
+        ImportJob job = importJobRepository.findById(Objects.requireNonNull(importId)).orElse(null);
+        if (job == null || job.getStatus() != JobStatus.QUEUED) {
+            return;
+        }
+        job.setStatus(JobStatus.RUNNING);
+        job.setUpdatedAt(LocalDateTime.now());
+        importJobRepository.save(job);
+
+        ImportRun importRun = new ImportRun(job);
+        // Reading pauses while this many records are queued or in the pipeline
+        int maxInFlight = concurrency * 2;
+        Semaphore inFlight = new Semaphore(maxInFlight);
+        JobStatus outcome = JobStatus.COMPLETED;
+        String error = null;
+        try (ImportRecordReader reader = new ImportRecordReader(
+                Path.of(job.getSpoolPath()), job.getFormat(), objectMapper)) {
+            ImportRecordReader.ImportRecord record;
+            while ((record = reader.next()) != null) {
+                importRun.recordRead();
+                importRun.saveProgressIfChanged();
+                if (record.error() != null) {
+                    importRun.fail(record.number(), record.error());
+                    continue;
+                }
+                inFlight.acquire();
+                ImportRecordReader.ImportRecord current = record;
+                try {
+                    workers.execute(() -> {
+                        try {
+                            importRun.analyze(current);
+                        } finally {
+                            inFlight.release();
+                        }
+                    });
+                } catch (RejectedExecutionException e) {
+                    inFlight.release();
+                    throw e;
+                }
+            }
+        } catch (InterruptedException e) {
+            Thread.currentThread().interrupt();
+            outcome = JobStatus.FAILED;
+            error = "Import interrupted";
+        } catch (Exception e) {
+            System.err.println("Import " + importId + " failed: " + e.getMessage());
+            outcome = JobStatus.FAILED;
+            error = e.getMessage();
+        }
+
+        try {
+            inFlight.acquire(maxInFlight);
+        } catch (InterruptedException e) {
+            Thread.currentThread().interrupt();
+        }
+        importRun.flush();
+        importRun.saveProgressIfChanged();
+        finish(job, outcome, error);
+        // Imported rows are not pushed one by one; inbox clients reload once instead
+        eventService.publishReset();
+    }
+
+    private void finish(ImportJob job, JobStatus status, String error) {
+        job.setStatus(status);
+        job.setError(error);
+        job.setFinishedAt(LocalDateTime.now());
+        job.setUpdatedAt(LocalDateTime.now());
+        importJobRepository.save(job);
+        if (job.getSpoolPath() != null) {
+            try {
+                Files.deleteIfExists(Path.of(job.getSpoolPath()));
+            } catch (IOException e) {
+                System.err.println("Could not delete import spool " + job.getSpoolPath() + ": " + e.getMessage());
+            }
+        }
+    }
+
+    /**
+     * Counters and pending batches of one running import, shared by its worker threads.
+     * Only the import's runner thread writes the ImportJob row (saveProgressIfChanged).
+     */
+    private class ImportRun {
+        private final ImportJob job;
+        private final List<Complaint> pendingComplaints = new ArrayList<>();
+        private final List<Long> pendingRecordNumbers = new ArrayList<>();
+        private final List<ImportFailure> pendingFailures = new ArrayList<>();
+        private final ImportWatermark watermark = new ImportWatermark();
+        private long totalRecords;
+        private long succeeded;
+        private long failed;
+        private boolean progressChanged;
+
+        ImportRun(ImportJob job) {
+            this.job = job;
+        }
+
+        synchronized void recordRead() {
+            totalRecords++;
+        }
+
+        void analyze(ImportRecordReader.ImportRecord record) {
+            OrchestratorService.Analysis analysis;
+            try {
+                analysis = orchestratorService.analyze(record.text());
+            } catch (Exception e) {
+                fail(record.number(), "Analysis failed: " + e.getMessage());
+                return;
+            }
+            // A fallback draft is not an analysis; keep the record for a re-upload instead
+            if (!analysis.failedStages().isEmpty()) {
+                fail(record.number(), "Analysis stages failed: " + String.join(", ", analysis.failedStages()));
+                return;
+            }
+            Complaint complaint = analysis.complaint();
+            if (record.createdAt() != null) {
+                complaint.setCreatedAt(record.createdAt());
+            }
+            List<Complaint> complaints = null;
+            List<Long> recordNumbers = null;
+            synchronized (this) {
+                pendingComplaints.add(complaint);
+                pendingRecordNumbers.add(record.number());
+                if (pendingComplaints.size() >= batchSize) {
+                    complaints = new ArrayList<>(pendingComplaints);
+                    recordNumbers = new ArrayList<>(pendingRecordNumbers);
+                    pendingComplaints.clear();
+                    pendingRecordNumbers.clear();
+                }
+            }
+            if (complaints != null) {
+                saveComplaints(complaints, recordNumbers);
+            }
+        }
+
+        void fail(long recordNumber, String error) {
+            List<ImportFailure> failures = null;
+            synchronized (this) {
+                failed++;
+                pendingFailures.add(new ImportFailure(null, job.getId(), recordNumber, error));
+                if (pendingFailures.size() >= batchSize) {
+                    failures = new ArrayList<>(pendingFailures);
+                    pendingFailures.clear();
+                }
+            }
+            if (failures != null) {
+                saveFailures(failures);
+            }
+        }
+
+        void flush() {
+            List<Complaint> complaints;
+            List<Long> recordNumbers;
+            synchronized (this) {
+                complaints = new ArrayList<>(pendingComplaints);
+                recordNumbers = new ArrayList<>(pendingRecordNumbers);
+                pendingComplaints.clear();
+                pendingRecordNumbers.clear();
+            }
+            if (!complaints.isEmpty()) {
+                saveComplaints(complaints, recordNumbers);
+            }
+            List<ImportFailure> failures;
+            synchronized (this) {
+                failures = new ArrayList<>(pendingFailures);
+                pendingFailures.clear();
+            }
+            if (!failures.isEmpty()) {
+                saveFailures(failures);
+            }
+        }
+
+        /** Persists the counters if a batch landed since the last call; runner thread only. */
+        void saveProgressIfChanged() {
+            synchronized (this) {
+                if (!progressChanged) {
+                    return;
+                }
+                progressChanged = false;
+                job.setTotalRecords(totalRecords);
+                job.setSucceeded(succeeded);
+                job.setFailed(failed);
+                job.setCompletedThrough(watermark.completedThrough());
+            }
+            job.setUpdatedAt(LocalDateTime.now());
+            importJobRepository.save(job);
+        }
+
+        private void saveComplaints(List<Complaint> complaints, List<Long> recordNumbers) {
+            try {
+                // saveAll runs in a single transaction: one commit per batch
+                complaintRepository.saveAll(complaints);
+            } catch (Exception e) {
+                System.err.println("Import " + job.getId() + " batch save failed: " + e.getMessage());
+                for (Long recordNumber : recordNumbers) {
+                    fail(recordNumber, "Save failed: " + e.getMessage());
+                }
+                return;
+            }
+            synchronized (this) {
+                succeeded += complaints.size();
+                watermark.complete(recordNumbers);
+                progressChanged = true;
+            }
+        }
+
+        private void saveFailures(List<ImportFailure> failures) {
+            try {
+                failureRepository.saveAll(failures);
+            } catch (Exception e) {
+                // Still counted in failed; only the per-record detail is lost
+                System.err.println("Import " + job.getId() + " could not record failures: " + e.getMessage());
+            }
+            synchronized (this) {
+                watermark.complete(failures.stream().map(ImportFailure::getRecordNumber).toList());
+                progressChanged = true;
+            }
+        }
+    }
+}
@@ -1,8 +1,31 @@
 package com.complaintops.backend;
 
+import org.springframework.data.domain.Page;
+import org.springframework.data.domain.Pageable;
 import org.springframework.data.jpa.repository.JpaRepository;
+import org.springframework.data.jpa.repository.Query;
+import org.springframework.data.repository.query.Param;
 import org.springframework.stereotype.Repository;
+import java.time.LocalDateTime;
 
 @Repository
 public interface ComplaintRepository extends JpaRepository<Complaint, Long> {
+
+    String SUMMARY_FILTER = " from Complaint c"
+            + " where (:status is null or c.status = :status)"
+            + " and (:urgency is null or c.urgency = :urgency)"
+            + " and (:category is null or c.category = :category)"
+            + " and (:createdFrom is null or c.createdAt >= :createdFrom)"
+            + " and (:createdTo is null or c.createdAt < :createdTo)";
+
+    @Query(value = "select new com.complaintops.backend.ComplaintSummary("
+            + "c.id, c.category, c.urgency, c.status, c.createdAt)" + SUMMARY_FILTER,
+            countQuery = "select count(c)" + SUMMARY_FILTER)
+    Page<ComplaintSummary> findSummaries(
+            @Param("status") ComplaintStatus status,
+            @Param("urgency") String urgency,
+            @Param("category") String category,
+            @Param("createdFrom") LocalDateTime createdFrom,
+            @Param("createdTo") LocalDateTime createdTo,
+            Pageable pageable);
 }
@@ -0,0 +1,20 @@
+package com.complaintops.backend;
+
+import lombok.AllArgsConstructor;
+import lombok.Data;
+import lombok.NoArgsConstructor;
+import java.time.LocalDateTime;
+
+/**
+ * Inbox row: selected directly in JPQL so the large TEXT columns are never loaded.
+ */
+@Data
+@NoArgsConstructor
+@AllArgsConstructor
+public class ComplaintSummary {
+    private Long id;
+    private String category;
+    private String urgency;
+    private ComplaintStatus status;
+    private LocalDateTime createdAt;
+}
@@ -54,10 +54,26 @@ public class DTOs {
         private String text;
     }
 
+    @Data
+    public static class SourceItem {
+        private String snippet;
+        private String source;
+
+        @JsonProperty("doc_name")
+        private String docName;
+
+        @JsonProperty("chunk_id")
+        private String chunkId;
+
+        private Double score;
+
+        private String category;
+    }
+
     @Data
     public static class RAGResponse {
-        @JsonProperty("relevant_snippets")
-        private List<String> relevantSnippets;
+        @JsonProperty("relevant_sources")
+        private List<SourceItem> relevantSources;
     }
 
     @Data
@@ -68,8 +84,11 @@ public class DTOs {
         private String category;
         private String urgency;
 
-        @JsonProperty("relevant_snippets")
-        private List<String> relevantSnippets;
+        @JsonProperty("relevant_sources")
+        private List<SourceItem> relevantSources;
+
+        @JsonProperty("category_confidence")
+        private double categoryConfidence;
     }
 
     @Data
@@ -0,0 +1,29 @@
+package com.complaintops.backend;
+
+import jakarta.persistence.*;
+import lombok.Data;
+import lombok.NoArgsConstructor;
+import lombok.AllArgsConstructor;
+
+@Entity
+@Table(name = "import_failures", indexes = {
+        @Index(name = "idx_import_failures_import_record", columnList = "import_id, record_number")
+})
+@Data
+@NoArgsConstructor
+@AllArgsConstructor
+public class ImportFailure {
+    // Sequence ids (unlike IDENTITY) let Hibernate send a whole batch of failures in one JDBC batch
+    @Id
+    @GeneratedValue(strategy = GenerationType.SEQUENCE, generator = "import_failures_seq")
+    @SequenceGenerator(name = "import_failures_seq", sequenceName = "import_failures_seq", allocationSize = 50)
+    private Long id;
+
+    private String importId;
+
+    // 1-based position of the record in the upload, not counting the CSV header or blank lines
+    private long recordNumber;
+
+    @Column(columnDefinition = "TEXT")
+    private String error;
+}
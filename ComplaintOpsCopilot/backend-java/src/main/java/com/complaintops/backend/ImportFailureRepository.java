@@ -0,0 +1,12 @@
+package com.complaintops.backend;
+
+import org.springframework.data.domain.Page;
+import org.springframework.data.domain.Pageable;
+import org.springframework.data.jpa.repository.JpaRepository;
+import org.springframework.stereotype.Repository;
+
+@Repository
+public interface ImportFailureRepository extends JpaRepository<ImportFailure, Long> {
+
+    Page<ImportFailure> findByImportIdOrderByRecordNumberAsc(String importId, Pageable pageable);
+}
@@ -0,0 +1,47 @@
+package com.complaintops.backend;
+
+import jakarta.persistence.*;
+import com.fasterxml.jackson.annotation.JsonIgnore;
+import lombok.Data;
+import lombok.NoArgsConstructor;
+import java.time.LocalDateTime;
+
+@Entity
+@Table(name = "import_jobs", indexes = {
+        @Index(name = "idx_import_jobs_status_created", columnList = "status, created_at")
+})
+@Data
+@NoArgsConstructor
+public class ImportJob {
+    @Id
+    private String id;
+
+    @Enumerated(EnumType.STRING)
+    private ImportFormat format;
+
+    @Enumerated(EnumType.STRING)
+    private JobStatus status = JobStatus.QUEUED;
+
+    // Records read from the upload so far; succeeded + failed catch up as analysis finishes
+    private long totalRecords;
+    private long succeeded;
+    private long failed;
+    // Every record up to this number is saved or has an ImportFailure row
+    private long completedThrough;
+
+    @Column(columnDefinition = "TEXT")
+    private String error;
+
+    // Uploaded body spooled to disk; deleted once the import finishes
+    @JsonIgnore
+    private String spoolPath;
+
+    private LocalDateTime createdAt = LocalDateTime.now();
+    private LocalDateTime updatedAt = LocalDateTime.now();
+    private LocalDateTime finishedAt;
+}
+
+enum ImportFormat {
+    CSV,
+    JSONL
+}
@@ -0,0 +1,11 @@
+package com.complaintops.backend;
+
+import org.springframework.data.jpa.repository.JpaRepository;
+import org.springframework.stereotype.Repository;
+import java.util.List;
+
+@Repository
+public interface ImportJobRepository extends JpaRepository<ImportJob, String> {
+
+    List<ImportJob> findByStatusOrderByCreatedAtAsc(JobStatus status);
+}
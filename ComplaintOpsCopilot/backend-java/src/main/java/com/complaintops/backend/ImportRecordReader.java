@@ -0,0 +1,167 @@
+package com.complaintops.backend;
+
+import com.fasterxml.jackson.databind.JsonNode;
+import com.fasterxml.jackson.databind.ObjectMapper;
+import java.io.BufferedReader;
+import java.io.Closeable;
+import java.io.IOException;
+import java.nio.charset.StandardCharsets;
+import java.nio.file.Files;
+import java.nio.file.Path;
+import java.time.LocalDate;
+import java.time.LocalDateTime;
+import java.time.format.DateTimeParseException;
+import java.util.ArrayList;
+import java.util.List;
+
+/**
+ * Reads complaint records one at a time from a CSV or JSONL upload, so memory use does not
+ * depend on the file size. CSV needs a header row with a "text" column; JSONL needs a "text"
+ * field per line. Both accept an optional ISO "created_at" to keep historical dates.
+ * A malformed record comes back with an error instead of stopping the import.
+ */
+class ImportRecordReader implements Closeable {
+
+    record ImportRecord(long number, String text, LocalDateTime createdAt, String error) {
+    }
+
+    private final BufferedReader reader;
+    private final ImportFormat format;
+    private final ObjectMapper objectMapper;
+    private int textColumn = -1;
+    private int createdAtColumn = -1;
+    private long recordNumber = 0;
+
+    ImportRecordReader(Path path, ImportFormat format, ObjectMapper objectMapper) throws IOException {
+        this.reader = Files.newBufferedReader(path, StandardCharsets.UTF_8);
+        this.format = format;
+        this.objectMapper = objectMapper;
+        if (format == ImportFormat.CSV) {
+            readCsvHeader();
+        }
+    }
+
+    /** Next record, or null at the end of the upload. */
+    ImportRecord next() throws IOException {
+        return format == ImportFormat.CSV ? nextCsv() : nextJsonl();
+    }
+
+    private void readCsvHeader() throws IOException {
+        List<String> header = readCsvRow();
+        if (header == null) {
+            throw new IllegalArgumentException("CSV upload is empty");
+        }
+        for (int i = 0; i < header.size(); i++) {
+            String name = header.get(i).replace("\uFEFF", "").trim().toLowerCase();
+            if (name.equals("text")) {
+                textColumn = i;
+            } else if (name.equals("created_at")) {
+                createdAtColumn = i;
+            }
+        }
+        if (textColumn < 0) {
+            throw new IllegalArgumentException("CSV header has no \"text\" column");
+        }
+    }
+
+    private ImportRecord nextCsv() throws IOException {
+        List<String> row;
+        do {
+            row = readCsvRow();
+            if (row == null) {
+                return null;
+            }
+        } while (row.size() == 1 && row.get(0).isBlank());
+        recordNumber++;
+        String text = textColumn < row.size() ? row.get(textColumn) : null;
+        String createdAt = createdAtColumn >= 0 && createdAtColumn < row.size() ? row.get(createdAtColumn) : null;
+        return toRecord(text, createdAt);
+    }
+
+    private ImportRecord nextJsonl() throws IOException {
+        String line;
+        do {
+            line = reader.readLine();
+            if (line == null) {
+                return null;
+            }
+        } while (line.isBlank());
+        recordNumber++;
+        JsonNode node;
+        try {
+            node = objectMapper.readTree(line.replace("\uFEFF", ""));
+        } catch (IOException e) {
+            return new ImportRecord(recordNumber, null, null, "Invalid JSON: " + e.getOriginalMessage());
+        }
+        if (node == null || !node.isObject()) {
+            return new ImportRecord(recordNumber, null, null, "Record is not a JSON object");
+        }
+        JsonNode text = node.get("text");
+        JsonNode createdAt = node.get("created_at");
+        return toRecord(
+                text != null && text.isTextual() ? text.asText() : null,
+                createdAt != null && createdAt.isTextual() ? createdAt.asText() : null);
+    }
+
+    private ImportRecord toRecord(String text, String createdAt) {
+        if (text == null || text.isBlank()) {
+            return new ImportRecord(recordNumber, null, null, "Missing text");
+        }
+        if (createdAt == null || createdAt.isBlank()) {
+            return new ImportRecord(recordNumber, text, null, null);
+        }
+        try {
+            return new ImportRecord(recordNumber, text, parseDateTime(createdAt.trim()), null);
+        } catch (DateTimeParseException e) {
+            return new ImportRecord(recordNumber, null, null, "Invalid created_at: " + createdAt);
+        }
+    }
+
+    private static LocalDateTime parseDateTime(String value) {
+        return value.length() == 10 ? LocalDate.parse(value).atStartOfDay() : LocalDateTime.parse(value);
+    }
+
+    /** One RFC 4180 row: quoted fields may contain commas, doubled quotes and line breaks. */
+    private List<String> readCsvRow() throws IOException {
+        List<String> fields = new ArrayList<>();
+        StringBuilder field = new StringBuilder();
+        boolean quoted = false;
+        boolean sawInput = false;
+        int c;
+        while ((c = reader.read()) != -1) {
+            sawInput = true;
+            if (quoted) {
+                if (c == '"') {
+                    reader.mark(1);
+                    if (reader.read() == '"') {
+                        field.append('"');
+                    } else {
+                        quoted = false;
+                        reader.reset();
+                    }
+                } else {
+                    field.append((char) c);
+                }
+            } else if (c == '"') {
+                quoted = true;
+            } else if (c == ',') {
+                fields.add(field.toString());
+                field.setLength(0);
+            } else if (c == '\n') {
+                break;
+            } else if (c != '\r') {
+                field.append((char) c);
+            }
+        }
+        if (!sawInput) {
+            return null;
+        }
+        fields.add(field.toString());
+        return fields;
+    }
+
+    @Override
+    public void close() throws IOException {
+        reader.close();
+    }
+}
@@ -0,0 +1,30 @@
+package com.complaintops.backend;
+
+import java.util.Collection;
+import java.util.TreeSet;
+
+/**
+ * Last record number with nothing missing before it: every record up to it is saved or has an
+ * ImportFailure row. Workers finish records out of order, so numbers above a gap wait here until
+ * the gap closes. Not thread-safe; the owning import run guards it.
+ */
+class ImportWatermark {
+
+    private final TreeSet<Long> completedAhead = new TreeSet<>();
+    private long completedThrough;
+
+    void complete(Collection<Long> recordNumbers) {
+        for (Long recordNumber : recordNumbers) {
+            if (recordNumber > completedThrough) {
+                completedAhead.add(recordNumber);
+            }
+        }
+        while (!completedAhead.isEmpty() && completedAhead.first() == completedThrough + 1) {
+            completedThrough = completedAhead.pollFirst();
+        }
+    }
+
+    long completedThrough() {
+        return completedThrough;
+    }
+}
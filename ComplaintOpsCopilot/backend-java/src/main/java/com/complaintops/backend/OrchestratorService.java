@@ -2,12 +2,26 @@ package com.complaintops.backend;
 
 import org.springframework.stereotype.Service;
 import org.springframework.web.reactive.function.client.WebClient;
+import org.springframework.http.client.reactive.ReactorClientHttpConnector;
 import org.springframework.beans.factory.annotation.Value;
+import io.micrometer.core.instrument.MeterRegistry;
+import io.micrometer.core.instrument.Timer;
+import io.netty.channel.ChannelOption;
+import jakarta.annotation.PostConstruct;
 import lombok.RequiredArgsConstructor;
+import reactor.core.publisher.Mono;
+import reactor.netty.http.client.HttpClient;
+import reactor.netty.resources.ConnectionProvider;
+import reactor.util.function.Tuple2;
 import java.util.List;
 import java.util.ArrayList;
+import java.util.concurrent.CopyOnWriteArrayList;
 import com.fasterxml.jackson.databind.ObjectMapper;
 import java.util.Objects;
+import java.time.Duration;
+import java.time.LocalDateTime;
+import org.springframework.data.domain.Pageable;
+import java.util.concurrent.TimeUnit;
 
 @Service
 @RequiredArgsConstructor
@@ -15,84 +29,137 @@ public class OrchestratorService {
 
     private final ComplaintRepository repository;
     private final WebClient.Builder webClientBuilder;
+    private final MeterRegistry meterRegistry;
+    private final ComplaintEventService eventService;
+
+    static final String DEADLINE_HEADER = "X-Request-Deadline-Ms";
+    static final String STAGE_TIMER = "complaintops.ai.stage.latency";
 
     @Value("${ai-service.url}")
     private String aiServiceUrl;
 
+    // Total time budget for one complaint across all AI stages
+    @Value("${ai-service.deadline-ms:30000}")
+    private long deadlineMs;
+
+    @Value("${ai-service.timeout.mask-ms:3000}")
+    private long maskTimeoutMs;
+
+    @Value("${ai-service.timeout.predict-ms:3000}")
+    private long predictTimeoutMs;
+
+    @Value("${ai-service.timeout.retrieve-ms:5000}")
+    private long retrieveTimeoutMs;
+
+    @Value("${ai-service.timeout.generate-ms:25000}")
+    private long generateTimeoutMs;
+
+    @Value("${ai-service.max-connections:100}")
+    private int maxConnections;
+
+    @Value("${ai-service.connect-timeout-ms:2000}")
+    private int connectTimeoutMs;
+
+    private WebClient webClient;
+
+    @PostConstruct
+    void buildWebClient() {
+        // One pooled client for the lifetime of the service instead of one per complaint
+        ConnectionProvider connectionProvider = ConnectionProvider.builder("ai-service")
+                .maxConnections(maxConnections)
+                .maxIdleTime(Duration.ofSeconds(30))
+                .build();
+        HttpClient httpClient = HttpClient.create(connectionProvider)
+                .option(ChannelOption.CONNECT_TIMEOUT_MILLIS, connectTimeoutMs);
+        webClient = webClientBuilder
+                .baseUrl(Objects.requireNonNull(aiServiceUrl))
+                .clientConnector(new ReactorClientHttpConnector(httpClient))
+                .build();
+    }
+
+    /** An unsaved complaint and the pipeline stages that failed and were replaced by a fallback. */
+    public record Analysis(Complaint complaint, List<String> failedStages) {
+    }
+
     public Complaint analyzeComplaint(String rawText) {
-        WebClient webClient = webClientBuilder.baseUrl(Objects.requireNonNull(aiServiceUrl)).build();
+        Complaint saved = repository.save(analyze(rawText).complaint());
+        eventService.publish(ComplaintEventService.EVENT_CREATED, saved);
+        return saved;
+    }
+
+    /** Runs the AI pipeline for one complaint and returns it unsaved, so callers can batch inserts. */
+    public Analysis analyze(String rawText) {
+        long deadlineAt = System.currentTimeMillis() + deadlineMs;
+        // Triage and RAG fall back on reactor threads
+        List<String> failedStages = new CopyOnWriteArrayList<>();
 
         // 1. Mask PII
-        DTOs.MaskingResponse maskResp;
-        try {
-            maskResp = webClient.post()
-                    .uri("/mask")
-                    .bodyValue(new DTOs.MaskingRequest(rawText))
-                    .retrieve()
-                    .bodyToMono(DTOs.MaskingResponse.class)
-                    .block();
-        } catch (Exception e) {
-            // Fallback if masking fails (Serious error, but for MVP we wrap)
-            System.err.println("Masking failed: " + e.getMessage());
-            maskResp = new DTOs.MaskingResponse();
-            maskResp.setMaskedText(rawText); // Fallback to raw (RISK!) - In prod, fail hard here.
-            maskResp.setMaskedEntities(new ArrayList<>());
-        }
+        DTOs.MaskingResponse maskResp = callStage(
+                "mask", "/mask", new DTOs.MaskingRequest(rawText),
+                DTOs.MaskingResponse.class, maskTimeoutMs, deadlineAt)
+                .onErrorResume(e -> {
+                    // Fallback if masking fails (Serious error, but for MVP we wrap)
+                    System.err.println("Masking failed: " + e.getMessage());
+                    failedStages.add("mask");
+                    DTOs.MaskingResponse fallback = new DTOs.MaskingResponse();
+                    fallback.setMaskedText(rawText); // Fallback to raw (RISK!) - In prod, fail hard here.
+                    fallback.setMaskedEntities(new ArrayList<>());
+                    return Mono.just(fallback);
+                })
+                .block();
 
         String safeText = maskResp.getMaskedText();
 
-        // 2. Triage
-        DTOs.TriageResponse triageResp;
-        try {
-            triageResp = webClient.post()
-                    .uri("/predict")
-                    .bodyValue(new DTOs.TriageRequest(safeText))
-                    .retrieve()
-                    .bodyToMono(DTOs.TriageResponse.class)
-                    .block();
-        } catch (Exception e) {
-            System.err.println("Triage failed: " + e.getMessage());
-            triageResp = new DTOs.TriageResponse();
-            triageResp.setCategory("MANUAL_REVIEW");
-            triageResp.setUrgency("MEDIUM");
-        }
-
-        // 3. RAG Retrieval
-        DTOs.RAGResponse ragResp;
-        try {
-            ragResp = webClient.post()
-                    .uri("/retrieve")
-                    .bodyValue(new DTOs.RAGRequest(safeText))
-                    .retrieve()
-                    .bodyToMono(DTOs.RAGResponse.class)
-                    .block();
-        } catch (Exception e) {
-            System.err.println("RAG failed: " + e.getMessage());
-            ragResp = new DTOs.RAGResponse();
-            ragResp.setRelevantSnippets(new ArrayList<>());
-        }
+        // 2. Triage and 3. RAG Retrieval only need the masked text, so they run concurrently.
+        // /retrieve scopes its search with its own triage scoring instead of waiting for /predict.
+        Mono<DTOs.TriageResponse> triageMono = callStage(
+                "predict", "/predict", new DTOs.TriageRequest(safeText),
+                DTOs.TriageResponse.class, predictTimeoutMs, deadlineAt)
+                .onErrorResume(e -> {
+                    System.err.println("Triage failed: " + e.getMessage());
+                    failedStages.add("predict");
+                    DTOs.TriageResponse fallback = new DTOs.TriageResponse();
+                    fallback.setCategory("MANUAL_REVIEW");
+                    fallback.setUrgency("MEDIUM");
+                    return Mono.just(fallback);
+                });
+
+        Mono<DTOs.RAGResponse> ragMono = callStage(
+                "retrieve", "/retrieve", new DTOs.RAGRequest(safeText),
+                DTOs.RAGResponse.class, retrieveTimeoutMs, deadlineAt)
+                .onErrorResume(e -> {
+                    System.err.println("RAG failed: " + e.getMessage());
+                    failedStages.add("retrieve");
+                    DTOs.RAGResponse fallback = new DTOs.RAGResponse();
+                    fallback.setRelevantSources(new ArrayList<>());
+                    return Mono.just(fallback);
+                });
+
+        Tuple2<DTOs.TriageResponse, DTOs.RAGResponse> triageAndRag = Mono.zip(triageMono, ragMono).block();
+        DTOs.TriageResponse triageResp = triageAndRag.getT1();
+        DTOs.RAGResponse ragResp = triageAndRag.getT2();
 
         // 4. Generate Response
-        DTOs.GenerateResponse genResp;
-        try {
-            genResp = webClient.post()
-                    .uri("/generate")
-                    .bodyValue(new DTOs.GenerateRequest(
-                            safeText,
-                            triageResp.getCategory(),
-                            triageResp.getUrgency(),
-                            ragResp.getRelevantSnippets()))
-                    .retrieve()
-                    .bodyToMono(DTOs.GenerateResponse.class)
-                    .block();
-        } catch (Exception e) {
-            System.err.println("Generation failed: " + e.getMessage());
-            genResp = new DTOs.GenerateResponse();
-            genResp.setActionPlan(List.of("System Error: AI Generation Failed. Please review manually."));
-            genResp.setCustomerReplyDraft("Error generating draft.");
-        }
-
-        // 5. Save to DB
+        DTOs.GenerateResponse genResp = callStage(
+                "generate", "/generate",
+                new DTOs.GenerateRequest(
+                        safeText,
+                        triageResp.getCategory(),
+                        triageResp.getUrgency(),
+                        ragResp.getRelevantSources(),
+                        triageResp.getCategoryConfidence()),
+                DTOs.GenerateResponse.class, generateTimeoutMs, deadlineAt)
+                .onErrorResume(e -> {
+                    System.err.println("Generation failed: " + e.getMessage());
+                    failedStages.add("generate");
+                    DTOs.GenerateResponse fallback = new DTOs.GenerateResponse();
+                    fallback.setActionPlan(List.of("System Error: AI Generation Failed. Please review manually."));
+                    fallback.setCustomerReplyDraft("Error generating draft.");
+                    return Mono.just(fallback);
+                })
+                .block();
+
+        // 5. Build the complaint
         Complaint complaint = new Complaint();
         complaint.setOriginalText(rawText);
         complaint.setMaskedText(safeText);
@@ -107,16 +174,54 @@ public class OrchestratorService {
 
         complaint.setCustomerReplyDraft(genResp.getCustomerReplyDraft());
         complaint.setStatus(ComplaintStatus.ANALYZED);
+        return new Analysis(complaint, List.copyOf(failedStages));
+    }
 
-        return repository.save(complaint);
+    /**
+     * POSTs one pipeline stage, bounded by the stage timeout and the remaining complaint budget.
+     * Latency is recorded per stage and outcome when the call finishes, fails or is cancelled.
+     */
+    private <T> Mono<T> callStage(String stage, String uri, Object body, Class<T> responseType,
+            long stageTimeoutMs, long deadlineAt) {
+        return Mono.defer(() -> {
+            // The AI service plans its work against the same cap the client enforces
+            long timeoutMs = Math.min(stageTimeoutMs, remainingBudgetMs(deadlineAt));
+            long startedAt = System.nanoTime();
+            return webClient.post()
+                    .uri(uri)
+                    .header(DEADLINE_HEADER, String.valueOf(timeoutMs))
+                    .bodyValue(body)
+                    .retrieve()
+                    .bodyToMono(responseType)
+                    .switchIfEmpty(Mono.error(new IllegalStateException("Empty response from " + uri)))
+                    .timeout(Duration.ofMillis(timeoutMs))
+                    .doFinally(signal -> Timer.builder(STAGE_TIMER)
+                            .tag("stage", stage)
+                            .tag("outcome", signal.name())
+                            .register(meterRegistry)
+                            .record(System.nanoTime() - startedAt, TimeUnit.NANOSECONDS));
+        });
     }
 
-    public List<Complaint> getAllComplaints() {
-        return repository.findAll();
+    private long remainingBudgetMs(long deadlineAt) {
+        return Math.max(1, deadlineAt - System.currentTimeMillis());
+    }
+
+    public PageResponse<ComplaintSummary> listComplaints(ComplaintStatus status, String urgency, String category,
+            LocalDateTime createdFrom, LocalDateTime createdTo, Pageable pageable) {
+        return PageResponse.of(repository.findSummaries(status, urgency, category, createdFrom, createdTo, pageable));
     }
 
     public Complaint getComplaint(Long id) {
         return repository.findById(Objects.requireNonNull(id))
                 .orElseThrow(() -> new RuntimeException("Complaint not found"));
     }
+
+    public Complaint updateStatus(Long id, ComplaintStatus status) {
+        Complaint complaint = getComplaint(id);
+        complaint.setStatus(Objects.requireNonNull(status));
+        Complaint saved = repository.save(complaint);
+        eventService.publish(ComplaintEventService.EVENT_STATUS, saved);
+        return saved;
+    }
 }
@@ -0,0 +1,123 @@
+package com.complaintops.backend;
+
+import com.fasterxml.jackson.databind.ObjectMapper;
+import org.junit.jupiter.api.AfterEach;
+import org.junit.jupiter.api.BeforeEach;
+import org.junit.jupiter.api.Test;
+import org.junit.jupiter.api.io.TempDir;
+import org.mockito.ArgumentCaptor;
+import org.springframework.test.util.ReflectionTestUtils;
+import java.io.ByteArrayInputStream;
+import java.nio.charset.StandardCharsets;
+import java.nio.file.Path;
+import java.util.ArrayList;
+import java.util.List;
+import java.util.Map;
+import java.util.Optional;
+import java.util.concurrent.ConcurrentHashMap;
+
+import static org.junit.jupiter.api.Assertions.assertEquals;
+import static org.junit.jupiter.api.Assertions.assertTrue;
+import static org.mockito.ArgumentMatchers.any;
+import static org.mockito.ArgumentMatchers.anyString;
+import static org.mockito.ArgumentMatchers.eq;
+import static org.mockito.Mockito.atLeastOnce;
+import static org.mockito.Mockito.mock;
+import static org.mockito.Mockito.timeout;
+import static org.mockito.Mockito.verify;
+import static org.mockito.Mockito.when;
+
+class ComplaintImportServiceTest {
+
+    @TempDir
+    Path spoolDir;
+
+    private final ImportJobRepository importJobRepository = mock(ImportJobRepository.class);
+    private final ImportFailureRepository failureRepository = mock(ImportFailureRepository.class);
+    private final ComplaintRepository complaintRepository = mock(ComplaintRepository.class);
+    private final OrchestratorService orchestratorService = mock(OrchestratorService.class);
+    private final ComplaintEventService eventService = mock(ComplaintEventService.class);
+    private final Map<String, ImportJob> jobs = new ConcurrentHashMap<>();
+    private ComplaintImportService service;
+
+    @BeforeEach
+    void setUp() {
+        when(importJobRepository.save(any(ImportJob.class))).thenAnswer(invocation -> {
+            ImportJob job = invocation.getArgument(0);
+            jobs.put(job.getId(), job);
+            return job;
+        });
+        when(importJobRepository.findById(anyString()))
+                .thenAnswer(invocation -> Optional.ofNullable(jobs.get(invocation.<String>getArgument(0))));
+        service = new ComplaintImportService(importJobRepository, failureRepository, complaintRepository,
+                orchestratorService, eventService, new ObjectMapper());
+        ReflectionTestUtils.setField(service, "concurrency", 2);
+        ReflectionTestUtils.setField(service, "batchSize", 2);
+        ReflectionTestUtils.setField(service, "spoolDir", spoolDir.toString());
+        service.startExecutors();
+    }
+
+    @AfterEach
+    void tearDown() {
+        service.stopExecutors();
+    }
+
+    @Test
+    @SuppressWarnings("unchecked")
+    void savesInBatchesAndRecordsFailedAndFallbackRecords() throws Exception {
+        when(orchestratorService.analyze(anyString())).thenAnswer(invocation -> {
+            String text = invocation.getArgument(0);
+            if (text.equals("explodes")) {
+                throw new IllegalStateException("AI service down");
+            }
+            List<String> failedStages = text.equals("falls back") ? List.of("generate") : List.of();
+            return new OrchestratorService.Analysis(new Complaint(), failedStages);
+        });
+        String csv = "text\nbir\nexplodes\niki\nfalls back\nüç\ndört\n";
+
+        ImportJob submitted = service.submit(
+                new ByteArrayInputStream(csv.getBytes(StandardCharsets.UTF_8)), ImportFormat.CSV);
+        verify(eventService, timeout(5000)).publishReset();
+
+        ImportJob job = jobs.get(submitted.getId());
+        assertEquals(JobStatus.COMPLETED, job.getStatus());
+        assertEquals(6, job.getTotalRecords());
+        assertEquals(4, job.getSucceeded());
+        assertEquals(2, job.getFailed());
+        assertEquals(6, job.getCompletedThrough());
+
+        ArgumentCaptor<List<Complaint>> batches = ArgumentCaptor.forClass(List.class);
+        verify(complaintRepository, atLeastOnce()).saveAll(batches.capture());
+        assertTrue(batches.getAllValues().stream().allMatch(batch -> batch.size() <= 2));
+        assertEquals(4, batches.getAllValues().stream().mapToInt(List::size).sum());
+
+        ArgumentCaptor<List<ImportFailure>> failureBatches = ArgumentCaptor.forClass(List.class);
+        verify(failureRepository, atLeastOnce()).saveAll(failureBatches.capture());
+        List<ImportFailure> failures = new ArrayList<>();
+        failureBatches.getAllValues().forEach(failures::addAll);
+        failures.sort((a, b) -> Long.compare(a.getRecordNumber(), b.getRecordNumber()));
+        assertEquals(2, failures.size());
+        assertEquals(2, failures.get(0).getRecordNumber());
+        assertTrue(failures.get(0).getError().startsWith("Analysis failed"));
+        assertEquals(4, failures.get(1).getRecordNumber());
+        assertEquals("Analysis stages failed: generate", failures.get(1).getError());
+    }
+
+    @Test
+    void recoveryReportsTheContiguousWatermark() {
+        ImportJob interrupted = new ImportJob();
+        interrupted.setId("interrupted");
+        interrupted.setStatus(JobStatus.RUNNING);
+        interrupted.setTotalRecords(500);
+        interrupted.setCompletedThrough(120);
+        when(importJobRepository.findByStatusOrderByCreatedAtAsc(eq(JobStatus.RUNNING)))
+                .thenReturn(List.of(interrupted));
+        when(importJobRepository.findByStatusOrderByCreatedAtAsc(eq(JobStatus.QUEUED))).thenReturn(List.of());
+
+        service.recoverImports();
+
+        assertEquals(JobStatus.FAILED, interrupted.getStatus());
+        assertTrue(interrupted.getError().contains("records 1-120"));
+        assertTrue(interrupted.getError().contains("after record 120"));
+    }
+}
@@ -0,0 +1,84 @@
+package com.complaintops.backend;
+
+import com.fasterxml.jackson.databind.ObjectMapper;
+import org.junit.jupiter.api.Test;
+import org.junit.jupiter.api.io.TempDir;
+import java.io.IOException;
+import java.nio.charset.StandardCharsets;
+import java.nio.file.Files;
+import java.nio.file.Path;
+import java.time.LocalDateTime;
+import java.util.ArrayList;
+import java.util.List;
+
+import static org.junit.jupiter.api.Assertions.assertEquals;
+import static org.junit.jupiter.api.Assertions.assertNull;
+import static org.junit.jupiter.api.Assertions.assertThrows;
+import static org.junit.jupiter.api.Assertions.assertTrue;
+
+class ImportRecordReaderTest {
+
+    @TempDir
+    Path tempDir;
+
+    private List<ImportRecordReader.ImportRecord> readAll(String content, ImportFormat format) throws IOException {
+        Path file = tempDir.resolve("upload." + format.name().toLowerCase());
+        Files.writeString(file, content, StandardCharsets.UTF_8);
+        List<ImportRecordReader.ImportRecord> records = new ArrayList<>();
+        try (ImportRecordReader reader = new ImportRecordReader(file, format, new ObjectMapper())) {
+            ImportRecordReader.ImportRecord record;
+            while ((record = reader.next()) != null) {
+                records.add(record);
+            }
+        }
+        return records;
+    }
+
+    @Test
+    void csvHandlesQuotesLineBreaksAndBlankLines() throws IOException {
+        String csv = "\uFEFFid,Text,created_at\r\n"
+                + "1,\"Kartım, bilgim dışında kullanıldı\",2024-01-05\r\n"
+                + "\r\n"
+                + "2,\"Şube \"\"yanlış\"\" bilgi verdi\nve kapattı\",2024-01-06T10:15:30\n"
+                + "3,,\n";
+        List<ImportRecordReader.ImportRecord> records = readAll(csv, ImportFormat.CSV);
+
+        assertEquals(3, records.size());
+        assertEquals("Kartım, bilgim dışında kullanıldı", records.get(0).text());
+        assertEquals(LocalDateTime.of(2024, 1, 5, 0, 0), records.get(0).createdAt());
+        assertEquals(2, records.get(1).number());
+        assertEquals("Şube \"yanlış\" bilgi verdi\nve kapattı", records.get(1).text());
+        assertEquals(LocalDateTime.of(2024, 1, 6, 10, 15, 30), records.get(1).createdAt());
+        assertEquals("Missing text", records.get(2).error());
+    }
+
+    @Test
+    void csvWithoutTextColumnIsRejected() throws IOException {
+        Path file = tempDir.resolve("upload.csv");
+        Files.writeString(file, "id,body\n1,hello\n");
+        assertThrows(IllegalArgumentException.class, () -> new ImportRecordReader(file, ImportFormat.CSV, new ObjectMapper()));
+    }
+
+    @Test
+    void jsonlReportsBadRecordsWithoutStopping() throws IOException {
+        String jsonl = "{\"text\": \"EFT gelmedi\"}\n"
+                + "not json\n"
+                + "\n"
+                + "[1, 2]\n"
+                + "{\"text\": 42}\n"
+                + "{\"text\": \"Puan yüklenmedi\", \"created_at\": \"yesterday\"}\n"
+                + "{\"text\": \"Şifre bloke\"}\n";
+        List<ImportRecordReader.ImportRecord> records = readAll(jsonl, ImportFormat.JSONL);
+
+        assertEquals(6, records.size());
+        assertEquals("EFT gelmedi", records.get(0).text());
+        assertNull(records.get(0).error());
+        assertEquals(2, records.get(1).number());
+        assertTrue(records.get(1).error().startsWith("Invalid JSON"));
+        assertEquals("Record is not a JSON object", records.get(2).error());
+        assertEquals("Missing text", records.get(3).error());
+        assertEquals("Invalid created_at: yesterday", records.get(4).error());
+        assertEquals(6, records.get(5).number());
+        assertEquals("Şifre bloke", records.get(5).text());
+    }
+}
@@ -0,0 +1,34 @@
+package com.complaintops.backend;
+
+import org.junit.jupiter.api.Test;
+import java.util.List;
+
+import static org.junit.jupiter.api.Assertions.assertEquals;
+
+class ImportWatermarkTest {
+
+    @Test
+    void advancesOnlyOverContiguousRecords() {
+        ImportWatermark watermark = new ImportWatermark();
+        watermark.complete(List.of(2L, 3L));
+        assertEquals(0, watermark.completedThrough());
+
+        watermark.complete(List.of(1L));
+        assertEquals(3, watermark.completedThrough());
+
+        watermark.complete(List.of(5L, 6L));
+        assertEquals(3, watermark.completedThrough());
+
+        watermark.complete(List.of(4L));
+        assertEquals(6, watermark.completedThrough());
+    }
+
+    @Test
+    void repeatedRecordNumbersAreHarmless() {
+        ImportWatermark watermark = new ImportWatermark();
+        watermark.complete(List.of(1L, 2L));
+        watermark.complete(List.of(2L, 1L));
+        watermark.complete(List.of(3L));
+        assertEquals(3, watermark.completedThrough());
+    }
+}
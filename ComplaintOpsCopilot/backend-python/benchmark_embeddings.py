@@ -0,0 +1,102 @@
+"""Compare embedding backends on SOP retrieval recall and embedding latency.
+
+Each backend gets its own in-memory collection built from SOP_DOCUMENTS and is
+queried with the Turkish eval set in data/sop_retrieval_eval.json. Backends whose
+dependencies or model files are missing are reported as skipped.
+
+    python benchmark_embeddings.py --backends default multilingual onnx_int8 --k 1 3
+"""
+from datetime import datetime, timezone
+import argparse
+import json
+import os
+import statistics
+import time
+
+import chromadb
+
+from embeddings import BACKENDS, embedding_metadata, get_embedding_function
+from ingest_sops import SOP_DOCUMENTS, build_chunks
+
+EVAL_PATH = os.path.join("data", "sop_retrieval_eval.json")
+
+
+def percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def benchmark_backend(backend: str, eval_set: list[dict], ks: list[int]) -> dict:
+    started = time.perf_counter()
+    embedding_fn = get_embedding_function(backend)
+    load_seconds = time.perf_counter() - started
+
+    chunks, ids, metadatas = build_chunks(SOP_DOCUMENTS)
+    started = time.perf_counter()
+    chunk_embeddings = embedding_fn(chunks)
+    ingest_seconds = time.perf_counter() - started
+
+    client = chromadb.EphemeralClient()
+    collection = client.create_collection(name=f"bench_{backend}", metadata=embedding_metadata(backend))
+    collection.add(ids=ids, documents=chunks, metadatas=metadatas, embeddings=chunk_embeddings)
+
+    # Warm once so model initialization does not land in the first query's latency.
+    embedding_fn([eval_set[0]["query"]])
+    latencies_ms = []
+    hits = {k: 0 for k in ks}
+    for item in eval_set:
+        started = time.perf_counter()
+        query_embedding = embedding_fn([item["query"]])
+        latencies_ms.append((time.perf_counter() - started) * 1000.0)
+        results = collection.query(query_embeddings=query_embedding, n_results=max(ks), include=["metadatas"])
+        ranked = [metadata["doc_name"] for metadata in results["metadatas"][0]]
+        for k in ks:
+            if item["expected_doc"] in ranked[:k]:
+                hits[k] += 1
+
+    return {
+        **embedding_metadata(backend),
+        "model_load_seconds": round(load_seconds, 3),
+        "ingest_seconds": round(ingest_seconds, 3),
+        "query_latency_ms_p50": round(statistics.median(latencies_ms), 2),
+        "query_latency_ms_p95": round(percentile(latencies_ms, 0.95), 2),
+        **{f"recall_at_{k}": round(hits[k] / len(eval_set), 3) for k in ks},
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark SOP embedding backends")
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS), choices=BACKENDS)
+    parser.add_argument("--k", nargs="+", type=int, default=[1, 3])
+    args = parser.parse_args()
+
+    with open(EVAL_PATH, "r", encoding="utf-8") as handle:
+        eval_set = json.load(handle)
+
+    results = []
+    for backend in args.backends:
+        print(f"Benchmarking {backend}...")
+        try:
+            results.append(benchmark_backend(backend, eval_set, args.k))
+        except Exception as e:
+            print(f"  skipped: {e}")
+            results.append({"embedding_backend": backend, "skipped": str(e)})
+
+    for result in results:
+        print(json.dumps(result, ensure_ascii=False))
+
+    timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    os.makedirs("reports", exist_ok=True)
+    report_path = os.path.join("reports", f"embedding_benchmark_{timestamp}.json")
+    with open(report_path, "w", encoding="utf-8") as handle:
+        json.dump(
+            {"timestamp": timestamp, "eval_queries": len(eval_set), "results": results},
+            handle,
+            ensure_ascii=False,
+            indent=2,
+        )
+    print(f"Report written to {report_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+import contextvars
+import os
+import time
+from typing import Optional
+
+# Remaining caller budget in milliseconds, sent by the orchestrator on every stage call.
+DEADLINE_HEADER = "X-Request-Deadline-Ms"
+
+# Absolute deadline on the time.monotonic() clock, or None when the caller sent no budget.
+deadline_var: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar("deadline", default=None)
+
+# Held back from the caller's budget so a degraded answer is on the wire before the caller's
+# own timeout (the orchestrator times the call out at exactly the budget it sends).
+RESPONSE_MARGIN_SECONDS = float(os.getenv("DEADLINE_RESPONSE_MARGIN_MS", "500")) / 1000.0
+
+RAG_MIN_BUDGET_SECONDS = float(os.getenv("DEADLINE_RAG_MIN_SECONDS", "1.5"))
+FULL_PROMPT_MIN_BUDGET_SECONDS = float(os.getenv("DEADLINE_FULL_PROMPT_MIN_SECONDS", "6"))
+LLM_MIN_BUDGET_SECONDS = float(os.getenv("DEADLINE_LLM_MIN_SECONDS", "2"))
+
+
+def parse_deadline_header(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        budget_ms = float(value)
+    except ValueError:
+        return None
+    return time.monotonic() + max(0.0, budget_ms / 1000.0 - RESPONSE_MARGIN_SECONDS)
+
+
+def remaining_seconds() -> Optional[float]:
+    deadline = deadline_var.get()
+    if deadline is None:
+        return None
+    return max(0.0, deadline - time.monotonic())
+
+
+def has_budget(seconds: float) -> bool:
+    remaining = remaining_seconds()
+    return remaining is None or remaining >= seconds
@@ -0,0 +1,198 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+from typing import Optional
+import copy
+import hashlib
+import os
+import re
+import sys
+import time
+import uuid
+
+from logging_config import get_logger
+
+logger = get_logger("complaintops.dedup_index")
+
+_FINGERPRINT_BITS = 64
+_NON_WORD = re.compile(r"[^\w\[\]]+")
+_DIGITS = re.compile(r"\d+")
+# Dataclass instance, OrderedDict node and the band bucket memberships of one entry.
+_ENTRY_OVERHEAD_BYTES = 400
+
+
+@dataclass
+class DuplicateEntry:
+    entry_id: str
+    fingerprint: int
+    created_at: float
+    # Amounts, dates and reference numbers must match exactly: "500 TL" is not "5000 TL".
+    numbers: tuple[str, ...] = ()
+    triage: Optional[dict] = None
+    sources: Optional[list] = None
+    generation: Optional[dict] = None
+    size_bytes: int = 0
+
+
+def normalize_text(text: str) -> str:
+    # Turkish dotted/dotless I must be folded before lower() to keep "İ" -> "i".
+    lowered = text.replace("İ", "i").replace("I", "ı").lower()
+    return " ".join(_NON_WORD.sub(" ", lowered).split())
+
+
+def number_tokens(text: str) -> tuple[str, ...]:
+    return tuple(_DIGITS.findall(text))
+
+
+def approximate_size(value) -> int:
+    """Rough retained size of a JSON-like value: sys.getsizeof summed over its containers and leaves."""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(approximate_size(key) + approximate_size(item) for key, item in value.items())
+    elif isinstance(value, (list, tuple, set)):
+        size += sum(approximate_size(item) for item in value)
+    return size
+
+
+def simhash(text: str, shingle_size: int = 3) -> int:
+    words = normalize_text(text).split()
+    if len(words) < shingle_size:
+        shingles = words
+    else:
+        shingles = [" ".join(words[i:i + shingle_size]) for i in range(len(words) - shingle_size + 1)]
+    weights = [0] * _FINGERPRINT_BITS
+    for shingle in shingles:
+        digest = int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big")
+        for bit in range(_FINGERPRINT_BITS):
+            weights[bit] += 1 if digest >> bit & 1 else -1
+    return sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+
+
+class NearDuplicateIndex:
+    """Sliding-window SimHash index over masked complaint text.
+
+    Fingerprints are split into bands; two fingerprints within max_distance bits
+    are guaranteed to share a band when bands > max_distance, so lookups only
+    compare against entries in the query's band buckets.
+
+    Memory is bounded by DEDUP_MAX_MB rather than an entry count: an entry holding a
+    generated draft and its sources is many times larger than a triage-only one, so
+    the oldest entries are evicted until the approximate total fits the budget.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = os.getenv("DEDUP_ENABLED", "false").lower() == "true"
+        self.window_seconds = float(os.getenv("DEDUP_WINDOW_SECONDS", "900"))
+        self.max_bytes = int(float(os.getenv("DEDUP_MAX_MB", "64")) * 1024 * 1024)
+        self.max_distance = int(os.getenv("DEDUP_MAX_DISTANCE", "3"))
+        self.bands = self.max_distance + 1
+        self._band_width = _FINGERPRINT_BITS // self.bands
+        self._entries: OrderedDict[str, DuplicateEntry] = OrderedDict()
+        self._buckets: list[dict[int, set[str]]] = [dict() for _ in range(self.bands)]
+        self._bytes = 0
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def _band_keys(self, fingerprint: int) -> list[int]:
+        mask = (1 << self._band_width) - 1
+        return [(fingerprint >> (band * self._band_width)) & mask for band in range(self.bands)]
+
+    def _evict(self, now: float) -> None:
+        while self._entries:
+            entry_id, entry = next(iter(self._entries.items()))
+            if now - entry.created_at <= self.window_seconds and self._bytes <= self.max_bytes:
+                break
+            self._entries.popitem(last=False)
+            self._bytes -= entry.size_bytes
+            for band, key in enumerate(self._band_keys(entry.fingerprint)):
+                bucket = self._buckets[band].get(key)
+                if bucket is not None:
+                    bucket.discard(entry_id)
+                    if not bucket:
+                        del self._buckets[band][key]
+
+    def _nearest(self, fingerprint: int, numbers: tuple[str, ...]) -> Optional[DuplicateEntry]:
+        best: Optional[DuplicateEntry] = None
+        best_distance = self.max_distance + 1
+        for band, key in enumerate(self._band_keys(fingerprint)):
+            for entry_id in self._buckets[band].get(key, ()):
+                entry = self._entries[entry_id]
+                if entry.numbers != numbers:
+                    continue
+                distance = (entry.fingerprint ^ fingerprint).bit_count()
+                if distance < best_distance:
+                    best, best_distance = entry, distance
+        return best
+
+    def find(self, text: str) -> Optional[DuplicateEntry]:
+        """Return a copy of the closest live entry, or None."""
+        if not self.enabled:
+            return None
+        fingerprint = simhash(text)
+        with self._lock:
+            self._evict(time.monotonic())
+            entry = self._nearest(fingerprint, number_tokens(text))
+            if entry:
+                self._hits += 1
+                return copy.deepcopy(entry)
+            self._misses += 1
+            return None
+
+    def record(
+        self,
+        text: str,
+        triage: Optional[dict] = None,
+        sources: Optional[list] = None,
+        generation: Optional[dict] = None,
+    ) -> None:
+        """Attach validated stage results to the matching entry, creating one if needed."""
+        if not self.enabled:
+            return
+        fingerprint = simhash(text)
+        numbers = number_tokens(text)
+        now = time.monotonic()
+        with self._lock:
+            self._evict(now)
+            entry = self._nearest(fingerprint, numbers)
+            if entry is None:
+                entry = DuplicateEntry(
+                    entry_id=str(uuid.uuid4()),
+                    fingerprint=fingerprint,
+                    created_at=now,
+                    numbers=numbers,
+                )
+                entry.size_bytes = _ENTRY_OVERHEAD_BYTES + approximate_size(entry.entry_id) + approximate_size(numbers)
+                self._entries[entry.entry_id] = entry
+                self._bytes += entry.size_bytes
+                for band, key in enumerate(self._band_keys(fingerprint)):
+                    self._buckets[band].setdefault(key, set()).add(entry.entry_id)
+            added = 0
+            if triage is not None and entry.triage is None:
+                entry.triage = copy.deepcopy(triage)
+                added += approximate_size(entry.triage)
+            if sources is not None and entry.sources is None:
+                entry.sources = copy.deepcopy(sources)
+                added += approximate_size(entry.sources)
+            if generation is not None and entry.generation is None:
+                entry.generation = copy.deepcopy(generation)
+                added += approximate_size(entry.generation)
+            entry.size_bytes += added
+            self._bytes += added
+            # Evicting after the payload is attached counts it; an entry larger than the
+            # whole budget is dropped right away.
+            self._evict(now)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+            }
+
+
+near_duplicate_index = NearDuplicateIndex()
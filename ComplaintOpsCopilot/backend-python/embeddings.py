@@ -0,0 +1,157 @@
+"""Embedding backends shared by SOP ingestion and retrieval.
+
+EMBEDDING_BACKEND selects one of:
+  default       chromadb's DefaultEmbeddingFunction (all-MiniLM-L6-v2, ONNX)
+  multilingual  a sentence-transformers model (EMBEDDING_MODEL)
+  onnx_int8     an int8-quantized ONNX export run on CPU (EMBEDDING_ONNX_PATH,
+                EMBEDDING_TOKENIZER_PATH) with EMBEDDING_THREADS intra-op threads
+                and EMBEDDING_BATCH_SIZE texts per session run
+
+The backend and model are stored in the collection metadata at ingestion time so the
+serving process can detect a collection built with a different model. For onnx_int8 the
+model is the resolved file path plus a SHA-256 of its contents, and the hash decides: the
+same weights at another path match, a re-exported file at the same path does not.
+
+Produce the int8 model from an fp32 ONNX export of a sentence-transformers model:
+    python embeddings.py quantize model.onnx model.int8.onnx
+"""
+from functools import lru_cache
+from typing import Optional
+import hashlib
+import os
+import sys
+
+from chromadb.api.types import Documents, EmbeddingFunction, Embeddings
+from chromadb.utils import embedding_functions
+
+DEFAULT_MULTILINGUAL_MODEL = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
+BACKENDS = ("default", "multilingual", "onnx_int8")
+LEGACY_METADATA = {"embedding_backend": "default", "embedding_model": "all-MiniLM-L6-v2"}
+DEFAULT_ONNX_PATH = "models/embeddings/model.int8.onnx"
+DEFAULT_TOKENIZER_PATH = "models/embeddings/tokenizer.json"
+
+
+def onnx_model_path() -> str:
+    return os.path.realpath(os.getenv("EMBEDDING_ONNX_PATH", DEFAULT_ONNX_PATH))
+
+
+@lru_cache(maxsize=8)
+def _file_sha256(path: str, mtime_ns: int, size: int) -> str:
+    # mtime and size are part of the cache key so a replaced file is hashed again.
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for block in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def file_sha256(path: str) -> str:
+    stat = os.stat(path)
+    return _file_sha256(path, stat.st_mtime_ns, stat.st_size)
+
+
+class QuantizedOnnxEmbeddingFunction(EmbeddingFunction):
+    def __init__(self, model_path: str, tokenizer_path: str, threads: int, batch_size: int, max_length: int = 256):
+        import onnxruntime
+        from tokenizers import Tokenizer
+
+        options = onnxruntime.SessionOptions()
+        options.intra_op_num_threads = threads
+        options.inter_op_num_threads = 1
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self._session = onnxruntime.InferenceSession(model_path, options, providers=["CPUExecutionProvider"])
+        self._input_names = {item.name for item in self._session.get_inputs()}
+        self._tokenizer = Tokenizer.from_file(tokenizer_path)
+        self._tokenizer.enable_truncation(max_length=max_length)
+        self._tokenizer.enable_padding()
+        self._batch_size = max(1, batch_size)
+
+    def _embed_batch(self, texts: list[str]):
+        import numpy as np
+
+        encoded = self._tokenizer.encode_batch(texts)
+        input_ids = np.array([item.ids for item in encoded], dtype=np.int64)
+        attention_mask = np.array([item.attention_mask for item in encoded], dtype=np.int64)
+        feeds = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self._input_names:
+            feeds["token_type_ids"] = np.zeros_like(input_ids)
+        token_embeddings = self._session.run(None, feeds)[0]
+        # Mean pooling over real tokens, then L2 normalization (sentence-transformers default).
+        mask = attention_mask[..., None].astype(np.float32)
+        pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        return pooled / np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+
+    def __call__(self, input: Documents) -> Embeddings:
+        embeddings: Embeddings = []
+        for start in range(0, len(input), self._batch_size):
+            embeddings.extend(self._embed_batch(list(input[start:start + self._batch_size])).tolist())
+        return embeddings
+
+
+def embedding_metadata(backend: Optional[str] = None) -> dict:
+    backend = backend or os.getenv("EMBEDDING_BACKEND", "default")
+    if backend == "multilingual":
+        model = os.getenv("EMBEDDING_MODEL", DEFAULT_MULTILINGUAL_MODEL)
+    elif backend == "onnx_int8":
+        model = onnx_model_path()
+        return {"embedding_backend": backend, "embedding_model": model, "embedding_model_sha256": file_sha256(model)}
+    else:
+        model = LEGACY_METADATA["embedding_model"]
+    return {"embedding_backend": backend, "embedding_model": model}
+
+
+def get_embedding_function(backend: Optional[str] = None) -> EmbeddingFunction:
+    backend = backend or os.getenv("EMBEDDING_BACKEND", "default")
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown EMBEDDING_BACKEND '{backend}'; expected one of {', '.join(BACKENDS)}")
+    if backend == "multilingual":
+        return embedding_functions.SentenceTransformerEmbeddingFunction(
+            model_name=embedding_metadata(backend)["embedding_model"],
+            device="cpu",
+        )
+    if backend == "onnx_int8":
+        return QuantizedOnnxEmbeddingFunction(
+            model_path=onnx_model_path(),
+            tokenizer_path=os.getenv("EMBEDDING_TOKENIZER_PATH", DEFAULT_TOKENIZER_PATH),
+            threads=int(os.getenv("EMBEDDING_THREADS", "2")),
+            batch_size=int(os.getenv("EMBEDDING_BATCH_SIZE", "16")),
+        )
+    return embedding_functions.DefaultEmbeddingFunction()
+
+
+def find_mismatch(collection_metadata: Optional[dict], backend: Optional[str] = None) -> Optional[str]:
+    """Describe how the collection's recorded model differs from the serving one, if it does."""
+    stored = {
+        key: (collection_metadata or {}).get(key, LEGACY_METADATA[key])
+        for key in LEGACY_METADATA
+    }
+    serving = embedding_metadata(backend)
+    stored_sha256 = (collection_metadata or {}).get("embedding_model_sha256")
+    if stored["embedding_backend"] == serving["embedding_backend"]:
+        if stored_sha256 and stored_sha256 == serving.get("embedding_model_sha256"):
+            return None
+        if not stored_sha256 and stored["embedding_model"] == serving["embedding_model"]:
+            return None
+    stored["embedding_model_sha256"] = stored_sha256
+    return f"collection built with {_describe(stored)}, serving with {_describe(serving)}"
+
+
+def _describe(metadata: dict) -> str:
+    described = f"{metadata['embedding_backend']}/{metadata['embedding_model']}"
+    if metadata.get("embedding_model_sha256"):
+        described += f" (sha256 {metadata['embedding_model_sha256'][:12]})"
+    return described
+
+
+def quantize(fp32_path: str, int8_path: str) -> None:
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    quantize_dynamic(fp32_path, int8_path, weight_type=QuantType.QInt8)
+    print(f"Wrote int8 model to {int8_path}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 4 and sys.argv[1] == "quantize":
+        quantize(sys.argv[2], sys.argv[3])
+    else:
+        print("Usage: python embeddings.py quantize <fp32.onnx> <int8.onnx>")
@@ -0,0 +1,111 @@
+"""Local OpenAI-compatible chat completions server with injectable latency and failures.
+
+Point the AI service at it to exercise LLM deadlines, hedging and the circuit breaker:
+
+    python fake_llm_server.py --port 8100 --delay 0.5 --slow-rate 0.1 --slow-delay 8 --failure-rate 0.2
+    OPENAI_API_KEY=fake OPENAI_BASE_URL=http://localhost:8100/v1 LLM_HEDGE_ENABLED=true uvicorn main:app
+
+--slow-first and --invalid-requests pick requests by arrival order instead of at random,
+for reproducible hedging runs: "--slow-first 1 --invalid-requests 2" makes the primary
+slow and its hedge return non-JSON.
+"""
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Lock
+import argparse
+import json
+import random
+import time
+
+CANNED_CONTENT = {
+    "action_plan": ["Müşteri kaydını kontrol et", "İlgili birime yönlendir"],
+    "customer_reply_draft": "Sayın Müşterimiz, talebiniz alınmıştır ve incelenmektedir.",
+    "risk_flags": ["NONE"],
+    "sources": [],
+}
+
+
+def build_handler(args: argparse.Namespace):
+    invalid_requests = {int(number) for number in str(args.invalid_requests or "").split(",") if number.strip()}
+
+    class FakeCompletionsHandler(BaseHTTPRequestHandler):
+        # time.monotonic() arrival of each completion request, in arrival order
+        arrivals: list[float] = []
+        arrivals_lock = Lock()
+
+        def log_message(self, format, *log_args):
+            if args.verbose:
+                super().log_message(format, *log_args)
+
+        def _send_json(self, status: int, payload: dict) -> None:
+            body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", "0"))
+            self.rfile.read(length)
+            if not self.path.rstrip("/").endswith("/chat/completions"):
+                self._send_json(404, {"error": {"message": "not found"}})
+                return
+
+            with self.arrivals_lock:
+                self.arrivals.append(time.monotonic())
+                number = len(self.arrivals)
+
+            delay = args.delay
+            if number <= args.slow_first or random.random() < args.slow_rate:
+                delay = args.slow_delay
+            time.sleep(delay)
+
+            if random.random() < args.failure_rate:
+                self._send_json(500, {"error": {"message": "injected failure", "type": "server_error"}})
+                return
+
+            invalid = number in invalid_requests or random.random() < args.invalid_rate
+            content = "not json" if invalid else json.dumps(CANNED_CONTENT, ensure_ascii=False)
+            self._send_json(
+                200,
+                {
+                    "id": f"chatcmpl-fake-{int(time.time() * 1000)}",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": "fake",
+                    "choices": [
+                        {
+                            "index": 0,
+                            "message": {"role": "assistant", "content": content},
+                            "finish_reason": "stop",
+                        }
+                    ],
+                    "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+                },
+            )
+
+    return FakeCompletionsHandler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Fake LLM upstream for resilience testing")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--delay", type=float, default=0.2, help="Baseline response delay in seconds")
+    parser.add_argument("--slow-rate", type=float, default=0.0, help="Fraction of requests using --slow-delay")
+    parser.add_argument("--slow-delay", type=float, default=10.0)
+    parser.add_argument("--slow-first", type=int, default=0, help="The first N requests always use --slow-delay")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Fraction of requests answered with HTTP 500")
+    parser.add_argument("--invalid-rate", type=float, default=0.0, help="Fraction of requests returning non-JSON content")
+    parser.add_argument(
+        "--invalid-requests", default="", help="Comma-separated request numbers (1-based) returning non-JSON content"
+    )
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), build_handler(args))
+    print(f"Fake LLM server listening on http://127.0.0.1:{args.port}/v1")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
+from threading import Condition, Thread
+from typing import Any, Callable, Optional
+import asyncio
+import contextvars
+import heapq
+import itertools
+import math
+import os
+import time
+
+from logging_config import get_logger
+
+logger = get_logger("complaintops.generation_scheduler")
+
+PRIORITY_NAMES = {0: "RED", 1: "YELLOW", 2: "GREEN"}
+URGENCY_PRIORITY = {"RED": 0, "HIGH": 0, "YELLOW": 1, "MEDIUM": 1, "GREEN": 2, "LOW": 2}
+# Categories that are always scheduled at the top level regardless of predicted urgency.
+CRITICAL_CATEGORIES = {"FRAUD_UNAUTHORIZED_TX"}
+
+
+class SchedulerOverloadedError(Exception):
+    def __init__(self, retry_after: int) -> None:
+        super().__init__(f"Generation queue is full; retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+@dataclass
+class _Job:
+    priority: int
+    enqueued_at: float
+    func: Callable[[], Any]
+    # Caller's context (request id, deadline) so logs from the worker stay attributed.
+    context: contextvars.Context = field(default_factory=contextvars.copy_context)
+    future: Future = field(default_factory=Future)
+
+
+@dataclass
+class _PriorityStats:
+    queued: int = 0
+    completed: int = 0
+    shed: int = 0
+    wait_seconds_total: float = 0.0
+    wait_seconds_max: float = 0.0
+
+
+def priority_for(urgency: str, category: str) -> int:
+    if category in CRITICAL_CATEGORIES:
+        return 0
+    return URGENCY_PRIORITY.get((urgency or "").upper(), 1)
+
+
+class GenerationScheduler:
+    """Bounded priority queue in front of LLM generation with a fixed worker budget.
+
+    Jobs are ordered by a virtual deadline: enqueue time plus aging_seconds per
+    priority level, so urgent work goes first but old low-priority work still ages
+    its way to the front. Shedding ignores aging: when the queue is full the newest
+    job of the lowest priority class present goes, so a RED job is only ever shed
+    when the queue holds nothing but RED jobs.
+
+    Async endpoints use run_async, which waits on the event loop: the scheduler, not
+    the server's shared threadpool, is then the only bound on concurrent generation.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = os.getenv("GEN_SCHEDULER_ENABLED", "true").lower() == "true"
+        self.workers = int(os.getenv("GEN_SCHEDULER_WORKERS", "8"))
+        self.max_queue = int(os.getenv("GEN_SCHEDULER_QUEUE_SIZE", "64"))
+        self.aging_seconds = float(os.getenv("GEN_SCHEDULER_AGING_SECONDS", "10"))
+        self._heap: list[tuple[float, int, _Job]] = []
+        self._sequence = itertools.count()
+        self._condition = Condition()
+        self._stats = {priority: _PriorityStats() for priority in PRIORITY_NAMES}
+        self._service_seconds_ewma = 2.0
+        self._threads: list[Thread] = []
+
+    def _ensure_workers(self) -> None:
+        if self._threads:
+            return
+        for index in range(self.workers):
+            thread = Thread(target=self._work, name=f"generation-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _retry_after(self) -> int:
+        backlog = len(self._heap) / max(1, self.workers)
+        return max(1, math.ceil(backlog * self._service_seconds_ewma))
+
+    def run(self, func: Callable[[], Any], urgency: str, category: str, timeout: Optional[float] = None) -> Any:
+        """Run func on a scheduler worker and wait for its result.
+
+        Raises SchedulerOverloadedError when shed and TimeoutError when timeout elapses
+        before the job finishes (a job still waiting in the queue is cancelled).
+        """
+        if not self.enabled:
+            return func()
+        job = self._submit(func, urgency, category)
+        try:
+            return job.future.result(timeout=timeout)
+        except FutureTimeoutError:
+            self._discard(job)
+            raise
+
+    async def run_async(
+        self, func: Callable[[], Any], urgency: str, category: str, timeout: Optional[float] = None
+    ) -> Any:
+        """Like run, but awaits the result instead of blocking a thread while the job waits and runs."""
+        if not self.enabled:
+            return await asyncio.to_thread(func)
+        job = self._submit(func, urgency, category)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(job.future), timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            self._discard(job)
+            raise
+
+    def _submit(self, func: Callable[[], Any], urgency: str, category: str) -> _Job:
+        """Queue a job, shedding one if the queue is full. Raises SchedulerOverloadedError."""
+        priority = priority_for(urgency, category)
+        now = time.monotonic()
+        job = _Job(priority=priority, enqueued_at=now, func=func)
+        score = now + priority * self.aging_seconds
+        with self._condition:
+            self._ensure_workers()
+            if len(self._heap) >= self.max_queue:
+                worst_index = max(
+                    range(len(self._heap)),
+                    key=lambda i: (self._heap[i][2].priority, self._heap[i][2].enqueued_at),
+                )
+                victim = self._heap[worst_index][2]
+                # The incoming job is the newest, so it loses ties within its own class.
+                if victim.priority <= priority:
+                    self._stats[priority].shed += 1
+                    raise SchedulerOverloadedError(self._retry_after())
+                self._remove(worst_index)
+                self._stats[victim.priority].shed += 1
+                if victim.future.set_running_or_notify_cancel():
+                    victim.future.set_exception(SchedulerOverloadedError(self._retry_after()))
+            heapq.heappush(self._heap, (score, next(self._sequence), job))
+            self._stats[priority].queued += 1
+            self._condition.notify()
+        return job
+
+    def _discard(self, job: _Job) -> None:
+        """Cancel a job its caller stopped waiting for; a still-queued job gives its slot back."""
+        # wrap_future may have cancelled it already when the awaiting task was cancelled.
+        if job.future.cancel() or job.future.cancelled():
+            with self._condition:
+                index = next((i for i, entry in enumerate(self._heap) if entry[2] is job), None)
+                if index is not None:
+                    self._remove(index)
+
+    def _remove(self, index: int) -> None:
+        """Drop a queued job so it no longer counts toward capacity. Caller holds the lock."""
+        _, _, job = self._heap[index]
+        self._heap[index] = self._heap[-1]
+        self._heap.pop()
+        heapq.heapify(self._heap)
+        self._stats[job.priority].queued -= 1
+
+    def _work(self) -> None:
+        while True:
+            with self._condition:
+                while not self._heap:
+                    self._condition.wait()
+                _, _, job = heapq.heappop(self._heap)
+                stats = self._stats[job.priority]
+                stats.queued -= 1
+            if not job.future.set_running_or_notify_cancel():
+                continue
+            started = time.monotonic()
+            waited = started - job.enqueued_at
+            try:
+                job.future.set_result(job.context.run(job.func))
+            except BaseException as e:
+                job.future.set_exception(e)
+            with self._condition:
+                stats.completed += 1
+                stats.wait_seconds_total += waited
+                stats.wait_seconds_max = max(stats.wait_seconds_max, waited)
+                self._service_seconds_ewma = 0.9 * self._service_seconds_ewma + 0.1 * (time.monotonic() - started)
+
+    def metrics(self) -> dict:
+        with self._condition:
+            return {
+                "enabled": self.enabled,
+                "workers": self.workers,
+                "queue_size": len(self._heap),
+                "max_queue": self.max_queue,
+                "priorities": {
+                    PRIORITY_NAMES[priority]: {
+                        "queue_depth": stats.queued,
+                        "completed": stats.completed,
+                        "shed": stats.shed,
+                        "avg_wait_seconds": round(stats.wait_seconds_total / stats.completed, 4)
+                        if stats.completed
+                        else 0.0,
+                        "max_wait_seconds": round(stats.wait_seconds_max, 4),
+                    }
+                    for priority, stats in self._stats.items()
+                },
+            }
+
+
+generation_scheduler = GenerationScheduler()
@@ -1,7 +1,8 @@
 import chromadb
-from chromadb.utils import embedding_functions
 import os
 
+from embeddings import embedding_metadata, get_embedding_function
+
 def chunk_text(text: str, max_words: int = 120, overlap: int = 20) -> list[str]:
     words = text.split()
     chunks = []
@@ -14,55 +15,47 @@ def chunk_text(text: str, max_words: int = 120, overlap: int = 20) -> list[str]:
         start = max(0, end - overlap)
     return chunks
 
-def ingest_data():
-    print("Initializing ChromaDB for ingestion...")
-    db_path = os.path.join(os.getcwd(), "chroma_db")
-    client = chromadb.PersistentClient(path=db_path)
-    embedding_fn = embedding_functions.DefaultEmbeddingFunction()
-    
-    # Delete existing to start fresh
-    try:
-        client.delete_collection("complaint_sops")
-    except:
-        pass
-
-    collection = client.create_collection(
-        name="complaint_sops",
-        embedding_function=embedding_fn
-    )
-
-    # Dummy SOP Data
-    documents = [
-        {
-            "text": "FAST İşlemleri: FAST (Fonların Anlık ve Sürekli Transferi) sistemi ile 7/24 para transferi yapılabilir. İşlem anında gerçekleşmezse, 'Sorgulama' adımından durum kontrol edilmelidir. 20.000 TL üzeri işlemler EFT saatlerinde gerçekleşir.",
-            "category": "TRANSFER_DELAY",
-        },
-        {
-            "text": "EFT İptali: Yanlış hesaba yapılan EFT işlemleri için şubeye yazılı talimat verilmesi gereklidir. Mobil üzerinden iptal edilemez.",
-            "category": "TRANSFER_DELAY",
-        },
-        {
-            "text": "Kredi Kartı İtirazı (Chargeback): Müşteri harcamayı tanımazsa, harcama itiraz formu doldurulur. Süreç 45-120 gün sürebilir.",
-            "category": "CHARGEBACK_DISPUTE",
-        },
-        {
-            "text": "Fraud Şüphesi: Karttan bilgisi dışında işlem yapıldığını belirten müşterinin kartı derhal kullanıma kapatılmalı ve güvenlik birimine bildirilmelidir. Müşteriye yeni kart basımı önerilmelidir.",
-            "category": "FRAUD_UNAUTHORIZED_TX",
-        },
-        {
-            "text": "Mobil Şifre Bloke: 3 kez yanlış girilen şifre sonrası bloke oluşur. Müşteri, kart bilgileri ile 'Şifre Al' menüsünden blokesini kaldırabilir.",
-            "category": "ACCESS_LOGIN_MOBILE",
-        },
-        {
-            "text": "Kart Aidatı İadesi: Yasal düzenlemelere göre, aktif kullanılan ve puan kazandıran kartlar için aidat yansıtılabilir. Ancak müşteri memnuniyeti adına %50 iade veya puan yüklemesi teklif edilebilir.",
-            "category": "CARD_LIMIT_CREDIT",
-        },
-        {
-            "text": "İnternet Arızası: Genel arıza durumunda müşteriye 'Bölgenizde çalışma var, tahmini süre 4 saat' bilgisi verilir. Bireysel arızada modem resetleme adımları iletilir.",
-            "category": "TECHNICAL_ISSUE",
-        },
-    ]
+# Dummy SOP Data
+SOP_DOCUMENTS = [
+    {
+        "text": "FAST İşlemleri: FAST (Fonların Anlık ve Sürekli Transferi) sistemi ile 7/24 para transferi yapılabilir. İşlem anında gerçekleşmezse, 'Sorgulama' adımından durum kontrol edilmelidir. 20.000 TL üzeri işlemler EFT saatlerinde gerçekleşir.",
+        "category": "TRANSFER_DELAY",
+    },
+    {
+        "text": "EFT İptali: Yanlış hesaba yapılan EFT işlemleri için şubeye yazılı talimat verilmesi gereklidir. Mobil üzerinden iptal edilemez.",
+        "category": "TRANSFER_DELAY",
+    },
+    {
+        "text": "Kredi Kartı İtirazı (Chargeback): Müşteri harcamayı tanımazsa, harcama itiraz formu doldurulur. Süreç 45-120 gün sürebilir.",
+        "category": "CHARGEBACK_DISPUTE",
+    },
+    {
+        "text": "Fraud Şüphesi: Karttan bilgisi dışında işlem yapıldığını belirten müşterinin kartı derhal kullanıma kapatılmalı ve güvenlik birimine bildirilmelidir. Müşteriye yeni kart basımı önerilmelidir.",
+        "category": "FRAUD_UNAUTHORIZED_TX",
+    },
+    {
+        "text": "Mobil Şifre Bloke: 3 kez yanlış girilen şifre sonrası bloke oluşur. Müşteri, kart bilgileri ile 'Şifre Al' menüsünden blokesini kaldırabilir.",
+        "category": "ACCESS_LOGIN_MOBILE",
+    },
+    {
+        "text": "Kart Aidatı İadesi: Yasal düzenlemelere göre, aktif kullanılan ve puan kazandıran kartlar için aidat yansıtılabilir. Ancak müşteri memnuniyeti adına %50 iade veya puan yüklemesi teklif edilebilir.",
+        "category": "CARD_LIMIT_CREDIT",
+    },
+    {
+        "text": "İnternet Arızası: Genel arıza durumunda müşteriye 'Bölgenizde çalışma var, tahmini süre 4 saat' bilgisi verilir. Bireysel arızada modem resetleme adımları iletilir.",
+        "category": "TECHNICAL_ISSUE",
+    },
+    {
+        "text": "Hesap Bilgi Talepleri: Hesap özeti, IBAN ve dekont talepleri mobil uygulamada 'Hesaplarım > Belgeler' menüsünden anında alınabilir. Son 10 yıla ait hesap özetleri şubeden ücretsiz talep edilebilir.",
+        "category": "INFORMATION_REQUEST",
+    },
+    {
+        "text": "Kampanya Puanları: Kampanya puanları, kampanya koşullarını sağlayan harcamanın ardından en geç 30 gün içinde karta yüklenir. Yüklenen puanlar mobil uygulamada 'Puanlarım' menüsünden görüntülenebilir ve sonraki alışverişlerde kullanılabilir.",
+        "category": "CAMPAIGN_POINTS_REWARDS",
+    },
+]
 
+def build_chunks(documents: list[dict]) -> tuple[list[str], list[str], list[dict]]:
     chunked_docs = []
     ids = []
     metadatas = []
@@ -80,6 +73,29 @@ def ingest_data():
                     "category": doc["category"],
                 }
             )
+    return chunked_docs, ids, metadatas
+
+def ingest_data():
+    print("Initializing ChromaDB for ingestion...")
+    db_path = os.path.join(os.getcwd(), "chroma_db")
+    client = chromadb.PersistentClient(path=db_path)
+    embedding_fn = get_embedding_function()
+    metadata = embedding_metadata()
+    print(f"Embedding backend: {metadata['embedding_backend']} ({metadata['embedding_model']})")
+    
+    # Delete existing to start fresh
+    try:
+        client.delete_collection("complaint_sops")
+    except:
+        pass
+
+    collection = client.create_collection(
+        name="complaint_sops",
+        embedding_function=embedding_fn,
+        metadata=metadata,
+    )
+
+    chunked_docs, ids, metadatas = build_chunks(SOP_DOCUMENTS)
 
     print(f"Adding {len(chunked_docs)} chunks...")
     collection.add(
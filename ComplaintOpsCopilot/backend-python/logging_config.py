@@ -1,11 +1,25 @@
+import atexit
 import contextvars
 import json
 import logging
+import logging.handlers
 import os
-from typing import Any
+import queue
+import random
+from threading import Lock
+from typing import Any, Optional
+
+try:
+    import orjson
+except ImportError:  # optional faster encoder
+    orjson = None
 
 request_id_var: contextvars.ContextVar[str] = contextvars.ContextVar("request_id", default="-")
 
+_listener: Optional[logging.handlers.QueueListener] = None
+_listener_lock = Lock()
+_atexit_registered = False
+
 
 class RequestIdFilter(logging.Filter):
     def filter(self, record: logging.LogRecord) -> bool:
@@ -13,6 +27,23 @@ class RequestIdFilter(logging.Filter):
         return True
 
 
+class SamplingFilter(logging.Filter):
+    """Keep only a fraction of INFO-and-below records for configured logger prefixes."""
+
+    def __init__(self, rates: dict[str, float]) -> None:
+        super().__init__()
+        # Longest prefix first so "a.b" wins over "a".
+        self._rates = sorted(rates.items(), key=lambda item: len(item[0]), reverse=True)
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.INFO or not self._rates:
+            return True
+        for prefix, rate in self._rates:
+            if record.name == prefix or record.name.startswith(prefix + "."):
+                return random.random() < rate
+        return True
+
+
 class JsonFormatter(logging.Formatter):
     def format(self, record: logging.LogRecord) -> str:
         payload: dict[str, Any] = {
@@ -23,18 +54,119 @@ class JsonFormatter(logging.Formatter):
         }
         if record.exc_info:
             payload["exc_info"] = self.formatException(record.exc_info)
+        if orjson is not None:
+            return orjson.dumps(payload, default=str).decode("utf-8")
         return json.dumps(payload, ensure_ascii=False)
 
 
-def configure_logging() -> None:
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """Enqueue records without ever blocking; count what a full queue forces us to drop."""
+
+    def __init__(self, log_queue: queue.Queue) -> None:
+        super().__init__(log_queue)
+        self._dropped = 0
+        self._dropped_lock = Lock()
+
+    @property
+    def dropped(self) -> int:
+        return self._dropped
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Resolve the message on the caller thread (args may be mutated later) but leave
+        # JSON encoding and exception formatting to the listener thread.
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._dropped_lock:
+                self._dropped += 1
+
+
+class _DrainingQueueListener(logging.handlers.QueueListener):
+    """QueueListener whose stop() cannot fail on a full queue."""
+
+    def enqueue_sentinel(self) -> None:
+        # The stock put_nowait raises queue.Full; wait for the listener to drain instead,
+        # discarding the oldest pending record if it cannot keep up.
+        while True:
+            try:
+                self.queue.put(self._sentinel, timeout=1.0)
+                return
+            except queue.Full:
+                try:
+                    self.queue.get_nowait()
+                except queue.Empty:
+                    pass
+
+
+def _stop_listener() -> None:
+    """Flush and stop the async listener; safe to call more than once."""
+    global _listener
+    with _listener_lock:
+        listener, _listener = _listener, None
+    if listener is not None:
+        listener.stop()
+
+
+def _parse_sample_rates(raw: str) -> dict[str, float]:
+    rates: dict[str, float] = {}
+    for entry in raw.split(","):
+        name, sep, rate = entry.strip().partition("=")
+        if not sep:
+            continue
+        try:
+            rates[name.strip()] = min(1.0, max(0.0, float(rate)))
+        except ValueError:
+            continue
+    return rates
+
+
+def configure_logging(async_mode: Optional[bool] = None) -> None:
+    global _listener, _atexit_registered
     level = os.getenv("LOG_LEVEL", "INFO").upper()
-    handler = logging.StreamHandler()
-    handler.setFormatter(JsonFormatter())
+    if async_mode is None:
+        async_mode = os.getenv("LOG_ASYNC", "false").lower() == "true"
+    sampling = SamplingFilter(_parse_sample_rates(os.getenv("LOG_SAMPLE_RATES", "")))
+
+    _stop_listener()
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(JsonFormatter())
+
+    if async_mode:
+        log_queue: queue.Queue = queue.Queue(maxsize=int(os.getenv("LOG_QUEUE_SIZE", "10000")))
+        handler: logging.Handler = DroppingQueueHandler(log_queue)
+        listener = _DrainingQueueListener(log_queue, stream_handler, respect_handler_level=True)
+        listener.start()
+        with _listener_lock:
+            _listener = listener
+        if not _atexit_registered:
+            atexit.register(_stop_listener)
+            _atexit_registered = True
+    else:
+        handler = stream_handler
+
+    # Filters run on the request thread so request_id is captured before the record is queued.
+    handler.addFilter(sampling)
     handler.addFilter(RequestIdFilter())
     root_logger = logging.getLogger()
     root_logger.handlers = [handler]
     root_logger.setLevel(level)
 
 
+def get_logging_stats() -> dict[str, Any]:
+    handler = next(
+        (h for h in logging.getLogger().handlers if isinstance(h, DroppingQueueHandler)),
+        None,
+    )
+    if handler is None:
+        return {"async": False, "dropped": 0, "queue_depth": 0}
+    return {"async": True, "dropped": handler.dropped, "queue_depth": handler.queue.qsize()}
+
+
 def get_logger(name: str) -> logging.Logger:
     return logging.getLogger(name)
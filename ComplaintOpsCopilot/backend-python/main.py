@@ -1,19 +1,58 @@
 from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional
 import os
 import uuid
 
 from schemas import SourceItem
 from constants import CategoryLiteral
-from logging_config import configure_logging, get_logger, request_id_var
-
-# Initialize FastAPI app
-app = FastAPI(title="ComplaintOps AI Service", version="0.1.0")
+from logging_config import configure_logging, get_logger, get_logging_stats, request_id_var
+from deadline import (
+    DEADLINE_HEADER,
+    FULL_PROMPT_MIN_BUDGET_SECONDS,
+    LLM_MIN_BUDGET_SECONDS,
+    RAG_MIN_BUDGET_SECONDS,
+    deadline_var,
+    has_budget,
+    parse_deadline_header,
+    remaining_seconds,
+)
+from profiling import (
+    PROFILE_HEADER,
+    ProfileSession,
+    follow_profile,
+    profile_var,
+    profiled,
+    profiling_enabled,
+    should_profile,
+)
+from startup import startup_manager, warmup_enabled
+from dedup_index import near_duplicate_index
+from generation_scheduler import SchedulerOverloadedError, generation_scheduler
+from reply_templates import template_engine
 
 configure_logging()
 logger = get_logger("complaintops.ai_service")
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Shared packages are imported here on the main thread before the first request; the
+    # components are built and warmed in parallel in the background and /ready reports them.
+    if warmup_enabled():
+        startup_manager.start()
+    from review_maintenance import ReviewMaintenance
+    from review_store import review_store
+    if ReviewMaintenance(review_store).start_background():
+        logger.info("review_maintenance_scheduled")
+    yield
+
+# Initialize FastAPI app
+app = FastAPI(title="ComplaintOps AI Service", version="0.1.0", lifespan=lifespan)
+
 ALLOW_RAW_PII_RESPONSE = os.getenv("ALLOW_RAW_PII_RESPONSE", "false").lower() == "true"
 
 def sanitize_input(text: str) -> dict:
@@ -67,23 +106,31 @@ class TriageResponse(BaseModel):
     category_confidence: float
     urgency: str
     urgency_confidence: float
+    # Full category distribution, passed to /retrieve to scope the SOP search.
+    category_probabilities: Dict[str, float] = Field(default_factory=dict)
     needs_human_review: bool
     model_loaded: bool
     review_status: str
     review_id: Optional[str] = None
+    duplicate_of: Optional[str] = None
 
 class RAGRequest(BaseModel):
     text: str
     category: Optional[str] = None
+    category_probabilities: Optional[Dict[str, float]] = None
 
 class RAGResponse(BaseModel):
     relevant_sources: List[SourceItem]
+    risk_flags: List[str] = Field(default_factory=list)
+    duplicate_of: Optional[str] = None
 
 class GenerateRequest(BaseModel):
     text: str
     category: CategoryLiteral
     urgency: str
     relevant_sources: List[SourceItem] = Field(default_factory=list)
+    # Triage confidence for category; enables the template fast path when high enough.
+    category_confidence: Optional[float] = None
 
 class GenerateResponse(BaseModel):
     action_plan: List[str]
@@ -103,11 +150,30 @@ class ReviewActionResponse(BaseModel):
 
 # --- Endpoints ---
 
+async def profile_request(request: Request, call_next):
+    if not should_profile(request.headers.get(PROFILE_HEADER)):
+        return await call_next(request)
+    session = ProfileSession(request.state.request_id, request.url.path)
+    token = profile_var.set(session)
+    try:
+        response = await call_next(request)
+    finally:
+        profile_var.reset(token)
+    profile_path = await run_in_threadpool(session.write)
+    if profile_path:
+        logger.info("request_profiled path=%s", profile_path)
+    return response
+
+# Registered before add_request_id so it runs inside it; absent entirely when disabled.
+if profiling_enabled():
+    app.middleware("http")(profile_request)
+
 @app.middleware("http")
 async def add_request_id(request: Request, call_next):
     request_id = request.headers.get("X-Request-ID", str(uuid.uuid4()))
     request.state.request_id = request_id
     request_id_var.set(request_id)
+    deadline_var.set(parse_deadline_header(request.headers.get(DEADLINE_HEADER)))
     response = await call_next(request)
     response.headers["X-Request-ID"] = request_id
     return response
@@ -116,7 +182,15 @@ async def add_request_id(request: Request, call_next):
 def read_root():
     return {"message": "ComplaintOps AI Service is running"}
 
+@app.get("/ready")
+def readiness():
+    if not warmup_enabled():
+        return {"ready": True, "startup_seconds": None, "components": {}}
+    snapshot = startup_manager.snapshot()
+    return JSONResponse(status_code=200 if snapshot["ready"] else 503, content=snapshot)
+
 @app.post("/mask", response_model=MaskingResponse)
+@profiled
 def mask_pii(payload: MaskingRequest, request: Request):
     result = sanitize_input(payload.text)
     log_sanitized_request(
@@ -134,8 +208,9 @@ def mask_pii(payload: MaskingRequest, request: Request):
     return MaskingResponse(**response_payload)
 
 @app.post("/predict", response_model=TriageResponse)
+@profiled
 def predict_triage(payload: TriageRequest, request: Request):
-    from triage_model import triage_engine
+    from triage_batcher import triage_batcher
     from review_store import review_store
     sanitized = sanitize_input(payload.text)
     log_sanitized_request(
@@ -144,11 +219,18 @@ def predict_triage(payload: TriageRequest, request: Request):
         sanitized["masked_entities"],
         request.state.request_id,
     )
-    result = triage_engine.predict(sanitized["masked_text"])
+    duplicate = near_duplicate_index.find(sanitized["masked_text"])
+    if duplicate and duplicate.triage:
+        result = duplicate.triage
+    else:
+        duplicate = None
+        result = triage_batcher.predict(sanitized["masked_text"])
     needs_human_review = (
         result["category_confidence"] < 0.60
         or result["urgency_confidence"] < 0.60
     )
+    if not duplicate and not needs_human_review and result["model_loaded"]:
+        near_duplicate_index.record(sanitized["masked_text"], triage=result)
     review_id = None
     review_status = "AUTO_APPROVED"
     if needs_human_review:
@@ -167,13 +249,16 @@ def predict_triage(payload: TriageRequest, request: Request):
         category_confidence=result["category_confidence"],
         urgency=result["urgency"],
         urgency_confidence=result["urgency_confidence"],
+        category_probabilities=result.get("category_probabilities", {}),
         needs_human_review=needs_human_review,
         model_loaded=result["model_loaded"],
         review_status=review_status,
         review_id=review_id,
+        duplicate_of=duplicate.entry_id if duplicate else None,
     )
 
 @app.post("/retrieve", response_model=RAGResponse)
+@profiled
 def retrieve_docs(payload: RAGRequest, request: Request):
     from rag_manager import rag_manager
     sanitized = sanitize_input(payload.text)
@@ -183,24 +268,70 @@ def retrieve_docs(payload: RAGRequest, request: Request):
         sanitized["masked_entities"],
         request.state.request_id,
     )
-    sources = rag_manager.retrieve(sanitized["masked_text"], category=payload.category)
+    if not has_budget(RAG_MIN_BUDGET_SECONDS):
+        logger.warning("retrieve_skipped_deadline request_id=%s", request.state.request_id)
+        return RAGResponse(relevant_sources=[], risk_flags=["RAG_SKIPPED_DEADLINE"])
+    duplicate = near_duplicate_index.find(sanitized["masked_text"])
+    category_probabilities = payload.category_probabilities
+    scored_locally = False
+    if not payload.category and category_probabilities is None and rag_manager.triage_scoping:
+        if duplicate and duplicate.triage:
+            # /predict already scored a near-duplicate; its distribution scopes this search too.
+            category_probabilities = duplicate.triage.get("category_probabilities")
+        elif duplicate and duplicate.sources and duplicate.sources["scored_locally"]:
+            # Scoped by the same model on a near-identical text; scoring again would agree.
+            return RAGResponse(relevant_sources=duplicate.sources["sources"], duplicate_of=duplicate.entry_id)
+        else:
+            # Scoring locally keeps /retrieve independent of /predict, so callers can run both at once.
+            from triage_batcher import triage_batcher
+            category_probabilities = triage_batcher.predict(sanitized["masked_text"]).get("category_probabilities")
+            scored_locally = True
+    # Sources are only reused for a request searching the same categories.
+    scope = [payload.category] if payload.category else rag_manager.scope_categories(category_probabilities)
+    if duplicate and duplicate.sources and duplicate.sources["scope"] == scope:
+        return RAGResponse(relevant_sources=duplicate.sources["sources"], duplicate_of=duplicate.entry_id)
+    sources = rag_manager.retrieve(
+        sanitized["masked_text"],
+        category=payload.category,
+        category_probabilities=category_probabilities,
+    )
+    if sources:
+        near_duplicate_index.record(
+            sanitized["masked_text"],
+            sources={"scope": scope, "scored_locally": scored_locally, "sources": sources},
+        )
     return RAGResponse(relevant_sources=sources)
 
-@app.post("/generate", response_model=GenerateResponse)
-def generate_response(payload: GenerateRequest, request: Request):
+def _prepare_generation(payload: GenerateRequest, request_id: str) -> dict:
+    """Blocking steps of /generate before the LLM: masking, near-duplicate reuse, RAG fallback
+    and the local drafts. A "result" in the returned dict means no LLM call is needed."""
     from llm_client import llm_client
-    from rag_manager import rag_manager
     sanitized = sanitize_input(payload.text)
     log_sanitized_request(
         "/generate",
         sanitized["masked_text"],
         sanitized["masked_entities"],
-        request.state.request_id,
+        request_id,
     )
-    risk_flags = []
+    prepared = {"masked_text": sanitized["masked_text"], "snippets": [], "risk_flags": [], "result": None}
+    duplicate = near_duplicate_index.find(sanitized["masked_text"])
+    if (
+        duplicate
+        and duplicate.generation
+        and duplicate.generation["category"] == payload.category
+        and duplicate.generation["urgency"] == payload.urgency
+    ):
+        result = duplicate.generation["result"]
+        prepared["result"] = {**result, "risk_flags": result["risk_flags"] + ["NEAR_DUPLICATE_REUSED"]}
+        return prepared
+    risk_flags = prepared["risk_flags"]
     sources = payload.relevant_sources
-    if not sources:
+    if not sources and not has_budget(RAG_MIN_BUDGET_SECONDS):
+        risk_flags.append("RAG_SKIPPED_DEADLINE")
+    elif not sources:
         try:
+            # Imported here so a RAG component that failed to load degrades the draft, not the request
+            from rag_manager import rag_manager
             sources = rag_manager.retrieve(
                 sanitized["masked_text"],
                 category=payload.category,
@@ -212,15 +343,76 @@ def generate_response(payload: GenerateRequest, request: Request):
         except Exception:
             risk_flags.append("RAG_UNAVAILABLE")
             sources = []
-    result = llm_client.generate_response(
-        text=sanitized["masked_text"],
-        category=payload.category,
-        urgency=payload.urgency,
-        snippets=[
-            source.model_dump() if isinstance(source, SourceItem) else source
-            for source in sources
-        ]
+    snippets = [
+        source.model_dump() if isinstance(source, SourceItem) else source
+        for source in sources
+    ]
+    prepared["snippets"] = snippets
+    template_result = template_engine.try_render(
+        payload.category,
+        payload.urgency,
+        payload.category_confidence,
+        snippets,
+    )
+    if template_result:
+        prepared["result"] = template_result
+    elif not has_budget(LLM_MIN_BUDGET_SECONDS):
+        risk_flags.append("TEMPLATED_DRAFT_DEADLINE")
+        prepared["result"] = llm_client.templated_response(payload.category, payload.urgency, snippets)
+    return prepared
+
+@app.post("/generate", response_model=GenerateResponse)
+@profiled
+async def generate_response(payload: GenerateRequest, request: Request):
+    # Only the short blocking steps borrow the shared threadpool. The LLM call is awaited on the
+    # generation scheduler, so urgency decides who goes first and the scheduler alone sheds load.
+    prepared = await run_in_threadpool(
+        follow_profile(_prepare_generation), payload, request.state.request_id
     )
+    risk_flags = prepared["risk_flags"]
+    result = prepared["result"]
+    if result is None:
+        from llm_client import llm_client
+        snippets = prepared["snippets"]
+        compact = not has_budget(FULL_PROMPT_MIN_BUDGET_SECONDS)
+        if compact:
+            risk_flags.append("PROMPT_SHORTENED_DEADLINE")
+        try:
+            result = await generation_scheduler.run_async(
+                follow_profile(lambda: llm_client.generate_response(
+                    text=prepared["masked_text"],
+                    category=payload.category,
+                    urgency=payload.urgency,
+                    snippets=snippets,
+                    deadline=deadline_var.get(),
+                    compact=compact,
+                )),
+                urgency=payload.urgency,
+                category=payload.category,
+                timeout=remaining_seconds(),
+            )
+        except SchedulerOverloadedError as e:
+            logger.warning("generate_shed urgency=%s category=%s", payload.urgency, payload.category)
+            raise HTTPException(
+                status_code=429,
+                detail="Generation queue is full",
+                headers={"Retry-After": str(e.retry_after)},
+            )
+        except FutureTimeoutError:
+            risk_flags.append("TEMPLATED_DRAFT_DEADLINE")
+            result = llm_client.templated_response(payload.category, payload.urgency, snippets)
+        # Only full, clean drafts are worth replaying for near-duplicates.
+        if (
+            not compact
+            and result.get("error_code") is None
+            and "PII_LEAK_DETECTED" not in result["risk_flags"]
+            and "TEMPLATED_DRAFT" not in result["risk_flags"]
+            and "MOCK_MODE_ACTIVE" not in result["risk_flags"]
+        ):
+            near_duplicate_index.record(
+                prepared["masked_text"],
+                generation={"category": payload.category, "urgency": payload.urgency, "result": result},
+            )
     return GenerateResponse(
         action_plan=result["action_plan"],
         customer_reply_draft=result["customer_reply_draft"],
@@ -229,6 +421,29 @@ def generate_response(payload: GenerateRequest, request: Request):
         error_code=result.get("error_code"),
     )
 
+@app.get("/metrics/generation")
+def generation_metrics():
+    return {**generation_scheduler.metrics(), "template_fast_path": template_engine.metrics()}
+
+@app.get("/metrics/dedup")
+def dedup_metrics():
+    return near_duplicate_index.stats()
+
+@app.get("/metrics/logging")
+def logging_metrics():
+    return get_logging_stats()
+
+@app.get("/metrics/triage")
+def triage_metrics():
+    from triage_batcher import triage_batcher
+    return triage_batcher.metrics()
+
+@app.get("/metrics/review-store")
+def review_store_metrics():
+    from review_maintenance import ReviewMaintenance
+    from review_store import review_store
+    return ReviewMaintenance(review_store).report()
+
 @app.post("/review/approve", response_model=ReviewActionResponse)
 def approve_review(payload: ReviewActionRequest):
     from review_store import review_store
@@ -0,0 +1,188 @@
+"""Opt-in per-request profiling.
+
+A request is profiled when it is randomly sampled (PROFILE_SAMPLE_RATE) or carries
+PROFILE_HEADER with a value matching PROFILE_DEBUG_TOKEN. The middleware opens a
+ProfileSession in profile_var; endpoints decorated with @profiled run under cProfile
+on their worker thread while a sampler records collapsed stacks for flame graphs.
+Work the endpoint hands to another thread (the generation scheduler runs the LLM
+call on its own workers) is wrapped with follow_profile: the sampler also records
+that thread's stacks, rooted at its thread name. cProfile stays on the endpoint
+thread; for an async endpoint, whose event loop thread serves other requests too,
+it instead traces the followed threads one at a time.
+
+Only code locations (file, function, line) are recorded, never arguments or locals,
+so request text cannot end up in a profile.
+"""
+from collections import Counter
+from contextlib import contextmanager
+from functools import wraps
+from typing import Optional
+import contextvars
+import cProfile
+import hmac
+import inspect
+import os
+import random
+import re
+import sys
+import threading
+
+from logging_config import get_logger
+
+logger = get_logger("complaintops.profiling")
+
+PROFILE_HEADER = "X-Debug-Profile"
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_DEBUG_TOKEN = os.getenv("PROFILE_DEBUG_TOKEN", "")
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+PROFILE_SAMPLER_INTERVAL = float(os.getenv("PROFILE_SAMPLER_INTERVAL_MS", "5")) / 1000.0
+
+_UNSAFE_FILENAME_CHARS = re.compile(r"[^A-Za-z0-9_.-]")
+
+
+class ProfileSession:
+    def __init__(self, request_id: str, endpoint: str) -> None:
+        self.request_id = request_id
+        self.endpoint = endpoint
+        self.profiler = cProfile.Profile()
+        self.stacks: Counter[str] = Counter()
+        self._threads: dict[int, str] = {}
+        self._threads_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+        # cProfile hooks a single thread at a time; set while some thread is traced.
+        self._tracing = False
+        self._traced_at_start = False
+        self.used = False
+
+    def start(self, trace: bool = True) -> None:
+        self.used = True
+        if trace:
+            with self._threads_lock:
+                self._threads[threading.get_ident()] = threading.current_thread().name
+                self._tracing = self._traced_at_start = True
+        self._sampler = threading.Thread(target=self._sample, name="profile-sampler", daemon=True)
+        self._sampler.start()
+        if trace:
+            self.profiler.enable()
+
+    def stop(self) -> None:
+        if self._traced_at_start:
+            self.profiler.disable()
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join()
+
+    @contextmanager
+    def follow(self):
+        """Sample the current thread too while the block runs, and trace it if no thread is."""
+        thread_id = threading.get_ident()
+        with self._threads_lock:
+            self._threads[thread_id] = threading.current_thread().name
+            trace = not self._tracing
+            self._tracing = True
+        if trace:
+            self.profiler.enable()
+        try:
+            yield
+        finally:
+            if trace:
+                self.profiler.disable()
+            with self._threads_lock:
+                self._threads.pop(thread_id, None)
+                if trace:
+                    self._tracing = False
+
+    def _sample(self) -> None:
+        while not self._stop.wait(PROFILE_SAMPLER_INTERVAL):
+            with self._threads_lock:
+                threads = dict(self._threads)
+            frames = sys._current_frames()
+            for thread_id, thread_name in threads.items():
+                frame = frames.get(thread_id)
+                if frame is None:
+                    continue
+                names = []
+                while frame is not None:
+                    code = frame.f_code
+                    names.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                    frame = frame.f_back
+                names.append(thread_name)
+                self.stacks[";".join(reversed(names))] += 1
+
+    def write(self) -> Optional[str]:
+        if not self.used:
+            return None
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        safe_request_id = _UNSAFE_FILENAME_CHARS.sub("_", self.request_id)[:64]
+        safe_endpoint = _UNSAFE_FILENAME_CHARS.sub("_", self.endpoint.strip("/")) or "root"
+        base_path = os.path.join(PROFILE_DIR, f"{safe_endpoint}_{safe_request_id}")
+        self.profiler.dump_stats(f"{base_path}.prof")
+        with open(f"{base_path}.collapsed", "w", encoding="utf-8") as handle:
+            for stack, count in self.stacks.most_common():
+                handle.write(f"{stack} {count}\n")
+        return base_path
+
+
+profile_var: contextvars.ContextVar[Optional[ProfileSession]] = contextvars.ContextVar(
+    "profile_session", default=None
+)
+
+
+def profiling_enabled() -> bool:
+    return PROFILE_SAMPLE_RATE > 0 or bool(PROFILE_DEBUG_TOKEN)
+
+
+def should_profile(debug_header: Optional[str]) -> bool:
+    # compare_digest rejects non-ASCII str; compare bytes so any header value is just a mismatch.
+    if debug_header and PROFILE_DEBUG_TOKEN and hmac.compare_digest(
+        debug_header.encode("utf-8"), PROFILE_DEBUG_TOKEN.encode("utf-8")
+    ):
+        return True
+    return PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE
+
+
+def profiled(func):
+    """Run an endpoint under the request's ProfileSession, if one is active."""
+    if inspect.iscoroutinefunction(func):
+
+        @wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            session = profile_var.get()
+            if session is None:
+                return await func(*args, **kwargs)
+            # Only threads the endpoint hands work to via follow_profile are profiled.
+            session.start(trace=False)
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                session.stop()
+
+        return async_wrapper
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        session = profile_var.get()
+        if session is None:
+            return func(*args, **kwargs)
+        session.start()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            session.stop()
+
+    return wrapper
+
+
+def follow_profile(func):
+    """Wrap work handed to another thread so the active ProfileSession samples that thread."""
+    session = profile_var.get()
+    if session is None:
+        return func
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with session.follow():
+            return func(*args, **kwargs)
+
+    return wrapper
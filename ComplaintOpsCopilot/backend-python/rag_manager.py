@@ -1,8 +1,8 @@
 import chromadb
-from chromadb.utils import embedding_functions
 import os
 from typing import List, Dict, Optional
 
+from embeddings import embedding_metadata, find_mismatch, get_embedding_function
 from logging_config import get_logger
 
 class RAGManager:
@@ -12,44 +12,117 @@ class RAGManager:
         db_path = os.path.join(os.getcwd(), "chroma_db")
         self.client = chromadb.PersistentClient(path=db_path)
         self.default_top_k = int(os.getenv("RAG_TOP_K", "4"))
+        # Triage-guided scoping: search the most likely categories until their
+        # cumulative probability reaches the threshold; below the minimum top
+        # probability the triage is not trusted and the search stays global.
+        self.category_cumulative_threshold = float(os.getenv("RAG_CATEGORY_CUMULATIVE_THRESHOLD", "0.8"))
+        self.category_min_confidence = float(os.getenv("RAG_CATEGORY_MIN_CONFIDENCE", "0.4"))
+        self.category_max_count = int(os.getenv("RAG_CATEGORY_MAX_COUNT", "3"))
+        # When the caller sends no distribution, /retrieve scores the text with the triage model.
+        self.triage_scoping = os.getenv("RAG_TRIAGE_SCOPING", "true").lower() == "true"
         self.logger = get_logger("complaintops.rag_manager")
         
-        # Use simple default embedding function (all-MiniLM-L6-v2)
-        # Note: In production for Turkish, a multilingual model like 'sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2' is better
-        self.embedding_fn = embedding_functions.DefaultEmbeddingFunction() 
-        
-        self.collection = self.client.get_or_create_collection(
-            name="complaint_sops",
-            embedding_function=self.embedding_fn
-        )
+        # Backend is selected by EMBEDDING_BACKEND and must match the one used by ingest_sops.py
+        self.embedding_fn = get_embedding_function()
+
+        try:
+            self.collection = self.client.get_collection(
+                name="complaint_sops",
+                embedding_function=self.embedding_fn,
+            )
+        except Exception:
+            self.collection = self.client.create_collection(
+                name="complaint_sops",
+                embedding_function=self.embedding_fn,
+                metadata=embedding_metadata(),
+            )
+        # Vectors from a different model are not comparable: refuse to serve them.
+        self.embedding_mismatch = find_mismatch(self.collection.metadata)
+        if self.embedding_mismatch:
+            self.logger.error("Embedding model mismatch: %s. Re-run ingest_sops.py.", self.embedding_mismatch)
+        # Chunks ingested before categories were stored cannot be scoped or used for templates.
+        self.uncategorized_chunks = self._count_uncategorized()
+        if self.uncategorized_chunks:
+            self.logger.error(
+                "%d SOP chunks have no category metadata. Re-run ingest_sops.py.", self.uncategorized_chunks
+            )
+
+    def _count_uncategorized(self) -> int:
+        try:
+            metadatas = self.collection.get(include=["metadatas"])["metadatas"] or []
+        except Exception as e:
+            self.logger.error("RAG metadata check failed: %s", e)
+            return 0
+        return sum(1 for metadata in metadatas if not (metadata or {}).get("category"))
+
+    def _distance_to_score(self, distance: float) -> float:
+        # Embeddings are L2-normalized: squared L2 distance is 2 - 2*cos, cosine distance is 1 - cos.
+        space = (self.collection.metadata or {}).get("hnsw:space", "l2")
+        similarity = 1 - distance / 2 if space == "l2" else 1 - distance
+        return round(max(0.0, min(1.0, similarity)), 4)
+
+    def scope_categories(self, category_probabilities: Optional[Dict[str, float]]) -> List[str]:
+        """Most likely categories covering the cumulative threshold; [] means search globally."""
+        ranked = sorted((category_probabilities or {}).items(), key=lambda item: item[1], reverse=True)
+        if not ranked or ranked[0][1] < self.category_min_confidence:
+            return []
+        categories = []
+        cumulative = 0.0
+        for label, probability in ranked[:self.category_max_count]:
+            categories.append(label)
+            cumulative += probability
+            if cumulative >= self.category_cumulative_threshold:
+                return categories
+        # The allowed categories never reach the threshold: too uncertain to scope.
+        return []
 
     def retrieve(
         self,
         query: str,
         n_results: Optional[int] = None,
         category: Optional[str] = None,
-    ) -> List[Dict[str, str]]:
+        category_probabilities: Optional[Dict[str, float]] = None,
+    ) -> List[Dict]:
+        if self.embedding_mismatch:
+            return []
+        if category:
+            return self._query(query, n_results, {"category": category})
+        categories = self.scope_categories(category_probabilities)
+        if not categories:
+            return self._query(query, n_results, None)
+        # One filtered query ranks the union of the categories by score, which is the
+        # same as searching each category and merging the results.
+        where_filter = {"category": categories[0]} if len(categories) == 1 else {"category": {"$in": categories}}
+        sources = self._query(query, n_results, where_filter)
+        if not sources:
+            self.logger.info("RAG scoped search empty for %s; falling back to global", categories)
+            return self._query(query, n_results, None)
+        return sources
+
+    def _query(self, query: str, n_results: Optional[int], where_filter: Optional[dict]) -> List[Dict]:
         try:
             resolved_top_k = n_results or self.default_top_k
-            where_filter = {"category": category} if category else None
             results = self.collection.query(
                 query_texts=[query],
                 n_results=resolved_top_k,
                 where=where_filter,
-                include=["documents", "metadatas"]
+                include=["documents", "metadatas", "distances"]
             )
             # Flatten results list
             if results["documents"]:
                 documents = results["documents"][0]
                 metadatas = results["metadatas"][0]
+                distances = results["distances"][0]
                 return [
                     {
                         "snippet": doc,
                         "source": metadata.get("source", "unknown"),
                         "doc_name": metadata.get("doc_name", "unknown"),
                         "chunk_id": metadata.get("chunk_id", "unknown"),
+                        "score": self._distance_to_score(distance),
+                        "category": metadata.get("category"),
                     }
-                    for doc, metadata in zip(documents, metadatas)
+                    for doc, metadata, distance in zip(documents, metadatas, distances)
                 ]
             return []
         except Exception as e:
@@ -0,0 +1,161 @@
+from dataclasses import dataclass
+from string import Template
+from threading import Lock
+from typing import Optional
+import os
+
+from logging_config import get_logger
+
+logger = get_logger("complaintops.reply_templates")
+
+
+@dataclass(frozen=True)
+class ReplyTemplate:
+    action_plan: tuple[str, ...]
+    reply: str
+
+
+# ${snippet} is the top retrieved SOP passage, ${doc_name} its document.
+TEMPLATES: dict[str, ReplyTemplate] = {
+    "INFORMATION_REQUEST": ReplyTemplate(
+        action_plan=(
+            "Confirm what information the customer is asking for.",
+            "Share the answer from SOP ${doc_name}.",
+            "Close the request as informed; no follow-up needed.",
+        ),
+        reply=(
+            "Sayın Müşterimiz,\n\n"
+            "Bilgi talebiniz için teşekkür ederiz. Konuyla ilgili bilgilendirme aşağıdadır:\n\n"
+            "${snippet}\n\n"
+            "Başka sorularınız olursa bize her zaman ulaşabilirsiniz.\n\n"
+            "Saygılarımızla"
+        ),
+    ),
+    "CAMPAIGN_POINTS_REWARDS": ReplyTemplate(
+        action_plan=(
+            "Check the customer's campaign participation and point balance.",
+            "Explain the campaign rules from SOP ${doc_name}.",
+            "Escalate only if points are missing past the stated loading period.",
+        ),
+        reply=(
+            "Sayın Müşterimiz,\n\n"
+            "Kampanya ve puanlarınızla ilgili talebiniz tarafımıza ulaşmıştır. "
+            "Kampanya koşullarımız şu şekildedir:\n\n"
+            "${snippet}\n\n"
+            "Belirtilen süre sonunda puanlarınız yüklenmemişse lütfen bizimle tekrar iletişime geçiniz.\n\n"
+            "Saygılarımızla"
+        ),
+    ),
+}
+
+
+def _trim_snippet(snippet: str, limit: int) -> str:
+    snippet = " ".join(snippet.split())
+    if len(snippet) <= limit:
+        return snippet
+    cut = snippet[:limit]
+    # Prefer ending on a full sentence so the reply does not stop mid-clause.
+    sentence_end = cut.rfind(". ")
+    return cut[:sentence_end + 1] if sentence_end > 0 else cut.rstrip() + "..."
+
+
+class TemplateEngine:
+    """Renders routine replies locally from per-category templates and the top SOP snippet.
+
+    Used instead of the LLM only when the category and urgency are whitelisted, the top
+    snippet comes from an SOP of the same category (retrieval falls back to a global
+    search, which can rank another category's SOP first), and both the triage
+    confidence and the snippet's retrieval score clear their thresholds.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = os.getenv("TEMPLATE_FAST_PATH_ENABLED", "true").lower() == "true"
+        categories = os.getenv("TEMPLATE_CATEGORIES", ",".join(TEMPLATES))
+        self.categories = {item.strip() for item in categories.split(",") if item.strip() in TEMPLATES}
+        urgencies = os.getenv("TEMPLATE_URGENCIES", "GREEN")
+        self.urgencies = {item.strip().upper() for item in urgencies.split(",") if item.strip()}
+        self.min_triage_confidence = float(os.getenv("TEMPLATE_MIN_TRIAGE_CONFIDENCE", "0.85"))
+        self.min_retrieval_score = float(os.getenv("TEMPLATE_MIN_RETRIEVAL_SCORE", "0.5"))
+        self.snippet_chars = int(os.getenv("TEMPLATE_SNIPPET_CHARS", "400"))
+        self._lock = Lock()
+        self._counts: dict[str, int] = {}
+
+    def _count(self, outcome: str) -> None:
+        with self._lock:
+            self._counts[outcome] = self._counts.get(outcome, 0) + 1
+
+    def skip_reason(
+        self,
+        category: str,
+        urgency: str,
+        triage_confidence: Optional[float],
+        snippets: list,
+    ) -> Optional[str]:
+        if not self.enabled:
+            return "disabled"
+        if category not in self.categories:
+            return "category"
+        if (urgency or "").upper() not in self.urgencies:
+            return "urgency"
+        if triage_confidence is None or triage_confidence < self.min_triage_confidence:
+            return "triage_confidence"
+        if not snippets or snippets[0].get("category") != category:
+            return "snippet_category"
+        score = snippets[0].get("score")
+        if score is None or score < self.min_retrieval_score:
+            return "retrieval_score"
+        return None
+
+    def render(self, category: str, snippets: list) -> dict:
+        template = TEMPLATES[category]
+        top = snippets[0]
+        values = {
+            "snippet": _trim_snippet(top.get("snippet", ""), self.snippet_chars),
+            "doc_name": top.get("doc_name", "unknown"),
+        }
+        return {
+            "action_plan": [Template(step).safe_substitute(values) for step in template.action_plan],
+            "customer_reply_draft": Template(template.reply).safe_substitute(values),
+            "risk_flags": ["TEMPLATE_GENERATED"],
+            "sources": [
+                {
+                    "doc_name": top.get("doc_name", "unknown"),
+                    "source": top.get("source", "unknown"),
+                    "snippet": top.get("snippet", ""),
+                    "chunk_id": top.get("chunk_id", "unknown"),
+                    "score": top.get("score"),
+                    "category": top.get("category"),
+                }
+            ],
+            "error_code": None,
+        }
+
+    def try_render(
+        self,
+        category: str,
+        urgency: str,
+        triage_confidence: Optional[float],
+        snippets: list,
+    ) -> Optional[dict]:
+        """Return a templated result, or None when the request needs the LLM."""
+        reason = self.skip_reason(category, urgency, triage_confidence, snippets)
+        if reason:
+            self._count(f"skipped_{reason}")
+            return None
+        self._count("rendered")
+        logger.info("template_fast_path category=%s doc_name=%s", category, snippets[0].get("doc_name"))
+        return self.render(category, snippets)
+
+    def metrics(self) -> dict:
+        with self._lock:
+            counts = dict(self._counts)
+        return {
+            "enabled": self.enabled,
+            "categories": sorted(self.categories),
+            "min_triage_confidence": self.min_triage_confidence,
+            "min_retrieval_score": self.min_retrieval_score,
+            "outcomes": counts,
+        }
+
+
+template_engine = TemplateEngine()
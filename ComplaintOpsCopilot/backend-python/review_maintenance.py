@@ -0,0 +1,237 @@
+"""Online retention and compaction for the review SQLite database.
+
+Every step works in batches of REVIEW_MAINTENANCE_BATCH_SIZE rows and takes the store's
+write lock only for the short DELETE/UPDATE/vacuum statement of one batch, so
+create_review waits a few milliseconds at most. Reads and archive file writes happen
+outside the lock (the database runs in WAL mode).
+
+    python review_maintenance.py                 # run one pass and print the report
+    python review_maintenance.py --report        # report only
+    python review_maintenance.py --enable-incremental-vacuum   # one-off, offline
+"""
+from contextlib import closing
+from datetime import datetime, timedelta, timezone
+from threading import Thread
+from typing import Optional
+import argparse
+import gzip
+import json
+import os
+import time
+
+from logging_config import get_logger
+from review_store import CLOSED_STATUSES, ReviewStore, compress_text, decompress_text
+
+logger = get_logger("complaintops.review_maintenance")
+
+
+class ReviewMaintenance:
+    def __init__(self, store: ReviewStore) -> None:
+        self.store = store
+        self.archive_after_days = float(os.getenv("REVIEW_ARCHIVE_AFTER_DAYS", "90"))
+        self.archive_dir = os.getenv("REVIEW_ARCHIVE_DIR", "review_archive")
+        self.batch_size = int(os.getenv("REVIEW_MAINTENANCE_BATCH_SIZE", "200"))
+        self.vacuum_pages = int(os.getenv("REVIEW_VACUUM_PAGES", "256"))
+        self.interval_seconds = float(os.getenv("REVIEW_MAINTENANCE_INTERVAL_SECONDS", "0"))
+
+    def _archive_path(self, updated_at: str) -> str:
+        day = updated_at[:10]
+        year, month, date = day.split("-")
+        partition = os.path.join(self.archive_dir, f"year={year}", f"month={month}", f"day={date}")
+        os.makedirs(partition, exist_ok=True)
+        return os.path.join(partition, "reviews.jsonl.gz")
+
+    def archive_closed_reviews(self, now: Optional[datetime] = None) -> int:
+        """Move closed reviews not updated within the retention window to gzip JSONL files.
+
+        Rows are written before they are deleted, so a crash can at worst archive a
+        batch twice; it never loses one.
+        """
+        now = now or datetime.now(timezone.utc)
+        cutoff = (now - timedelta(days=self.archive_after_days)).isoformat()
+        status_marks = ", ".join("?" for _ in CLOSED_STATUSES)
+        archived = 0
+        while True:
+            with closing(self.store.get_connection()) as conn:
+                rows = conn.execute(
+                    f"""
+                    SELECT * FROM review_records
+                    WHERE status IN ({status_marks}) AND updated_at < ?
+                    ORDER BY updated_at
+                    LIMIT ?
+                    """,
+                    (*CLOSED_STATUSES, cutoff, self.batch_size),
+                ).fetchall()
+                if not rows:
+                    break
+                review_ids = [row["review_id"] for row in rows]
+                id_marks = ", ".join("?" for _ in review_ids)
+                audit_rows = conn.execute(
+                    f"SELECT * FROM review_audit WHERE review_id IN ({id_marks}) ORDER BY audit_id",
+                    review_ids,
+                ).fetchall()
+
+            audits_by_review: dict[str, list[dict]] = {}
+            for audit in audit_rows:
+                audits_by_review.setdefault(audit["review_id"], []).append(dict(audit))
+            lines_by_path: dict[str, list[str]] = {}
+            for row in rows:
+                record = dict(row)
+                record["masked_text"] = decompress_text(record["masked_text"])
+                record["audit"] = audits_by_review.get(record["review_id"], [])
+                lines_by_path.setdefault(self._archive_path(record["updated_at"]), []).append(
+                    json.dumps(record, ensure_ascii=False)
+                )
+            for path, lines in lines_by_path.items():
+                # Appending adds a gzip member; readers treat the file as one stream.
+                with gzip.open(path, "at", encoding="utf-8") as handle:
+                    handle.write("\n".join(lines) + "\n")
+
+            # Re-check status/age so a review reopened meanwhile is kept.
+            still_closed = f"""
+                SELECT review_id FROM review_records
+                WHERE review_id IN ({id_marks}) AND status IN ({status_marks}) AND updated_at < ?
+            """
+            params = (*review_ids, *CLOSED_STATUSES, cutoff)
+            with self.store.write_lock, closing(self.store.get_connection()) as conn, conn:
+                conn.execute(f"DELETE FROM review_audit WHERE review_id IN ({still_closed})", params)
+                deleted = conn.execute(
+                    f"DELETE FROM review_records WHERE review_id IN ({still_closed})", params
+                ).rowcount
+            archived += deleted
+            if len(rows) < self.batch_size:
+                break
+        return archived
+
+    def compress_legacy_rows(self) -> int:
+        """Compress masked_text of rows written before compression at rest."""
+        compressed = 0
+        while True:
+            with closing(self.store.get_connection()) as conn:
+                rows = conn.execute(
+                    "SELECT review_id, masked_text FROM review_records WHERE typeof(masked_text) = 'text' LIMIT ?",
+                    (self.batch_size,),
+                ).fetchall()
+            if not rows:
+                break
+            updates = [(compress_text(row["masked_text"]), row["review_id"]) for row in rows]
+            with self.store.write_lock, closing(self.store.get_connection()) as conn, conn:
+                conn.executemany(
+                    "UPDATE review_records SET masked_text = ? WHERE review_id = ? AND typeof(masked_text) = 'text'",
+                    updates,
+                )
+            compressed += len(rows)
+            if len(rows) < self.batch_size:
+                break
+        return compressed
+
+    def incremental_vacuum(self) -> int:
+        """Return free pages to the filesystem a few hundred pages at a time."""
+        freed = 0
+        with closing(self.store.get_connection()) as conn:
+            # Move deleted pages from the WAL into the main file so they can be released.
+            conn.execute("PRAGMA wal_checkpoint(PASSIVE)").fetchall()
+            if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+                return 0
+        while True:
+            with self.store.write_lock, closing(self.store.get_connection()) as conn:
+                before = conn.execute("PRAGMA freelist_count").fetchone()[0]
+                if before == 0:
+                    break
+                conn.execute(f"PRAGMA incremental_vacuum({self.vacuum_pages})").fetchall()
+                after = conn.execute("PRAGMA freelist_count").fetchone()[0]
+            freed += before - after
+            if after == 0 or after == before:
+                break
+        return freed
+
+    def enable_incremental_vacuum(self) -> None:
+        """Switch an existing database to incremental auto-vacuum. Rewrites the file: run offline."""
+        with self.store.write_lock, closing(self.store.get_connection()) as conn:
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            conn.execute("VACUUM")
+
+    def report(self) -> dict:
+        db_path = self.store.db_path
+        wal_path = f"{db_path}-wal"
+        with closing(self.store.get_connection()) as conn:
+            page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+            page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+            freelist_count = conn.execute("PRAGMA freelist_count").fetchone()[0]
+            auto_vacuum = conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+            by_status = {
+                row["status"]: row["count"]
+                for row in conn.execute(
+                    "SELECT status, COUNT(*) AS count FROM review_records GROUP BY status"
+                )
+            }
+            audit_rows = conn.execute("SELECT COUNT(*) FROM review_audit").fetchone()[0]
+            uncompressed = conn.execute(
+                "SELECT COUNT(*) FROM review_records WHERE typeof(masked_text) = 'text'"
+            ).fetchone()[0]
+        return {
+            "db_bytes": os.path.getsize(db_path) if os.path.exists(db_path) else 0,
+            "wal_bytes": os.path.getsize(wal_path) if os.path.exists(wal_path) else 0,
+            "page_size": page_size,
+            "page_count": page_count,
+            "free_pages": freelist_count,
+            "auto_vacuum": {0: "NONE", 1: "FULL", 2: "INCREMENTAL"}.get(auto_vacuum, str(auto_vacuum)),
+            "review_records": sum(by_status.values()),
+            "review_records_by_status": by_status,
+            "review_audit": audit_rows,
+            "uncompressed_records": uncompressed,
+        }
+
+    def run_once(self) -> dict:
+        started = time.monotonic()
+        archived = self.archive_closed_reviews()
+        compressed = self.compress_legacy_rows()
+        freed_pages = self.incremental_vacuum()
+        result = {
+            "archived": archived,
+            "compressed": compressed,
+            "freed_pages": freed_pages,
+            "seconds": round(time.monotonic() - started, 3),
+        }
+        logger.info(
+            "review_maintenance archived=%s compressed=%s freed_pages=%s seconds=%s",
+            archived,
+            compressed,
+            freed_pages,
+            result["seconds"],
+        )
+        return result
+
+    def start_background(self) -> bool:
+        if self.interval_seconds <= 0:
+            return False
+        Thread(target=self._loop, name="review-maintenance", daemon=True).start()
+        return True
+
+    def _loop(self) -> None:
+        while True:
+            time.sleep(self.interval_seconds)
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.error("Review maintenance failed: %s", e)
+
+
+def main() -> None:
+    from review_store import review_store
+
+    parser = argparse.ArgumentParser(description="Review database retention and compaction")
+    parser.add_argument("--report", action="store_true", help="Only print the storage report")
+    parser.add_argument("--enable-incremental-vacuum", action="store_true")
+    args = parser.parse_args()
+
+    maintenance = ReviewMaintenance(review_store)
+    if args.enable_incremental_vacuum:
+        maintenance.enable_incremental_vacuum()
+    if not args.report:
+        print(json.dumps(maintenance.run_once()))
+    print(json.dumps(maintenance.report(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,23 @@
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from threading import Lock
-from typing import Optional
+from typing import Optional, Union
 import os
 import sqlite3
+import zlib
+
+CLOSED_STATUSES = ("APPROVED", "REJECTED")
+
+
+def compress_text(text: str) -> bytes:
+    return zlib.compress(text.encode("utf-8"), 6)
+
+
+def decompress_text(value: Union[str, bytes]) -> str:
+    # Rows written before compression hold plain TEXT; newer rows hold zlib BLOBs.
+    if isinstance(value, bytes):
+        return zlib.decompress(value).decode("utf-8")
+    return value
 
 
 @dataclass
@@ -26,13 +40,26 @@ class ReviewStore:
         self._db_path = os.getenv("REVIEW_DB_PATH", "reviews.db")
         self._init_db()
 
-    def _get_connection(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(self._db_path)
+    @property
+    def db_path(self) -> str:
+        return self._db_path
+
+    @property
+    def write_lock(self) -> Lock:
+        return self._lock
+
+    def get_connection(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self._db_path, timeout=5.0)
         conn.row_factory = sqlite3.Row
         return conn
 
     def _init_db(self) -> None:
-        with self._get_connection() as conn:
+        with self.get_connection() as conn:
+            # Only takes effect on a fresh file; existing files need one offline VACUUM
+            # (python review_maintenance.py --enable-incremental-vacuum).
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            # WAL lets maintenance reads run alongside create_review writes.
+            conn.execute("PRAGMA journal_mode = WAL")
             conn.execute(
                 """
                 CREATE TABLE IF NOT EXISTS review_records (
@@ -60,6 +87,13 @@ class ReviewStore:
                 )
                 """
             )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_review_records_status_updated "
+                "ON review_records (status, updated_at)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_review_audit_review_id ON review_audit (review_id)"
+            )
 
     def create_review(
         self,
@@ -82,7 +116,7 @@ class ReviewStore:
             urgency=urgency,
             urgency_confidence=urgency_confidence,
         )
-        with self._lock, self._get_connection() as conn:
+        with self._lock, self.get_connection() as conn:
             conn.execute(
                 """
                 INSERT INTO review_records (
@@ -95,7 +129,7 @@ class ReviewStore:
                     record.status,
                     record.created_at,
                     record.updated_at,
-                    record.masked_text,
+                    compress_text(record.masked_text),
                     record.category,
                     record.category_confidence,
                     record.urgency,
@@ -114,7 +148,7 @@ class ReviewStore:
 
     def update_review(self, review_id: str, status: str, notes: Optional[str] = None) -> Optional[ReviewRecord]:
         now = datetime.now(timezone.utc).isoformat()
-        with self._lock, self._get_connection() as conn:
+        with self._lock, self.get_connection() as conn:
             cursor = conn.execute(
                 """
                 SELECT * FROM review_records WHERE review_id = ?
@@ -144,7 +178,7 @@ class ReviewStore:
                 status=status,
                 created_at=row["created_at"],
                 updated_at=now,
-                masked_text=row["masked_text"],
+                masked_text=decompress_text(row["masked_text"]),
                 category=row["category"],
                 category_confidence=row["category_confidence"],
                 urgency=row["urgency"],
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic import BaseModel
 
 
@@ -6,3 +8,7 @@ class SourceItem(BaseModel):
     source: str
     doc_name: str
     chunk_id: str
+    # Similarity to the query in [0, 1]; only set on sources returned by retrieval.
+    score: Optional[float] = None
+    # SOP category of the chunk; unset for chunks ingested before categories were stored.
+    category: Optional[str] = None
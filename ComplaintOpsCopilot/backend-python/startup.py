@@ -0,0 +1,185 @@
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from threading import Lock, Thread
+from typing import Callable, Optional
+import importlib
+import os
+import time
+
+from logging_config import get_logger
+
+logger = get_logger("complaintops.startup")
+
+WARMUP_TEXT = "Kartımdan bilgim dışında işlem yapıldı, lütfen yardımcı olun."
+
+
+@dataclass
+class ComponentStatus:
+    status: str = "PENDING"
+    load_seconds: Optional[float] = None
+    warmup_seconds: Optional[float] = None
+    attempts: int = 0
+    error: Optional[str] = None
+
+
+def _warm_pii_masker(module) -> str:
+    module.masker.mask(WARMUP_TEXT)
+    return "READY"
+
+
+def _warm_triage_model(module) -> str:
+    if not module.triage_engine.model_loaded:
+        return "DEGRADED"
+    module.triage_engine.predict(WARMUP_TEXT)
+    return "READY"
+
+
+def _warm_rag_manager(module) -> str:
+    if module.rag_manager.embedding_mismatch or module.rag_manager.uncategorized_chunks:
+        return "DEGRADED"
+    # First query loads the embedding model and the HNSW index into memory.
+    module.rag_manager.retrieve(WARMUP_TEXT, n_results=1)
+    return "READY"
+
+
+def _warm_llm_client(module) -> str:
+    # No dummy completion: it would be billed and depends on upstream health.
+    return "DEGRADED" if module.llm_client.mock_mode else "READY"
+
+
+def _warm_review_store(module) -> str:
+    return "READY"
+
+
+# Module name -> warmup; importing the module builds its singleton.
+COMPONENTS: dict[str, Callable] = {
+    "pii_masker": _warm_pii_masker,
+    "triage_model": _warm_triage_model,
+    "rag_manager": _warm_rag_manager,
+    "llm_client": _warm_llm_client,
+    "review_store": _warm_review_store,
+}
+
+# Third-party packages each component imports at module level. They are imported one by one
+# before the pool starts, so concurrent component imports never race on a shared package's
+# import lock or see it half-initialized; building the singletons then runs in parallel.
+DEPENDENCIES: dict[str, tuple[str, ...]] = {
+    "pii_masker": ("presidio_analyzer", "presidio_anonymizer"),
+    "triage_model": ("joblib", "sklearn"),
+    "rag_manager": ("chromadb",),
+    "llm_client": ("openai",),
+    "review_store": (),
+}
+
+# Endpoints answer without these (e.g. /generate flags RAG_UNAVAILABLE), so a failure is DEGRADED.
+OPTIONAL_COMPONENTS = {"rag_manager"}
+
+STARTUP_MAX_ATTEMPTS = int(os.getenv("STARTUP_MAX_ATTEMPTS", "3"))
+STARTUP_RETRY_BACKOFF_SECONDS = float(os.getenv("STARTUP_RETRY_BACKOFF_SECONDS", "1.0"))
+
+
+def _import_all(packages: tuple[str, ...]) -> bool:
+    for package in packages:
+        importlib.import_module(package)
+    return True
+
+
+class StartupManager:
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._statuses = {name: ComponentStatus() for name in COMPONENTS}
+        self._started_at: Optional[float] = None
+        self._total_seconds: Optional[float] = None
+
+    def start(self) -> Thread:
+        """Import shared packages on the calling thread, then build and warm components in parallel.
+
+        Importing a component module builds its singleton (spaCy, Chroma, joblib pickles, the
+        OpenAI client); those imports run in the background pool, one component per worker.
+        """
+        self._started_at = time.monotonic()
+        names = [
+            name for name in COMPONENTS
+            if self._attempt(name, "dependencies", lambda name=name: _import_all(DEPENDENCIES.get(name, ())))
+            is not None
+        ]
+        thread = Thread(target=self._run, args=(names,), name="startup", daemon=True)
+        thread.start()
+        return thread
+
+    def _run(self, names: list[str]) -> None:
+        if names:
+            with ThreadPoolExecutor(max_workers=len(names), thread_name_prefix="startup") as executor:
+                list(executor.map(self._init_component, names))
+        self._total_seconds = time.monotonic() - self._started_at
+        logger.info("startup_complete total_seconds=%.2f ready=%s", self._total_seconds, self.is_ready())
+
+    def _set(self, name: str, **fields) -> None:
+        with self._lock:
+            for key, value in fields.items():
+                setattr(self._statuses[name], key, value)
+
+    def _attempt(self, name: str, stage: str, func: Callable):
+        """Run one init stage with exponential backoff; None once every attempt has failed."""
+        self._set(name, status="LOADING")
+        for attempt in range(1, STARTUP_MAX_ATTEMPTS + 1):
+            self._set(name, attempts=attempt)
+            started = time.monotonic()
+            try:
+                result = func()
+            except Exception as e:
+                logger.warning(
+                    "component_attempt_failed name=%s stage=%s attempt=%d error=%s", name, stage, attempt, e
+                )
+                if attempt == STARTUP_MAX_ATTEMPTS:
+                    status = "DEGRADED" if name in OPTIONAL_COMPONENTS else "FAILED"
+                    self._set(name, status=status, error=f"{stage}: {e}")
+                    logger.error("component_failed name=%s stage=%s status=%s error=%s", name, stage, status, e)
+                    return None
+                time.sleep(STARTUP_RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1))
+                continue
+            seconds_field = {"load": "load_seconds", "warmup": "warmup_seconds"}.get(stage)
+            self._set(name, error=None)
+            if seconds_field:
+                self._set(name, **{seconds_field: round(time.monotonic() - started, 3)})
+            return result
+        return None
+
+    def _init_component(self, name: str) -> None:
+        module = self._attempt(name, "load", lambda: importlib.import_module(name))
+        if module is None:
+            return
+        status = self._attempt(name, "warmup", lambda: COMPONENTS[name](module))
+        if status is None:
+            return
+        self._set(name, status=status)
+        with self._lock:
+            component = self._statuses[name]
+            load_seconds, warmup_seconds = component.load_seconds, component.warmup_seconds
+        logger.info(
+            "component_initialized name=%s status=%s load_seconds=%.2f warmup_seconds=%.2f",
+            name,
+            status,
+            load_seconds,
+            warmup_seconds,
+        )
+
+    def is_ready(self) -> bool:
+        with self._lock:
+            return all(status.status in ("READY", "DEGRADED") for status in self._statuses.values())
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            components = {name: asdict(status) for name, status in self._statuses.items()}
+        return {
+            "ready": self.is_ready(),
+            "startup_seconds": round(self._total_seconds, 3) if self._total_seconds is not None else None,
+            "components": components,
+        }
+
+
+startup_manager = StartupManager()
+
+
+def warmup_enabled() -> bool:
+    return os.getenv("STARTUP_WARMUP", "true").lower() == "true"
@@ -0,0 +1,9 @@
+import os
+import sys
+import tempfile
+
+# Service modules are imported as top-level modules, as uvicorn runs them from backend-python.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# review_store opens its database at import time; keep the module singleton out of the tree.
+os.environ.setdefault("REVIEW_DB_PATH", os.path.join(tempfile.mkdtemp(prefix="complaintops-tests-"), "reviews.db"))
@@ -0,0 +1,120 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+import deadline
+import llm_client
+import main
+from dedup_index import NearDuplicateIndex
+from generation_scheduler import GenerationScheduler
+
+SOURCE = {"snippet": "SOP text", "source": "sop.md", "doc_name": "SOP-1", "chunk_id": "c1", "category": "TRANSFER_DELAY"}
+
+
+def test_header_budget_keeps_a_response_margin(monkeypatch):
+    monkeypatch.setattr(deadline, "RESPONSE_MARGIN_SECONDS", 0.5)
+    before = time.monotonic()
+    parsed = deadline.parse_deadline_header("3000")
+    assert before + 2.5 <= parsed <= time.monotonic() + 2.5
+    # A budget inside the margin leaves nothing, never a negative remainder.
+    token = deadline.deadline_var.set(deadline.parse_deadline_header("200"))
+    try:
+        assert deadline.remaining_seconds() == 0.0
+        assert not deadline.has_budget(0.1)
+    finally:
+        deadline.deadline_var.reset(token)
+
+
+@pytest.mark.parametrize("value", [None, "", "soon"])
+def test_missing_or_invalid_header_means_no_deadline(value):
+    assert deadline.parse_deadline_header(value) is None
+
+
+def test_no_deadline_always_has_budget():
+    assert deadline.remaining_seconds() is None
+    assert deadline.has_budget(1000)
+
+
+@pytest.fixture
+def generate(monkeypatch):
+    """POST /generate with a deadline header against the real app and a fake LLM."""
+    monkeypatch.setenv("DEDUP_ENABLED", "false")
+    monkeypatch.setattr(deadline, "RESPONSE_MARGIN_SECONDS", 0.5)
+    monkeypatch.setattr(main, "generation_scheduler", GenerationScheduler())
+    monkeypatch.setattr(main, "near_duplicate_index", NearDuplicateIndex())
+    monkeypatch.setattr(
+        main,
+        "sanitize_input",
+        lambda text: {"masked_text": text, "masked_entities": [], "original_text": text},
+    )
+    calls = []
+    llm_seconds = [0.0]
+
+    def fake_generate(text, category, urgency, snippets, deadline=None, compact=False):
+        calls.append({"compact": compact, "deadline": deadline})
+        time.sleep(llm_seconds[0])
+        return {
+            "action_plan": ["Reply"],
+            "customer_reply_draft": "LLM draft",
+            "risk_flags": [],
+            "sources": [SOURCE],
+            "error_code": None,
+        }
+
+    monkeypatch.setattr(llm_client.llm_client, "generate_response", fake_generate)
+
+    def post(budget_ms: int, sources=(SOURCE,), llm_delay: float = 0.0):
+        llm_seconds[0] = llm_delay
+
+        async def call():
+            transport = httpx.ASGITransport(app=main.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test", timeout=10) as client:
+                started = time.monotonic()
+                response = await client.post(
+                    "/generate",
+                    json={
+                        "text": "Havalem hala ulaşmadı",
+                        "category": "TRANSFER_DELAY",
+                        "urgency": "YELLOW",
+                        "relevant_sources": list(sources),
+                    },
+                    headers={deadline.DEADLINE_HEADER: str(budget_ms)},
+                )
+                return response, time.monotonic() - started
+
+        return asyncio.run(call())
+
+    post.calls = calls
+    return post
+
+
+def test_tiny_budget_skips_rag_and_llm(generate):
+    response, _ = generate(1000, sources=())
+    body = response.json()
+    assert "RAG_SKIPPED_DEADLINE" in body["risk_flags"]
+    assert "TEMPLATED_DRAFT_DEADLINE" in body["risk_flags"]
+    assert generate.calls == []
+
+
+def test_short_budget_uses_the_compact_prompt(generate):
+    response, _ = generate(4000)
+    assert "PROMPT_SHORTENED_DEADLINE" in response.json()["risk_flags"]
+    assert generate.calls[0]["compact"] is True
+
+
+def test_full_budget_uses_the_full_prompt(generate):
+    response, _ = generate(20000)
+    assert response.json()["risk_flags"] == []
+    assert generate.calls[0]["compact"] is False
+
+
+def test_slow_llm_falls_back_before_the_callers_timeout(generate):
+    # 2.6s budget: 2.1s after the margin, enough to try the LLM, which then takes too long.
+    response, elapsed = generate(2600, llm_delay=3.0)
+    assert response.status_code == 200
+    assert "TEMPLATED_DRAFT_DEADLINE" in response.json()["risk_flags"]
+    assert elapsed < 2.6
+    # The LLM client was given the same margin-adjusted deadline.
+    assert generate.calls[0]["deadline"] is not None
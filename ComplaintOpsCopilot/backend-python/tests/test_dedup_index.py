@@ -0,0 +1,105 @@
+import pytest
+
+from dedup_index import NearDuplicateIndex, approximate_size, normalize_text, number_tokens, simhash
+
+BASE = "Kartımdan bilgim dışında {amount} TL tutarında bir harcama yapıldı, lütfen işlemi iptal edin ve kartımı kapatın."
+
+
+@pytest.fixture
+def index(monkeypatch):
+    monkeypatch.setenv("DEDUP_ENABLED", "true")
+    monkeypatch.setenv("DEDUP_MAX_DISTANCE", "3")
+    return NearDuplicateIndex()
+
+
+def test_normalize_folds_case_and_punctuation_but_keeps_digits():
+    assert normalize_text("İADE  talebi: 500 TL!") == "iade talebi 500 tl"
+    assert normalize_text("500 TL") != normalize_text("5000 TL")
+
+
+def test_turkish_dotless_i_is_preserved():
+    assert normalize_text("KIRMIZI") == "kırmızı"
+
+
+def test_number_tokens_keep_order():
+    assert number_tokens("12.03.2024 tarihinde 500 TL") == ("12", "03", "2024", "500")
+
+
+def test_amounts_change_the_fingerprint():
+    assert simhash(BASE.format(amount="500")) != simhash(BASE.format(amount="5000"))
+
+
+def test_different_amounts_are_never_duplicates(index):
+    index.record(BASE.format(amount="500"), generation={"category": "FRAUD_UNAUTHORIZED_TX"})
+    assert index.find(BASE.format(amount="5000")) is None
+
+
+def test_near_duplicate_with_same_numbers_is_found(index):
+    index.record(BASE.format(amount="500"), triage={"category": "FRAUD_UNAUTHORIZED_TX"})
+    found = index.find(BASE.format(amount="500").replace("lütfen", "Lütfen,"))
+    assert found is not None
+    assert found.triage == {"category": "FRAUD_UNAUTHORIZED_TX"}
+    assert index.stats()["hits"] == 1
+
+
+def test_disabled_index_never_matches(monkeypatch):
+    monkeypatch.setenv("DEDUP_ENABLED", "false")
+    disabled = NearDuplicateIndex()
+    disabled.record(BASE.format(amount="500"), triage={"category": "FRAUD_UNAUTHORIZED_TX"})
+    assert disabled.find(BASE.format(amount="500")) is None
+
+
+def _texts(count: int) -> list[str]:
+    # Distinct wording and numbers, so no two texts are near-duplicates of each other.
+    topics = ["kart aidatı", "havale gecikmesi", "kampanya puanı", "mobil giriş", "kredi limiti", "itiraz süreci"]
+    return [f"{topics[i % len(topics)]} hakkında şikayetim var, referans {1000 + i}" for i in range(count)]
+
+
+def test_entries_are_evicted_by_byte_budget_not_count(monkeypatch):
+    monkeypatch.setenv("DEDUP_ENABLED", "true")
+    monkeypatch.setenv("DEDUP_MAX_MB", str(15_000 / (1024 * 1024)))
+    index = NearDuplicateIndex()
+    small, large = _texts(2)
+    index.record(small, triage={"category": "CARD_LIMIT_CREDIT"})
+    index.record(large, generation={"result": {"customer_reply_draft": "x" * 8_000}})
+    assert index.stats()["entries"] == 2
+
+    # Pushes the total past the budget: the oldest entries go first until it fits.
+    newest = _texts(3)[2]
+    index.record(newest, generation={"result": {"customer_reply_draft": "y" * 8_000}})
+    stats = index.stats()
+    assert stats["bytes"] <= stats["max_bytes"]
+    assert index.find(small) is None
+    assert index.find(large) is None
+    assert index.find(newest) is not None
+
+
+def test_many_small_entries_fit_where_few_large_ones_do(monkeypatch):
+    monkeypatch.setenv("DEDUP_ENABLED", "true")
+    monkeypatch.setenv("DEDUP_MAX_MB", str(50_000 / (1024 * 1024)))
+    small_index = NearDuplicateIndex()
+    large_index = NearDuplicateIndex()
+    for text in _texts(40):
+        small_index.record(text, triage={"category": "CARD_LIMIT_CREDIT"})
+        large_index.record(text, generation={"result": {"customer_reply_draft": "z" * 5_000}})
+
+    assert small_index.stats()["entries"] == 40
+    assert large_index.stats()["entries"] < 10
+    assert large_index.stats()["bytes"] <= large_index.stats()["max_bytes"]
+
+
+def test_payload_larger_than_the_budget_is_not_kept(monkeypatch):
+    monkeypatch.setenv("DEDUP_ENABLED", "true")
+    monkeypatch.setenv("DEDUP_MAX_MB", str(5_000 / (1024 * 1024)))
+    index = NearDuplicateIndex()
+    index.record(BASE.format(amount="500"), generation={"result": {"customer_reply_draft": "x" * 10_000}})
+
+    assert index.find(BASE.format(amount="500")) is None
+    assert index.stats()["entries"] == 0
+    assert index.stats()["bytes"] == 0
+
+
+def test_approximate_size_counts_nested_payloads():
+    flat = approximate_size({"draft": "x"})
+    nested = approximate_size({"draft": "x", "sources": [{"snippet": "y" * 1_000}]})
+    assert nested - flat > 1_000
@@ -0,0 +1,67 @@
+import os
+import shutil
+
+import pytest
+
+from embeddings import LEGACY_METADATA, embedding_metadata, find_mismatch
+
+
+@pytest.fixture
+def onnx_model(monkeypatch, tmp_path):
+    path = tmp_path / "model.int8.onnx"
+    path.write_bytes(b"int8 weights v1")
+    monkeypatch.setenv("EMBEDDING_ONNX_PATH", str(path))
+    return path
+
+
+def test_legacy_collection_without_metadata_matches_default_backend():
+    assert find_mismatch(None, "default") is None
+    assert find_mismatch({}, "default") is None
+    assert embedding_metadata("default") == LEGACY_METADATA
+
+
+def test_legacy_collection_does_not_match_another_backend(monkeypatch):
+    monkeypatch.delenv("EMBEDDING_MODEL", raising=False)
+    mismatch = find_mismatch(None, "multilingual")
+    assert mismatch is not None
+    assert "default/all-MiniLM-L6-v2" in mismatch
+    assert "multilingual/" in mismatch
+
+
+def test_backend_mismatch_is_reported(onnx_model):
+    mismatch = find_mismatch(embedding_metadata("onnx_int8"), "default")
+    assert mismatch.startswith("collection built with onnx_int8/")
+    assert mismatch.endswith("serving with default/all-MiniLM-L6-v2")
+
+
+def test_model_mismatch_is_reported(monkeypatch):
+    monkeypatch.setenv("EMBEDDING_MODEL", "sentence-transformers/model-a")
+    stored = embedding_metadata("multilingual")
+    assert find_mismatch(stored, "multilingual") is None
+
+    monkeypatch.setenv("EMBEDDING_MODEL", "sentence-transformers/model-b")
+    assert "model-a" in find_mismatch(stored, "multilingual")
+
+
+def test_same_weights_at_another_path_match(onnx_model, monkeypatch, tmp_path):
+    stored = embedding_metadata("onnx_int8")
+    moved = tmp_path / "deploy" / "model.int8.onnx"
+    moved.parent.mkdir()
+    shutil.copyfile(onnx_model, moved)
+    monkeypatch.setenv("EMBEDDING_ONNX_PATH", str(moved))
+
+    assert embedding_metadata("onnx_int8")["embedding_model"] != stored["embedding_model"]
+    assert find_mismatch(stored, "onnx_int8") is None
+
+
+def test_changed_weights_at_the_same_path_do_not_match(onnx_model):
+    stored = embedding_metadata("onnx_int8")
+    stat = os.stat(onnx_model)
+    # Same size, later mtime: a re-export must not be served from the hash cache.
+    onnx_model.write_bytes(b"int8 weights v2")
+    os.utime(onnx_model, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    serving = embedding_metadata("onnx_int8")
+    assert serving["embedding_model"] == stored["embedding_model"]
+    assert serving["embedding_model_sha256"] != stored["embedding_model_sha256"]
+    assert "sha256" in find_mismatch(stored, "onnx_int8")
@@ -0,0 +1,101 @@
+import asyncio
+import threading
+import time
+
+import anyio.to_thread
+import httpx
+import pytest
+
+import llm_client
+import main
+from dedup_index import NearDuplicateIndex
+from generation_scheduler import GenerationScheduler
+
+SOURCE = {"snippet": "SOP text", "source": "sop.md", "doc_name": "SOP-1", "chunk_id": "c1"}
+
+
+@pytest.fixture
+def app_under_load(monkeypatch):
+    """The real app with 2 generation workers, a 4-slot queue and an LLM gated on an event."""
+    monkeypatch.setenv("GEN_SCHEDULER_WORKERS", "2")
+    monkeypatch.setenv("GEN_SCHEDULER_QUEUE_SIZE", "4")
+    monkeypatch.setenv("DEDUP_ENABLED", "false")
+    monkeypatch.setattr(main, "generation_scheduler", GenerationScheduler())
+    monkeypatch.setattr(main, "near_duplicate_index", NearDuplicateIndex())
+    monkeypatch.setattr(
+        main,
+        "sanitize_input",
+        lambda text: {"masked_text": text, "masked_entities": [], "original_text": text},
+    )
+    gate = threading.Event()
+    started = []
+
+    def fake_generate(text, category, urgency, snippets, deadline=None, compact=False):
+        started.append(urgency)
+        if urgency == "GREEN":
+            gate.wait(5)
+            time.sleep(0.2)
+        return {
+            "action_plan": ["Reply"],
+            "customer_reply_draft": f"draft for {text}",
+            "risk_flags": [],
+            "sources": [SOURCE],
+            "error_code": None,
+        }
+
+    monkeypatch.setattr(llm_client.llm_client, "generate_response", fake_generate)
+    yield gate, started
+    gate.set()
+
+
+def _payload(text: str, urgency: str, category: str) -> dict:
+    return {"text": text, "category": category, "urgency": urgency, "relevant_sources": [SOURCE]}
+
+
+async def _wait_until(condition) -> None:
+    deadline = time.monotonic() + 3
+    while not condition():
+        assert time.monotonic() < deadline
+        await asyncio.sleep(0.01)
+
+
+def test_red_overtakes_green_flood_and_green_overflow_is_shed(app_under_load):
+    gate, started = app_under_load
+
+    async def scenario():
+        # Fewer server threads than GREEN requests: waiting on the LLM must not hold one.
+        anyio.to_thread.current_default_thread_limiter().total_tokens = 4
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test", timeout=10) as client:
+            greens = [
+                asyncio.create_task(client.post(
+                    "/generate", json=_payload(f"bilgi talebi {i}", "GREEN", "INFORMATION_REQUEST")
+                ))
+                for i in range(8)
+            ]
+            metrics = main.generation_scheduler.metrics
+            # 2 running, 4 queued, 2 shed at the door.
+            await _wait_until(lambda: metrics()["priorities"]["GREEN"]["shed"] == 2 and metrics()["queue_size"] == 4)
+
+            red = asyncio.create_task(client.post(
+                "/generate", json=_payload("para transferi gecikti", "RED", "TRANSFER_DELAY")
+            ))
+            # The RED request takes the newest GREEN job's queue slot.
+            await _wait_until(lambda: metrics()["priorities"]["GREEN"]["shed"] == 3)
+            released = time.monotonic()
+            gate.set()
+            red_response = await red
+            red_latency = time.monotonic() - released
+            green_responses = await asyncio.gather(*greens)
+        return red_response, red_latency, green_responses
+
+    red_response, red_latency, green_responses = asyncio.run(scenario())
+
+    assert red_response.status_code == 200
+    # The RED job runs as soon as a worker frees up, ahead of the three queued GREEN jobs.
+    assert started[2] == "RED"
+    assert red_latency < 0.5
+    statuses = sorted(response.status_code for response in green_responses)
+    assert statuses == [200] * 5 + [429] * 3
+    shed = [response for response in green_responses if response.status_code == 429]
+    assert all(int(response.headers["Retry-After"]) >= 1 for response in shed)
@@ -0,0 +1,108 @@
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from threading import Event
+import contextvars
+import time
+
+import pytest
+
+from generation_scheduler import GenerationScheduler, SchedulerOverloadedError, priority_for
+
+request_tag = contextvars.ContextVar("request_tag", default=None)
+
+
+@pytest.fixture
+def make_scheduler(monkeypatch):
+    gates = []
+
+    def make(queue_size: int, aging_seconds: float = 10.0) -> tuple[GenerationScheduler, Event]:
+        monkeypatch.setenv("GEN_SCHEDULER_WORKERS", "1")
+        monkeypatch.setenv("GEN_SCHEDULER_QUEUE_SIZE", str(queue_size))
+        monkeypatch.setenv("GEN_SCHEDULER_AGING_SECONDS", str(aging_seconds))
+        scheduler = GenerationScheduler()
+        gate = Event()
+        gates.append(gate)
+        return scheduler, gate
+
+    yield make
+    for gate in gates:
+        gate.set()
+
+
+def _block_worker(scheduler: GenerationScheduler, gate: Event, pool: ThreadPoolExecutor):
+    started = Event()
+
+    def blocker():
+        started.set()
+        gate.wait()
+
+    future = pool.submit(scheduler.run, blocker, "GREEN", "INFORMATION_REQUEST")
+    assert started.wait(2)
+    return future
+
+
+def _wait_for_queue(scheduler: GenerationScheduler, size: int) -> None:
+    deadline = time.monotonic() + 2
+    while scheduler.metrics()["queue_size"] != size:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_fraud_is_always_top_priority():
+    assert priority_for("GREEN", "FRAUD_UNAUTHORIZED_TX") == 0
+    assert priority_for("GREEN", "INFORMATION_REQUEST") == 2
+
+
+def test_red_job_sheds_aged_green_job(make_scheduler):
+    # Aging far shorter than the queue wait: the GREEN jobs' virtual deadlines are
+    # already earlier than the new RED job's, which must not protect them from shedding.
+    scheduler, gate = make_scheduler(queue_size=2, aging_seconds=0.001)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        _block_worker(scheduler, gate, pool)
+        greens = [pool.submit(scheduler.run, lambda: "green", "GREEN", "INFORMATION_REQUEST") for _ in range(2)]
+        _wait_for_queue(scheduler, 2)
+        time.sleep(0.05)
+        red = pool.submit(scheduler.run, lambda: "red", "RED", "FRAUD_UNAUTHORIZED_TX")
+        _wait_for_queue(scheduler, 2)
+
+        # The newest GREEN job is shed; the older one and the RED job still run.
+        with pytest.raises(SchedulerOverloadedError):
+            greens[1].result(timeout=2)
+        gate.set()
+        assert red.result(timeout=2) == "red"
+        assert greens[0].result(timeout=2) == "green"
+    assert scheduler.metrics()["priorities"]["GREEN"]["shed"] == 1
+    assert scheduler.metrics()["priorities"]["RED"]["shed"] == 0
+
+
+def test_lower_priority_job_is_rejected_when_queue_holds_higher(make_scheduler):
+    scheduler, gate = make_scheduler(queue_size=1)
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        _block_worker(scheduler, gate, pool)
+        red = pool.submit(scheduler.run, lambda: "red", "RED", "TRANSFER_DELAY")
+        _wait_for_queue(scheduler, 1)
+        with pytest.raises(SchedulerOverloadedError):
+            scheduler.run(lambda: "green", "GREEN", "INFORMATION_REQUEST")
+        with pytest.raises(SchedulerOverloadedError):
+            scheduler.run(lambda: "red again", "RED", "TRANSFER_DELAY")
+        gate.set()
+        assert red.result(timeout=2) == "red"
+
+
+def test_timed_out_job_releases_its_queue_slot(make_scheduler):
+    scheduler, gate = make_scheduler(queue_size=1)
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        _block_worker(scheduler, gate, pool)
+        with pytest.raises(FutureTimeoutError):
+            scheduler.run(lambda: "late", "GREEN", "INFORMATION_REQUEST", timeout=0.05)
+        assert scheduler.metrics()["queue_size"] == 0
+        assert scheduler.metrics()["priorities"]["GREEN"]["queue_depth"] == 0
+        queued = pool.submit(scheduler.run, lambda: "next", "GREEN", "INFORMATION_REQUEST")
+        _wait_for_queue(scheduler, 1)
+        gate.set()
+        assert queued.result(timeout=2) == "next"
+
+
+def test_job_runs_in_callers_context(make_scheduler):
+    scheduler, _ = make_scheduler(queue_size=4)
+    request_tag.set("req-42")
+    assert scheduler.run(request_tag.get, "YELLOW", "TRANSFER_DELAY", timeout=2) == "req-42"
@@ -0,0 +1,173 @@
+"""LLMClient against fake_llm_server.py: deadlines, breaker transitions, probe release and hedging."""
+from http.server import ThreadingHTTPServer
+from threading import Event, Thread
+import argparse
+import time
+
+import pytest
+
+pytest.importorskip("openai")
+pytest.importorskip("pydantic")
+
+from fake_llm_server import build_handler
+from llm_client import LLMClient
+from resilience import CircuitBreaker
+
+SNIPPETS = [{"doc_name": "sop_0", "source": "Bank_SOP_v1", "snippet": "FAST işlemleri", "chunk_id": "sop_0_chunk_0"}]
+
+
+@pytest.fixture
+def fake_server():
+    servers = []
+
+    def start(delay=0.0, failure_rate=0.0, invalid_rate=0.0, slow_first=0, slow_delay=0.0, invalid_requests=""):
+        args = argparse.Namespace(
+            delay=delay,
+            slow_rate=0.0,
+            slow_delay=slow_delay,
+            slow_first=slow_first,
+            failure_rate=failure_rate,
+            invalid_rate=invalid_rate,
+            invalid_requests=invalid_requests,
+            verbose=False,
+        )
+        server = ThreadingHTTPServer(("127.0.0.1", 0), build_handler(args))
+        server.daemon_threads = True
+        Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_port}/v1"
+
+    start.arrivals = lambda: servers[-1].RequestHandlerClass.arrivals
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def make_client(monkeypatch):
+    def make(base_url: str, **env) -> LLMClient:
+        monkeypatch.setenv("OPENAI_API_KEY", "fake")
+        monkeypatch.setenv("OPENAI_BASE_URL", base_url)
+        monkeypatch.setenv("LLM_BREAKER_FAILURE_THRESHOLD", "2")
+        for key, value in env.items():
+            monkeypatch.setenv(key, str(value))
+        client = LLMClient()
+        # PII detection loads presidio models; the canned fake reply contains no PII.
+        client._detect_pii = lambda text: False
+        return client
+
+    return make
+
+
+def _generate(client: LLMClient, deadline=None) -> dict:
+    return client.generate_response("Kartım bloke oldu", "ACCESS_LOGIN_MOBILE", "YELLOW", SNIPPETS, deadline=deadline)
+
+
+def test_successful_completion(fake_server, make_client):
+    client = make_client(fake_server())
+    result = _generate(client)
+    assert result["error_code"] is None
+    assert result["action_plan"]
+    assert client.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_upstream_failures_open_the_circuit(fake_server, make_client):
+    client = make_client(fake_server(failure_rate=1.0))
+    assert _generate(client)["error_code"] == "LLM_API_ERROR"
+    assert _generate(client)["error_code"] == "LLM_API_ERROR"
+    assert client.breaker.state == CircuitBreaker.OPEN
+    assert "LLM_CIRCUIT_OPEN" in _generate(client)["risk_flags"]
+
+
+def test_invalid_json_is_not_an_outage(fake_server, make_client):
+    client = make_client(fake_server(invalid_rate=1.0))
+    for _ in range(3):
+        assert _generate(client)["error_code"] == "LLM_VALIDATION_ERROR"
+    assert client.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_slow_upstream_hits_the_deadline(fake_server, make_client):
+    client = make_client(fake_server(delay=1.0))
+    started = time.monotonic()
+    result = _generate(client, deadline=time.monotonic() + 0.2)
+    assert "LLM_DEADLINE_EXCEEDED" in result["risk_flags"]
+    assert time.monotonic() - started < 1.0
+
+
+def test_half_open_probe_that_never_sends_is_released(fake_server, make_client):
+    client = make_client(fake_server(), LLM_BREAKER_RESET_SECONDS=0)
+    client.breaker.record_failure()
+    client.breaker.record_failure()
+    assert client.breaker.state == CircuitBreaker.HALF_OPEN
+
+    # The deadline is already spent, so the probe is admitted but never sent.
+    result = _generate(client, deadline=time.monotonic() - 1)
+    assert "LLM_DEADLINE_EXCEEDED" in result["risk_flags"]
+    assert _generate(client)["error_code"] is None
+    assert client.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_half_open_probe_cancelled_in_the_queue_is_released(fake_server, make_client):
+    client = make_client(fake_server(), LLM_BREAKER_RESET_SECONDS=0, LLM_MAX_CONCURRENCY=1)
+    client.breaker.record_failure()
+    client.breaker.record_failure()
+    # Occupy the only LLM worker so the probe request stays queued until its deadline.
+    release = Event()
+    client._executor.submit(release.wait)
+    try:
+        result = _generate(client, deadline=time.monotonic() + 0.1)
+    finally:
+        release.set()
+    assert "LLM_DEADLINE_EXCEEDED" in result["risk_flags"]
+    assert _generate(client)["error_code"] is None
+    assert client.breaker.state == CircuitBreaker.CLOSED
+
+
+def _hedging_client(make_client, base_url: str, hedge_delay: float) -> LLMClient:
+    client = make_client(base_url, LLM_HEDGE_ENABLED="true", LLM_HEDGE_MIN_SAMPLES=1, LLM_HEDGE_PERCENTILE=0.95)
+    client.latency.record(hedge_delay)
+    return client
+
+
+def test_hedge_is_sent_after_the_percentile_delay(fake_server, make_client):
+    client = _hedging_client(make_client, fake_server(slow_first=1, slow_delay=1.5), hedge_delay=0.3)
+    assert client._hedge_delay() == 0.3
+
+    assert _generate(client)["error_code"] is None
+    primary, hedge = fake_server.arrivals()
+    # Arrival times also carry connection setup, so allow a little slack below the delay.
+    assert 0.25 <= hedge - primary < 0.8
+
+
+def test_no_hedge_when_the_primary_answers_in_time(fake_server, make_client):
+    client = _hedging_client(make_client, fake_server(delay=0.05), hedge_delay=0.5)
+
+    assert _generate(client)["error_code"] is None
+    time.sleep(0.6)
+    assert len(fake_server.arrivals()) == 1
+
+
+def test_first_valid_answer_wins(fake_server, make_client):
+    client = _hedging_client(make_client, fake_server(slow_first=1, slow_delay=2.0), hedge_delay=0.1)
+
+    started = time.monotonic()
+    result = _generate(client)
+    assert result["error_code"] is None
+    # The hedge answered; the primary is still sleeping on the server.
+    assert time.monotonic() - started < 1.0
+    assert len(fake_server.arrivals()) == 2
+
+
+def test_invalid_json_from_the_first_finisher_does_not_hide_a_valid_answer(fake_server, make_client):
+    client = _hedging_client(
+        make_client, fake_server(slow_first=1, slow_delay=0.6, invalid_requests="2"), hedge_delay=0.1
+    )
+
+    started = time.monotonic()
+    result = _generate(client)
+    assert result["error_code"] is None
+    assert result["action_plan"]
+    # The invalid hedge finished first; the primary's answer was still taken, with no retry prompt.
+    assert time.monotonic() - started >= 0.6
+    assert len(fake_server.arrivals()) == 2
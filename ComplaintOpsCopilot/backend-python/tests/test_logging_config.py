@@ -0,0 +1,66 @@
+import logging
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import logging_config
+from logging_config import configure_logging, get_logging_stats
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def _run(code: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, "-c", textwrap.dedent(code)],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        timeout=30,
+    )
+
+
+def test_reconfigure_exits_cleanly():
+    result = _run(
+        """
+        from logging_config import configure_logging, get_logger
+        configure_logging(async_mode=True)
+        configure_logging(async_mode=True)
+        get_logger("test").warning("after reconfigure")
+        """
+    )
+    assert result.returncode == 0, result.stderr
+    assert "Traceback" not in result.stderr
+    assert "after reconfigure" in result.stderr
+
+
+def test_exit_with_full_queue_does_not_raise():
+    result = _run(
+        """
+        import os
+        os.environ["LOG_QUEUE_SIZE"] = "1"
+        from logging_config import configure_logging, get_logger
+        configure_logging(async_mode=True)
+        logger = get_logger("test")
+        for i in range(2000):
+            logger.warning("record %s", i)
+        """
+    )
+    assert result.returncode == 0, result.stderr
+    assert "Traceback" not in result.stderr
+
+
+def test_stats_report_dropped_records(monkeypatch):
+    monkeypatch.setenv("LOG_QUEUE_SIZE", "1")
+    configure_logging(async_mode=True)
+    try:
+        # Stop draining so the single queue slot stays full.
+        logging_config._stop_listener()
+        logger = logging.getLogger("test.dropped")
+        for _ in range(5):
+            logger.warning("dropped")
+        stats = get_logging_stats()
+        assert stats["async"] is True
+        assert stats["dropped"] >= 4
+    finally:
+        configure_logging(async_mode=False)
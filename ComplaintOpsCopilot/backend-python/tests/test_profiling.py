@@ -0,0 +1,49 @@
+import threading
+import time
+
+import profiling
+from profiling import ProfileSession, follow_profile, profile_var, should_profile
+
+
+def test_debug_header_must_match_token(monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILE_SAMPLE_RATE", 0.0)
+    monkeypatch.setattr(profiling, "PROFILE_DEBUG_TOKEN", "s3cret")
+    assert should_profile("s3cret")
+    assert not should_profile("wrong")
+    assert not should_profile("")
+    assert not should_profile(None)
+
+
+def test_non_ascii_header_is_a_mismatch_not_an_error(monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILE_SAMPLE_RATE", 0.0)
+    monkeypatch.setattr(profiling, "PROFILE_DEBUG_TOKEN", "s3cret")
+    assert not should_profile("şifre")
+
+
+def test_empty_token_disables_the_header(monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILE_SAMPLE_RATE", 0.0)
+    monkeypatch.setattr(profiling, "PROFILE_DEBUG_TOKEN", "")
+    assert not should_profile("anything")
+
+
+def test_follow_profile_samples_the_worker_thread(monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILE_SAMPLER_INTERVAL", 0.001)
+    session = ProfileSession("req-1", "generate")
+    token = profile_var.set(session)
+    try:
+        session.start()
+        job = follow_profile(lambda: time.sleep(0.1))
+        worker = threading.Thread(target=job, name="generation-test")
+        worker.start()
+        worker.join()
+        session.stop()
+    finally:
+        profile_var.reset(token)
+    assert any(stack.startswith("generation-test;") for stack in session.stacks)
+
+
+def test_follow_profile_is_a_no_op_without_a_session():
+    def job():
+        return 42
+
+    assert follow_profile(job) is job
@@ -0,0 +1,130 @@
+import asyncio
+import importlib
+import sys
+import types
+
+import httpx
+import pytest
+
+import main
+from dedup_index import NearDuplicateIndex
+
+SOURCE = {"snippet": "SOP text", "source": "sop.md", "doc_name": "SOP-1", "chunk_id": "c1", "category": "TRANSFER_DELAY"}
+TEXT = "Havalem üç gündür hesabıma geçmedi, lütfen kontrol edin."
+
+
+@pytest.fixture
+def make_manager(monkeypatch, tmp_path):
+    # RAGManager opens ./chroma_db; never point it (or the module singleton) at the shipped one.
+    monkeypatch.chdir(tmp_path)
+    rag_manager = importlib.import_module("rag_manager")
+
+    def make(threshold: float = 0.8, min_confidence: float = 0.4, max_count: int = 3):
+        monkeypatch.setenv("RAG_CATEGORY_CUMULATIVE_THRESHOLD", str(threshold))
+        monkeypatch.setenv("RAG_CATEGORY_MIN_CONFIDENCE", str(min_confidence))
+        monkeypatch.setenv("RAG_CATEGORY_MAX_COUNT", str(max_count))
+        return rag_manager.RAGManager()
+
+    return make
+
+
+def test_scope_stops_at_the_cumulative_threshold(make_manager):
+    manager = make_manager(threshold=0.8)
+    probabilities = {"TRANSFER_DELAY": 0.55, "CHARGEBACK_DISPUTE": 0.3, "CARD_LIMIT_CREDIT": 0.15}
+    assert manager.scope_categories(probabilities) == ["TRANSFER_DELAY", "CHARGEBACK_DISPUTE"]
+    assert manager.scope_categories({"TRANSFER_DELAY": 0.9, "CHARGEBACK_DISPUTE": 0.1}) == ["TRANSFER_DELAY"]
+
+
+def test_scope_is_global_when_max_count_cannot_reach_the_threshold(make_manager):
+    probabilities = {"A": 0.45, "B": 0.2, "C": 0.2, "D": 0.15}
+    assert make_manager(threshold=0.8, max_count=2).scope_categories(probabilities) == []
+    assert make_manager(threshold=0.8, max_count=3).scope_categories(probabilities) == ["A", "B", "C"]
+
+
+def test_scope_is_global_below_the_minimum_confidence(make_manager):
+    manager = make_manager(min_confidence=0.4)
+    assert manager.scope_categories({"A": 0.35, "B": 0.35, "C": 0.3}) == []
+
+
+@pytest.mark.parametrize("probabilities", [None, {}])
+def test_scope_is_global_without_a_distribution(make_manager, probabilities):
+    assert make_manager().scope_categories(probabilities) == []
+
+
+@pytest.fixture
+def retrieve(monkeypatch):
+    """POST /retrieve against the real app with a fake RAG manager and triage batcher."""
+    monkeypatch.setenv("DEDUP_ENABLED", "true")
+    monkeypatch.setattr(main, "near_duplicate_index", NearDuplicateIndex())
+    monkeypatch.setattr(
+        main,
+        "sanitize_input",
+        lambda text: {"masked_text": text, "masked_entities": [], "original_text": text},
+    )
+    triaged = []
+    searched = []
+
+    def predict(text):
+        triaged.append(text)
+        return {"category_probabilities": {"TRANSFER_DELAY": 0.9, "CHARGEBACK_DISPUTE": 0.1}}
+
+    def search(query, n_results=None, category=None, category_probabilities=None):
+        searched.append(category_probabilities)
+        return [SOURCE]
+
+    fake_rag = types.SimpleNamespace(
+        triage_scoping=True,
+        retrieve=search,
+        scope_categories=lambda probabilities: sorted(
+            label for label, probability in (probabilities or {}).items() if probability >= 0.5
+        ),
+    )
+    monkeypatch.setitem(sys.modules, "rag_manager", types.SimpleNamespace(rag_manager=fake_rag))
+    monkeypatch.setitem(sys.modules, "triage_batcher", types.SimpleNamespace(triage_batcher=types.SimpleNamespace(predict=predict)))
+
+    def post(payload: dict) -> dict:
+        async def call():
+            transport = httpx.ASGITransport(app=main.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test", timeout=10) as client:
+                response = await client.post("/retrieve", json=payload)
+            assert response.status_code == 200
+            return response.json()
+
+        return asyncio.run(call())
+
+    return post, triaged, searched
+
+
+def test_near_duplicate_skips_the_second_triage_pass(retrieve):
+    post, triaged, searched = retrieve
+
+    first = post({"text": TEXT})
+    assert first["duplicate_of"] is None
+    second = post({"text": TEXT.replace("lütfen", "Lütfen,")})
+
+    assert second["duplicate_of"] is not None
+    assert second["relevant_sources"] == first["relevant_sources"]
+    assert len(triaged) == 1
+    assert len(searched) == 1
+
+
+def test_near_duplicate_with_another_scope_searches_again(retrieve):
+    post, triaged, searched = retrieve
+
+    post({"text": TEXT})
+    other = post({"text": TEXT, "category_probabilities": {"CHARGEBACK_DISPUTE": 0.7, "TRANSFER_DELAY": 0.3}})
+
+    assert other["duplicate_of"] is None
+    assert len(triaged) == 1
+    assert searched[-1] == {"CHARGEBACK_DISPUTE": 0.7, "TRANSFER_DELAY": 0.3}
+
+
+def test_predict_triage_of_a_near_duplicate_scopes_retrieval(retrieve):
+    post, triaged, searched = retrieve
+    probabilities = {"CHARGEBACK_DISPUTE": 0.8, "TRANSFER_DELAY": 0.2}
+    main.near_duplicate_index.record(TEXT, triage={"category_probabilities": probabilities})
+
+    post({"text": TEXT})
+
+    assert triaged == []
+    assert searched == [probabilities]
@@ -0,0 +1,69 @@
+import pytest
+
+from reply_templates import TemplateEngine, _trim_snippet
+
+
+def _snippet(category="INFORMATION_REQUEST", score=0.9, text="IBAN ve dekont talepleri mobil uygulamadan alınabilir."):
+    return {
+        "snippet": text,
+        "source": "Bank_SOP_v1",
+        "doc_name": "sop_7",
+        "chunk_id": "sop_7_chunk_0",
+        "score": score,
+        "category": category,
+    }
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    for name in ("TEMPLATE_FAST_PATH_ENABLED", "TEMPLATE_CATEGORIES", "TEMPLATE_URGENCIES"):
+        monkeypatch.delenv(name, raising=False)
+    return TemplateEngine()
+
+
+def test_renders_matching_category_snippet(engine):
+    result = engine.try_render("INFORMATION_REQUEST", "green", 0.95, [_snippet()])
+    assert result["risk_flags"] == ["TEMPLATE_GENERATED"]
+    assert "IBAN ve dekont talepleri" in result["customer_reply_draft"]
+    assert result["action_plan"][1] == "Share the answer from SOP sop_7."
+    assert result["sources"][0]["category"] == "INFORMATION_REQUEST"
+    assert engine.metrics()["outcomes"] == {"rendered": 1}
+
+
+@pytest.mark.parametrize(
+    "category, urgency, confidence, snippets, reason",
+    [
+        ("FRAUD_UNAUTHORIZED_TX", "GREEN", 0.95, [_snippet("FRAUD_UNAUTHORIZED_TX")], "category"),
+        ("INFORMATION_REQUEST", "RED", 0.95, [_snippet()], "urgency"),
+        ("INFORMATION_REQUEST", "GREEN", None, [_snippet()], "triage_confidence"),
+        ("INFORMATION_REQUEST", "GREEN", 0.5, [_snippet()], "triage_confidence"),
+        ("INFORMATION_REQUEST", "GREEN", 0.95, [], "snippet_category"),
+        # A global fallback search ranked another category's SOP first.
+        ("INFORMATION_REQUEST", "GREEN", 0.95, [_snippet("TRANSFER_DELAY")], "snippet_category"),
+        # Chunk ingested before categories were stored.
+        ("INFORMATION_REQUEST", "GREEN", 0.95, [_snippet(None)], "snippet_category"),
+        ("INFORMATION_REQUEST", "GREEN", 0.95, [_snippet(score=0.2)], "retrieval_score"),
+        ("INFORMATION_REQUEST", "GREEN", 0.95, [_snippet(score=None)], "retrieval_score"),
+    ],
+)
+def test_skip_reasons(engine, category, urgency, confidence, snippets, reason):
+    assert engine.skip_reason(category, urgency, confidence, snippets) == reason
+    assert engine.try_render(category, urgency, confidence, snippets) is None
+    assert engine.metrics()["outcomes"] == {f"skipped_{reason}": 1}
+
+
+def test_disabled_engine_never_renders(monkeypatch):
+    monkeypatch.setenv("TEMPLATE_FAST_PATH_ENABLED", "false")
+    assert TemplateEngine().skip_reason("INFORMATION_REQUEST", "GREEN", 0.95, [_snippet()]) == "disabled"
+
+
+def test_unknown_categories_are_dropped_from_the_whitelist(monkeypatch):
+    monkeypatch.setenv("TEMPLATE_CATEGORIES", "INFORMATION_REQUEST, NOT_A_TEMPLATE")
+    assert TemplateEngine().categories == {"INFORMATION_REQUEST"}
+
+
+def test_trim_prefers_sentence_end():
+    text = "Birinci cümle burada bitiyor. İkinci cümle çok daha uzun ve sınırı aşıyor."
+    assert _trim_snippet(text, 40) == "Birinci cümle burada bitiyor."
+    assert _trim_snippet("tek uzun kelime dizisi", 10) == "tek uzun k..."
+    assert _trim_snippet("  kısa   metin ", 40) == "kısa metin"
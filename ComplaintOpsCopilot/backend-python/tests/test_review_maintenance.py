@@ -0,0 +1,152 @@
+from contextlib import closing
+from datetime import datetime, timedelta, timezone
+from threading import Event, Thread
+import gzip
+import json
+import time
+
+import pytest
+
+from review_maintenance import ReviewMaintenance
+from review_store import ReviewStore
+
+NOW = datetime(2024, 6, 1, tzinfo=timezone.utc)
+OLD = (NOW - timedelta(days=120)).isoformat()
+RECENT = (NOW - timedelta(days=10)).isoformat()
+
+
+@pytest.fixture
+def store(monkeypatch, tmp_path):
+    monkeypatch.setenv("REVIEW_DB_PATH", str(tmp_path / "reviews.db"))
+    return ReviewStore()
+
+
+@pytest.fixture
+def maintenance(monkeypatch, tmp_path, store):
+    monkeypatch.setenv("REVIEW_ARCHIVE_DIR", str(tmp_path / "archive"))
+    monkeypatch.setenv("REVIEW_ARCHIVE_AFTER_DAYS", "90")
+    monkeypatch.setenv("REVIEW_MAINTENANCE_BATCH_SIZE", "2")
+    return ReviewMaintenance(store)
+
+
+def _add(store: ReviewStore, review_id: str, status: str, updated_at: str, text: str = "") -> None:
+    store.create_review(review_id, text or f"masked {review_id}", "CARD_LIMIT", 0.9, "GREEN", 0.8)
+    with store.write_lock, closing(store.get_connection()) as conn, conn:
+        conn.execute(
+            "UPDATE review_records SET status = ?, updated_at = ? WHERE review_id = ?",
+            (status, updated_at, review_id),
+        )
+
+
+def _ids(store: ReviewStore) -> set[str]:
+    with closing(store.get_connection()) as conn:
+        return {row["review_id"] for row in conn.execute("SELECT review_id FROM review_records")}
+
+
+def _archived(maintenance: ReviewMaintenance, updated_at: str) -> list[dict]:
+    with gzip.open(maintenance._archive_path(updated_at), "rt", encoding="utf-8") as handle:
+        return [json.loads(line) for line in handle]
+
+
+def test_archives_only_closed_reviews_past_the_cutoff(store, maintenance):
+    _add(store, "old-approved", "APPROVED", OLD)
+    _add(store, "old-rejected", "REJECTED", OLD)
+    _add(store, "old-pending", "PENDING_REVIEW", OLD)
+    _add(store, "recent-approved", "APPROVED", RECENT)
+
+    assert maintenance.archive_closed_reviews(now=NOW) == 2
+
+    assert _ids(store) == {"old-pending", "recent-approved"}
+    with closing(store.get_connection()) as conn:
+        audit_ids = {row[0] for row in conn.execute("SELECT DISTINCT review_id FROM review_audit")}
+    assert audit_ids == {"old-pending", "recent-approved"}
+    archived = {record["review_id"]: record for record in _archived(maintenance, OLD)}
+    assert set(archived) == {"old-approved", "old-rejected"}
+    assert archived["old-approved"]["masked_text"] == "masked old-approved"
+    assert [audit["status"] for audit in archived["old-approved"]["audit"]] == ["PENDING_REVIEW"]
+
+
+def test_review_reopened_after_the_read_is_kept(store, maintenance, monkeypatch):
+    _add(store, "reopened", "APPROVED", OLD)
+    _add(store, "stays-closed", "APPROVED", OLD)
+    archive_path = maintenance._archive_path
+    reopened = Event()
+
+    def reopen_then_archive(updated_at):
+        # Runs between the batch read and its delete.
+        if not reopened.is_set():
+            reopened.set()
+            store.update_review("reopened", "PENDING_REVIEW", "customer wrote back")
+        return archive_path(updated_at)
+
+    monkeypatch.setattr(maintenance, "_archive_path", reopen_then_archive)
+
+    assert maintenance.archive_closed_reviews(now=NOW) == 1
+    assert _ids(store) == {"reopened"}
+    with closing(store.get_connection()) as conn:
+        statuses = [row[0] for row in conn.execute(
+            "SELECT status FROM review_audit WHERE review_id = 'reopened' ORDER BY audit_id"
+        )]
+    assert statuses == ["PENDING_REVIEW", "PENDING_REVIEW"]
+
+
+def test_legacy_text_and_compressed_rows_read_back_the_same(store, maintenance):
+    _add(store, "compressed", "APPROVED", OLD, text="Kartım çalındı, işlemleri durdurun")
+    _add(store, "legacy", "APPROVED", OLD, text="placeholder")
+    with store.write_lock, closing(store.get_connection()) as conn, conn:
+        conn.execute(
+            "UPDATE review_records SET masked_text = ? WHERE review_id = 'legacy'",
+            ("Şubede 500 TL eksik verildi",),
+        )
+
+    assert maintenance.report()["uncompressed_records"] == 1
+    assert maintenance.archive_closed_reviews(now=NOW) == 2
+    texts = {record["review_id"]: record["masked_text"] for record in _archived(maintenance, OLD)}
+    assert texts == {"compressed": "Kartım çalındı, işlemleri durdurun", "legacy": "Şubede 500 TL eksik verildi"}
+
+
+def test_compress_legacy_rows_keeps_the_text(store, maintenance):
+    _add(store, "legacy", "PENDING_REVIEW", RECENT, text="placeholder")
+    with store.write_lock, closing(store.get_connection()) as conn, conn:
+        conn.execute("UPDATE review_records SET masked_text = 'Şubede 500 TL eksik verildi'")
+
+    assert maintenance.compress_legacy_rows() == 1
+    assert maintenance.compress_legacy_rows() == 0
+    assert maintenance.report()["uncompressed_records"] == 0
+    assert store.update_review("legacy", "APPROVED").masked_text == "Şubede 500 TL eksik verildi"
+
+
+def test_partition_keeps_earlier_runs_when_appended(store, maintenance):
+    _add(store, "first", "APPROVED", OLD)
+    assert maintenance.archive_closed_reviews(now=NOW) == 1
+    _add(store, "second", "REJECTED", OLD)
+    assert maintenance.archive_closed_reviews(now=NOW) == 1
+
+    assert [record["review_id"] for record in _archived(maintenance, OLD)] == ["first", "second"]
+
+
+def test_create_review_is_not_blocked_for_a_whole_pass(store, maintenance, monkeypatch):
+    for index in range(8):
+        _add(store, f"old-{index}", "APPROVED", OLD)
+    archive_path = maintenance._archive_path
+    writing = Event()
+
+    def slow_archive_write(updated_at):
+        # Archive file writes happen outside the write lock; make each batch take a while.
+        writing.set()
+        time.sleep(0.1)
+        return archive_path(updated_at)
+
+    monkeypatch.setattr(maintenance, "_archive_path", slow_archive_write)
+    worker = Thread(target=maintenance.archive_closed_reviews, kwargs={"now": NOW})
+    worker.start()
+    assert writing.wait(2)
+
+    started = time.monotonic()
+    store.create_review("fresh", "Yeni şikayet", "CARD_LIMIT", 0.9, "GREEN", 0.8)
+    waited = time.monotonic() - started
+
+    assert worker.is_alive()
+    worker.join(5)
+    assert waited < 0.1
+    assert _ids(store) == {"fresh"}
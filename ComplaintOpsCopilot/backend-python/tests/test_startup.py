@@ -0,0 +1,114 @@
+import sys
+import threading
+import types
+
+import pytest
+
+import startup
+from startup import StartupManager
+
+
+@pytest.fixture
+def components(monkeypatch):
+    """Fake components registered as importable modules; tests fill in their warmups."""
+    monkeypatch.setattr(startup, "STARTUP_MAX_ATTEMPTS", 3)
+    monkeypatch.setattr(startup, "STARTUP_RETRY_BACKOFF_SECONDS", 0.0)
+    monkeypatch.setattr(startup, "OPTIONAL_COMPONENTS", {"fake_rag"})
+    registry = {}
+    for name in ("fake_masker", "fake_rag"):
+        monkeypatch.setitem(sys.modules, name, types.ModuleType(name))
+    monkeypatch.setattr(startup, "COMPONENTS", registry)
+    monkeypatch.setattr(startup, "DEPENDENCIES", {})
+    return registry
+
+
+def run(manager):
+    manager.start().join(timeout=5)
+    return manager.snapshot()
+
+
+def test_transient_warmup_failure_is_retried(components):
+    calls = []
+
+    def flaky(module):
+        calls.append(threading.current_thread().name)
+        if len(calls) < 3:
+            raise RuntimeError("model file busy")
+        return "READY"
+
+    components["fake_masker"] = flaky
+    snapshot = run(StartupManager())
+    status = snapshot["components"]["fake_masker"]
+    assert status["status"] == "READY"
+    assert status["attempts"] == 3
+    assert status["error"] is None
+    assert snapshot["ready"]
+    assert all(name.startswith("startup") for name in calls)
+
+
+def test_optional_component_failure_is_degraded(components):
+    def broken(module):
+        raise RuntimeError("chroma unavailable")
+
+    components["fake_masker"] = lambda module: "READY"
+    components["fake_rag"] = broken
+    snapshot = run(StartupManager())
+    assert snapshot["components"]["fake_rag"]["status"] == "DEGRADED"
+    assert snapshot["components"]["fake_rag"]["error"] == "warmup: chroma unavailable"
+    assert snapshot["ready"]
+
+
+def test_required_component_failure_is_failed(components):
+    def broken(module):
+        raise RuntimeError("spaCy model missing")
+
+    components["fake_masker"] = broken
+    snapshot = run(StartupManager())
+    assert snapshot["components"]["fake_masker"]["status"] == "FAILED"
+    assert snapshot["components"]["fake_masker"]["attempts"] == 3
+    assert not snapshot["ready"]
+
+
+def test_import_failure_skips_warmup(components):
+    warmed = []
+    components["fake_masker"] = lambda module: "READY"
+    components["missing_component"] = lambda module: warmed.append(module) or "READY"
+    snapshot = run(StartupManager())
+    assert snapshot["components"]["missing_component"]["status"] == "FAILED"
+    assert snapshot["components"]["missing_component"]["error"].startswith("load: ")
+    assert warmed == []
+
+
+def test_components_build_in_parallel_after_shared_packages(components, monkeypatch, tmp_path):
+    # Importing each fake component takes 0.3s, like building a heavy singleton.
+    events = []
+    monkeypatch.setattr(startup, "LOAD_EVENTS", events, raising=False)
+    body = (
+        "import threading, time, startup\n"
+        "startup.LOAD_EVENTS.append(('{name}', 'start', time.monotonic(), threading.current_thread().name))\n"
+        "time.sleep(0.3)\n"
+        "startup.LOAD_EVENTS.append(('{name}', 'end', time.monotonic(), threading.current_thread().name))\n"
+    )
+    for name in ("slow_one", "slow_two", "shared_package"):
+        (tmp_path / f"{name}.py").write_text(body.format(name=name))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    for name in ("slow_one", "slow_two", "shared_package"):
+        monkeypatch.delitem(sys.modules, name, raising=False)
+    components["slow_one"] = lambda module: "READY"
+    components["slow_two"] = lambda module: "READY"
+    monkeypatch.setattr(startup, "DEPENDENCIES", {"slow_one": ("shared_package",), "slow_two": ("shared_package",)})
+
+    snapshot = run(StartupManager())
+
+    assert snapshot["components"]["slow_one"]["status"] == "READY"
+    assert snapshot["components"]["slow_two"]["status"] == "READY"
+    times = {(name, kind): (at, thread) for name, kind, at, thread in events}
+    # The shared package was imported once, on the calling thread, before either component.
+    assert times[("shared_package", "start")][1] == threading.current_thread().name
+    assert times[("shared_package", "end")][0] <= min(times[("slow_one", "start")][0], times[("slow_two", "start")][0])
+    # Both components were loading at the same time, on pool threads.
+    assert max(times[("slow_one", "start")][0], times[("slow_two", "start")][0]) < min(
+        times[("slow_one", "end")][0], times[("slow_two", "end")][0]
+    )
+    assert times[("slow_one", "start")][1].startswith("startup")
+    assert snapshot["components"]["slow_one"]["load_seconds"] >= 0.3
@@ -0,0 +1,135 @@
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+import time
+
+import pytest
+
+from triage_batcher import TriageBatcher
+from triage_model import TriageEngine, triage_engine
+
+
+class RecordingEngine:
+    def __init__(self, error: Exception = None) -> None:
+        self.batches: list[list[str]] = []
+        self.error = error
+        self._lock = Lock()
+
+    def predict(self, text: str) -> dict:
+        return {"text": text, "batched": False}
+
+    def predict_batch(self, texts: list[str]) -> list[dict]:
+        with self._lock:
+            self.batches.append(list(texts))
+        if self.error is not None:
+            raise self.error
+        return [{"text": text, "batched": True} for text in texts]
+
+
+@pytest.fixture
+def make_batcher(monkeypatch):
+    def make(engine, window_ms: float, max_size: int) -> TriageBatcher:
+        monkeypatch.setenv("TRIAGE_BATCHING_ENABLED", "true")
+        monkeypatch.setenv("TRIAGE_BATCH_WINDOW_MS", str(window_ms))
+        monkeypatch.setenv("TRIAGE_BATCH_MAX_SIZE", str(max_size))
+        return TriageBatcher(engine)
+
+    return make
+
+
+def test_each_caller_gets_its_own_result(make_batcher):
+    engine = RecordingEngine()
+    batcher = make_batcher(engine, window_ms=200, max_size=32)
+    texts = [f"şikayet {index}" for index in range(8)]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(batcher.predict, texts))
+
+    assert [result["text"] for result in results] == texts
+    assert all(result["batched"] for result in results)
+    assert sorted(text for batch in engine.batches for text in batch) == sorted(texts)
+    assert len(engine.batches) < len(texts)
+    assert batcher.metrics()["requests"] == len(texts)
+
+
+def test_max_size_bounds_a_batch(make_batcher):
+    engine = RecordingEngine()
+    batcher = make_batcher(engine, window_ms=200, max_size=3)
+
+    with ThreadPoolExecutor(max_workers=7) as pool:
+        results = list(pool.map(batcher.predict, [str(index) for index in range(7)]))
+
+    assert [result["text"] for result in results] == [str(index) for index in range(7)]
+    assert max(len(batch) for batch in engine.batches) <= 3
+    assert len(engine.batches) >= 3
+
+
+def test_window_closes_a_batch(make_batcher):
+    engine = RecordingEngine()
+    batcher = make_batcher(engine, window_ms=20, max_size=32)
+
+    assert batcher.predict("ilk")["text"] == "ilk"
+    time.sleep(0.05)
+    assert batcher.predict("ikinci")["text"] == "ikinci"
+
+    assert engine.batches == [["ilk"], ["ikinci"]]
+
+
+def test_failed_batch_raises_for_every_waiter(make_batcher):
+    engine = RecordingEngine(error=RuntimeError("model exploded"))
+    batcher = make_batcher(engine, window_ms=200, max_size=32)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [pool.submit(batcher.predict, str(index)) for index in range(4)]
+        for future in futures:
+            with pytest.raises(RuntimeError, match="model exploded"):
+                future.result(timeout=2)
+
+    # The worker survives a failed batch.
+    engine.error = None
+    assert batcher.predict("sonra")["text"] == "sonra"
+
+
+def test_disabled_batcher_calls_the_engine_directly(monkeypatch):
+    monkeypatch.setenv("TRIAGE_BATCHING_ENABLED", "false")
+    engine = RecordingEngine()
+
+    assert TriageBatcher(engine).predict("tek") == {"text": "tek", "batched": False}
+    assert engine.batches == []
+
+
+TEXTS = [
+    "Kartımdan bilgim dışında 1.250 TL harcama yapıldı",
+    "Havale üç gündür hesaba geçmedi",
+    "Mobil uygulamaya giriş yapamıyorum, şifre hatası veriyor",
+    "Kampanya puanlarım yüklenmedi",
+]
+
+
+@pytest.mark.skipif(not triage_engine.model_loaded, reason="trained triage models not available")
+@pytest.mark.filterwarnings("ignore::UserWarning")
+@pytest.mark.parametrize("text", TEXTS)
+def test_batched_prediction_matches_single_prediction(text):
+    # What predict() returned before it was routed through predict_batch.
+    category_probs = triage_engine.category_model.predict_proba([text])[0]
+    urgency_probs = triage_engine.urgency_model.predict_proba([text])[0]
+    expected = {
+        "category": triage_engine.category_model.predict([text])[0],
+        "category_confidence": float(max(category_probs)),
+        "urgency": triage_engine.urgency_model.predict([text])[0],
+        "urgency_confidence": float(max(urgency_probs)),
+    }
+
+    single = triage_engine.predict_batch([text])[0]
+    assert {key: single[key] for key in expected} == pytest.approx(expected)
+    in_batch = triage_engine.predict_batch(TEXTS)[TEXTS.index(text)]
+    assert in_batch["category"] == single["category"] and in_batch["urgency"] == single["urgency"]
+    assert in_batch["category_confidence"] == pytest.approx(single["category_confidence"])
+
+
+def test_engine_without_models_returns_unknown(monkeypatch):
+    monkeypatch.setattr(TriageEngine, "_load_models", lambda self: None)
+    engine = TriageEngine()
+
+    results = engine.predict_batch(["bir", "iki"])
+    assert [result["category"] for result in results] == ["UNKNOWN", "UNKNOWN"]
+    assert engine.predict("bir") == results[0]
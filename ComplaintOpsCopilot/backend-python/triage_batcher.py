@@ -0,0 +1,104 @@
+from concurrent.futures import Future
+from threading import Lock, Thread
+import os
+import queue
+import time
+
+from logging_config import get_logger
+from triage_model import triage_engine
+
+logger = get_logger("complaintops.triage_batcher")
+
+_HISTOGRAM_BOUNDS = [1, 2, 4, 8, 16, 32, 64, 128]
+
+
+class TriageBatcher:
+    """Coalesces concurrent /predict calls into one vectorized TriageEngine pass.
+
+    The first request opens a window of TRIAGE_BATCH_WINDOW_MS; everything that
+    arrives before it closes (up to TRIAGE_BATCH_MAX_SIZE) is scored together.
+    """
+
+    def __init__(self, engine) -> None:
+        self.engine = engine
+        self.enabled = os.getenv("TRIAGE_BATCHING_ENABLED", "false").lower() == "true"
+        self.window_seconds = float(os.getenv("TRIAGE_BATCH_WINDOW_MS", "5")) / 1000.0
+        self.max_batch_size = int(os.getenv("TRIAGE_BATCH_MAX_SIZE", "32"))
+        self._queue: queue.Queue = queue.Queue()
+        self._stats_lock = Lock()
+        self._histogram = {bound: 0 for bound in _HISTOGRAM_BOUNDS}
+        self._histogram_overflow = 0
+        self._batches = 0
+        self._requests = 0
+        self._worker = None
+        self._worker_lock = Lock()
+
+    def _ensure_worker(self) -> None:
+        if self._worker is not None:
+            return
+        with self._worker_lock:
+            if self._worker is None:
+                self._worker = Thread(target=self._run, name="triage-batcher", daemon=True)
+                self._worker.start()
+
+    def predict(self, text: str) -> dict:
+        if not self.enabled:
+            return self.engine.predict(text)
+        self._ensure_worker()
+        future: Future = Future()
+        self._queue.put((text, future))
+        return future.result()
+
+    def _collect(self) -> list:
+        batch = [self._queue.get()]
+        closes_at = time.monotonic() + self.window_seconds
+        while len(batch) < self.max_batch_size:
+            remaining = closes_at - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._collect()
+            try:
+                results = self.engine.predict_batch([text for text, _ in batch])
+                for (_, future), result in zip(batch, results):
+                    future.set_result(result)
+            except Exception as e:
+                logger.error("Triage batch of %s failed: %s", len(batch), e)
+                for _, future in batch:
+                    future.set_exception(e)
+            self._record(len(batch))
+
+    def _record(self, size: int) -> None:
+        with self._stats_lock:
+            self._batches += 1
+            self._requests += size
+            for bound in _HISTOGRAM_BOUNDS:
+                if size <= bound:
+                    self._histogram[bound] += 1
+                    break
+            else:
+                self._histogram_overflow += 1
+
+    def metrics(self) -> dict:
+        with self._stats_lock:
+            buckets = {f"le_{bound}": count for bound, count in self._histogram.items()}
+            buckets["gt_{}".format(_HISTOGRAM_BOUNDS[-1])] = self._histogram_overflow
+            return {
+                "enabled": self.enabled,
+                "window_ms": self.window_seconds * 1000.0,
+                "max_batch_size": self.max_batch_size,
+                "batches": self._batches,
+                "requests": self._requests,
+                "avg_batch_size": round(self._requests / self._batches, 2) if self._batches else 0.0,
+                "batch_size_histogram": buckets,
+            }
+
+
+triage_batcher = TriageBatcher(triage_engine)
@@ -33,31 +33,45 @@ class TriageEngine:
         self.model_loaded = bool(self.category_model and self.urgency_model)
 
     def predict(self, text: str):
+        return self.predict_batch([text])[0]
+
+    def predict_batch(self, texts: list[str]) -> list[dict]:
         if not self.model_loaded:
-            return {
-                "category": "UNKNOWN",
-                "category_confidence": 0.0,
-                "urgency": "LOW",
-                "urgency_confidence": 0.0,
-                "model_loaded": False,
-            }
-
-        # Predict Category
-        cat_pred = self.category_model.predict([text])[0]
-        cat_probs = self.category_model.predict_proba([text])[0]
-        cat_conf = max(cat_probs)
-
-        # Predict Urgency
-        urg_pred = self.urgency_model.predict([text])[0]
-        urg_probs = self.urgency_model.predict_proba([text])[0]
-        urg_conf = max(urg_probs)
-
-        return {
-            "category": cat_pred,
-            "category_confidence": float(cat_conf),
-            "urgency": urg_pred,
-            "urgency_confidence": float(urg_conf),
-            "model_loaded": True,
-        }
+            return [
+                {
+                    "category": "UNKNOWN",
+                    "category_confidence": 0.0,
+                    "urgency": "LOW",
+                    "urgency_confidence": 0.0,
+                    "category_probabilities": {},
+                    "model_loaded": False,
+                }
+                for _ in texts
+            ]
+
+        # One predict_proba pass per model for the whole batch; the predicted
+        # label is the argmax class, same as the classifier's own predict().
+        cat_probs = self.category_model.predict_proba(texts)
+        urg_probs = self.urgency_model.predict_proba(texts)
+        cat_classes = self.category_model.classes_
+        urg_classes = self.urgency_model.classes_
+
+        results = []
+        for cat_row, urg_row in zip(cat_probs, urg_probs):
+            cat_index = int(cat_row.argmax())
+            urg_index = int(urg_row.argmax())
+            results.append(
+                {
+                    "category": str(cat_classes[cat_index]),
+                    "category_confidence": float(cat_row[cat_index]),
+                    "urgency": str(urg_classes[urg_index]),
+                    "urgency_confidence": float(urg_row[urg_index]),
+                    "category_probabilities": {
+                        str(label): round(float(prob), 4) for label, prob in zip(cat_classes, cat_row)
+                    },
+                    "model_loaded": True,
+                }
+            )
+        return results
 
 triage_engine = TriageEngine()
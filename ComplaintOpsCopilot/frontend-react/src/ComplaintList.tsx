@@ -1,44 +1,148 @@
-import React, { useEffect, useState } from 'react';
+import React, { useEffect, useRef, useState } from 'react';
 
-interface Complaint {
+interface ComplaintSummary {
     id: number;
-    originalText: string;
     category: string;
     urgency: string;
     status: string;
+    createdAt: string;
+}
+
+interface PageResponse<T> {
+    content: T[];
+    page: number;
+    size: number;
+    totalElements: number;
+    totalPages: number;
+}
+
+interface ComplaintEvent {
+    type: 'created' | 'status';
+    complaint: ComplaintSummary;
 }
 
 interface ComplaintListProps {
     onSelect: (id: number) => void;
 }
 
+const PAGE_SIZE = 20;
+const STATUSES = ['NEW', 'ANALYZED', 'RESOLVED'];
+const URGENCIES = ['RED', 'YELLOW', 'GREEN'];
+const CATEGORIES = [
+    'FRAUD_UNAUTHORIZED_TX',
+    'CHARGEBACK_DISPUTE',
+    'TRANSFER_DELAY',
+    'ACCESS_LOGIN_MOBILE',
+    'CARD_LIMIT_CREDIT',
+    'INFORMATION_REQUEST',
+    'CAMPAIGN_POINTS_REWARDS',
+];
+
 export default function ComplaintList({ onSelect }: ComplaintListProps) {
-    const [complaints, setComplaints] = useState<Complaint[]>([]);
+    const [complaints, setComplaints] = useState<ComplaintSummary[]>([]);
     const [loading, setLoading] = useState(false);
+    const [page, setPage] = useState(0);
+    const [totalPages, setTotalPages] = useState(0);
+    const [totalElements, setTotalElements] = useState(0);
+    const [status, setStatus] = useState('');
+    const [urgency, setUrgency] = useState('');
+    const [category, setCategory] = useState('');
+    // Latest rows for the event handler, which is bound once per stream connection
+    const complaintsRef = useRef<ComplaintSummary[]>([]);
+    complaintsRef.current = complaints;
 
     useEffect(() => {
         fetchComplaints();
-    }, []);
+    }, [page, status, urgency, category]);
+
+    // Incremental updates replace polling. EventSource reconnects on its own and sends
+    // Last-Event-ID, so the server replays anything missed; "reset" means it could not.
+    useEffect(() => {
+        const source = new EventSource('http://localhost:8080/api/complaints/stream');
+        const onEvent = (e: MessageEvent) => applyEvent(JSON.parse(e.data));
+        source.addEventListener('created', onEvent);
+        source.addEventListener('status', onEvent);
+        source.addEventListener('reset', () => fetchComplaints());
+        return () => source.close();
+    }, [page, status, urgency, category]);
+
+    const matchesFilters = (c: ComplaintSummary) =>
+        (!status || c.status === status)
+        && (!urgency || c.urgency === urgency)
+        && (!category || c.category === category);
+
+    const applyEvent = (event: ComplaintEvent) => {
+        const incoming = event.complaint;
+        if (event.type === 'created') {
+            if (!matchesFilters(incoming)) return;
+            setTotalElements(total => total + 1);
+            // Newest first: only the first page shows new complaints
+            if (page === 0) {
+                setComplaints(current => [incoming, ...current.filter(c => c.id !== incoming.id)].slice(0, PAGE_SIZE));
+            }
+            return;
+        }
+        if (!complaintsRef.current.some(c => c.id === incoming.id)) {
+            // With a status filter, a row from outside the view may have just entered it;
+            // reload so it lands in its sorted position and the totals stay right
+            if (status && matchesFilters(incoming)) fetchComplaints();
+            return;
+        }
+        if (!matchesFilters(incoming)) {
+            setTotalElements(total => total - 1);
+            setComplaints(current => current.filter(c => c.id !== incoming.id));
+            return;
+        }
+        setComplaints(current => current.map(c => (c.id === incoming.id ? incoming : c)));
+    };
 
     const fetchComplaints = () => {
+        const params = new URLSearchParams({ page: String(page), size: String(PAGE_SIZE) });
+        if (status) params.set('status', status);
+        if (urgency) params.set('urgency', urgency);
+        if (category) params.set('category', category);
+
         setLoading(true);
-        fetch('http://localhost:8080/api/complaints')
+        fetch(`http://localhost:8080/api/complaints?${params}`)
             .then(res => res.json())
-            .then(data => setComplaints(data))
+            .then((data: PageResponse<ComplaintSummary>) => {
+                setComplaints(data.content);
+                setTotalPages(data.totalPages);
+                setTotalElements(data.totalElements);
+            })
             .catch(err => console.error("Error fetching complaints:", err))
             .finally(() => setLoading(false));
     };
 
+    // Changing a filter starts again from the first page
+    const onFilterChange = (setter: (value: string) => void) => (e: React.ChangeEvent<HTMLSelectElement>) => {
+        setter(e.target.value);
+        setPage(0);
+    };
+
     return (
         <div>
             <h2>Complaint Inbox</h2>
-            <button onClick={fetchComplaints}>Refresh</button>
+            <div style={{ display: 'flex', gap: '10px', alignItems: 'center' }}>
+                <select value={status} onChange={onFilterChange(setStatus)}>
+                    <option value="">All statuses</option>
+                    {STATUSES.map(s => <option key={s} value={s}>{s}</option>)}
+                </select>
+                <select value={urgency} onChange={onFilterChange(setUrgency)}>
+                    <option value="">All urgencies</option>
+                    {URGENCIES.map(u => <option key={u} value={u}>{u}</option>)}
+                </select>
+                <select value={category} onChange={onFilterChange(setCategory)}>
+                    <option value="">All categories</option>
+                    {CATEGORIES.map(c => <option key={c} value={c}>{c}</option>)}
+                </select>
+            </div>
             {loading && <p>Loading...</p>}
             <table border={1} cellPadding={10} style={{ width: '100%', marginTop: '10px', borderCollapse: 'collapse' }}>
                 <thead>
                     <tr style={{ backgroundColor: '#f2f2f2' }}>
                         <th>ID</th>
-                        <th>Text (Summary)</th>
+                        <th>Created</th>
                         <th>Category</th>
                         <th>Urgency</th>
                         <th>Status</th>
@@ -49,7 +153,7 @@ export default function ComplaintList({ onSelect }: ComplaintListProps) {
                     {complaints.map(c => (
                         <tr key={c.id}>
                             <td>{c.id}</td>
-                            <td>{c.originalText.substring(0, 50)}...</td>
+                            <td>{c.createdAt ? new Date(c.createdAt).toLocaleString() : '-'}</td>
                             <td>{c.category || '-'}</td>
                             <td style={{ color: c.urgency === 'RED' ? 'red' : c.urgency === 'YELLOW' ? 'orange' : 'green' }}>
                                 {c.urgency || '-'}
@@ -62,6 +166,11 @@ export default function ComplaintList({ onSelect }: ComplaintListProps) {
                     ))}
                 </tbody>
             </table>
+            <div style={{ marginTop: '10px', display: 'flex', gap: '10px', alignItems: 'center' }}>
+                <button onClick={() => setPage(page - 1)} disabled={page === 0 || loading}>&larr; Prev</button>
+                <span>Page {totalPages === 0 ? 0 : page + 1} of {totalPages} ({totalElements} complaints)</span>
+                <button onClick={() => setPage(page + 1)} disabled={page + 1 >= totalPages || loading}>Next &rarr;</button>
+            </div>
         </div>
     );
 }